@@ -10,19 +10,12 @@ st.set_page_config(
 
 from dotenv import load_dotenv
 import os
+import time
 
 from components.navigation import setup_navigation
-from components.input_section import render_input_section
-from components.views.transcript_view import render_transcript_view
-from components.views.summary_view import render_summary_view
-from components.views.speaker_view import render_speaker_view, render_speaker_summaries
-from components.views.sentiment_view import render_sentiment_view
-from components.views.insights_view import render_insights_view
-from components.views.history_view import render_history_view
-from utils.processing import process_youtube_url
-from utils.session import initialize_session_state
+from components.input_section import render_input_section, render_job_status
+from utils.session import initialize_session_state, sync_job, forget_job
 from styles.theme import apply_theme, apply_custom_css
-from utils.history import load_history_from_disk
 
 # Load environment variables and configure API
 load_dotenv()
@@ -30,6 +23,18 @@ api_key = os.getenv("GOOGLE_API_KEY")
 if not api_key:
     st.error("Google API key not found. Please check your .env file.")
 
+# How often the page checks on a running background job
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1.5"))
+# Offer the pipeline metrics page in the sidebar (for operators, not end users)
+OPS_PAGE = os.getenv("OPS_PAGE", "0") == "1"
+
+def render_when_ready(render, stages):
+    """Render a view, or a placeholder while its stages are still running."""
+    if any(stage in st.session_state.pending_stages for stage in stages):
+        st.info("⏳ Still working on this section - it will appear here as soon as it is ready.")
+    else:
+        render()
+
 def main():
     # Apply custom theme and CSS
     apply_theme()
@@ -38,8 +43,10 @@ def main():
     # Initialize session state variables
     initialize_session_state()
     
-    # Load history from disk
-    load_history_from_disk()
+    if OPS_PAGE and st.sidebar.checkbox("📈 Pipeline metrics", key="show_ops_page"):
+        from components.views.ops_view import render_ops_view
+        render_ops_view()
+        return
     
     # Header section with logo and title
     col1, col2 = st.columns([1, 4])
@@ -59,11 +66,28 @@ def main():
     # Input section for YouTube URL
     render_input_section()
     
+    # Pick up the background job for this session, if there is one
+    job = sync_job()
+    if job:
+        render_job_status(job)
+    
     # If processing is complete, show the results
     if st.session_state.processing_complete:
+        # The result views, and the PDF and audio code behind their downloads,
+        # are imported on first use so the start page renders without them
+        from components.views.transcript_view import render_transcript_view
+        from components.views.summary_view import render_summary_view
+        from components.views.speaker_view import render_speaker_view, render_speaker_summaries
+        from components.views.sentiment_view import render_sentiment_view
+        from components.views.insights_view import render_insights_view
+        from components.views.history_view import render_history_view
+        
         # Display YouTube video if we have a video ID
         if st.session_state.video_id:
-            st.video(f"https://www.youtube.com/watch?v={st.session_state.video_id}")
+            st.video(
+                f"https://www.youtube.com/watch?v={st.session_state.video_id}",
+                start_time=int(st.session_state.video_start_time)
+            )
         
         # Create the navigation tabs
         tab_titles = [
@@ -79,36 +103,38 @@ def main():
         
         # Render the different views based on the selected tab
         with tabs[0]:
-            render_transcript_view()
+            render_when_ready(render_transcript_view, ["transcript"])
         
         with tabs[1]:
+            # The summary view streams the summary and waits for Hindi itself
             render_summary_view()
         
         with tabs[2]:
-            render_speaker_view()
+            render_when_ready(render_speaker_view, ["diarization"])
         
         with tabs[3]:
-            render_speaker_summaries()
+            render_when_ready(render_speaker_summaries, ["speaker_summaries"])
         
         with tabs[4]:
-            render_sentiment_view()
+            render_when_ready(render_sentiment_view, ["sentiment", "speaker_sentiment", "sentiment_timeline"])
         
         with tabs[5]:
-            render_insights_view()
+            render_when_ready(render_insights_view, ["insights"])
         
         with tabs[6]:
             render_history_view()
         
         # Show success message that fades out
-        st.markdown(
-            """
-            <div class="success-message">
-                <div class="success-icon">✓</div>
-                <div class="success-text">Analysis complete! Navigate through the tabs to explore your results.</div>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
+        if not st.session_state.pending_stages:
+            st.markdown(
+                """
+                <div class="success-message">
+                    <div class="success-icon">✓</div>
+                    <div class="success-text">Analysis complete! Navigate through the tabs to explore your results.</div>
+                </div>
+                """, 
+                unsafe_allow_html=True
+            )
         
         # Add a reset button to start over
         st.button(
@@ -116,15 +142,23 @@ def main():
             on_click=lambda: reset_session(), 
             key="reset_button"
         )
+    
+    # Check on the running job again; every rerun shows the stages finished so far
+    if job and job.active:
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
 
 def reset_session():
-    # Reset all session state variables except history
+    # The background job keeps running, but this session stops following it
+    forget_job()
+    
+    # Reset all session state variables except the URL
     for key in list(st.session_state.keys()):
-        if key not in ["youtube_link", "video_history"]:
+        if key not in ["youtube_link"]:
             del st.session_state[key]
     
     st.session_state.processing_complete = False
     st.rerun()
 
 if __name__ == "__main__":
-    main()
+    main()
\ No newline at end of file
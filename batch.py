@@ -0,0 +1,147 @@
+"""Analyze a list of YouTube videos without the web app.
+
+Every video goes through the same stages as the app and is written to the
+same history store, so it opens instantly from the History tab afterwards.
+
+Usage:
+    python batch.py videos.txt [--workers 4] [--processes] [--skip-existing]
+
+The input file holds one YouTube URL or video ID per line; blank lines and
+lines starting with # are ignored. With --processes every worker process
+gets an equal share of the GEMINI_RPM and GEMINI_TPM quotas.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+from dotenv import load_dotenv
+
+# Load the API key before utils.nlp configures Gemini
+load_dotenv()
+
+from utils.youtube import extract_video_id
+from utils.processing import analyze, AnalysisOptions
+from utils.history import has_history_entry
+
+VIDEO_ID_PATTERN = re.compile(r"[0-9A-Za-z_-]{11}")
+
+def read_video_list(path):
+    """Return (input line, video ID or None) for every entry in the file."""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if VIDEO_ID_PATTERN.fullmatch(line):
+                entries.append((line, line))
+            else:
+                entries.append((line, extract_video_id(line)))
+    return entries
+
+def process_video(video_id, language="en"):
+    """Analyze one video and store the results in history.
+
+    Runs in a worker thread or process, so it returns a plain report dict
+    instead of raising.
+    """
+    started = time.perf_counter()
+    report = {"video_id": video_id, "status": "ok", "seconds": 0.0, "error": None, "warnings": []}
+
+    try:
+        result = analyze(video_id, AnalysisOptions(language=language))
+        if not result.ok:
+            report.update(status="failed", error=result.error)
+        elif "history" in result.errors:
+            # The whole point of a batch run is to fill the history store
+            report.update(status="failed", error=result.errors["history"])
+        else:
+            report["warnings"] = list(result.errors.values())
+    except Exception as e:
+        report.update(status="failed", error=f"Processing failed: {str(e)}")
+
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    return report
+
+def share_gemini_quota(workers):
+    """Hold a worker process to its share of the API key's Gemini quota."""
+    from utils.llm import GEMINI_RPM, GEMINI_TPM, limit_gemini_client
+    limit_gemini_client(rpm=max(GEMINI_RPM // workers, 1), tpm=max(GEMINI_TPM // workers, 1))
+
+def print_report(report, done, total):
+    """Print one line per finished video, plus its warnings."""
+    line = f"[{done:>{len(str(total))}}/{total}] {report['video_id']}  {report['status']:<7} {report['seconds']:>8.1f}s"
+    if report["error"]:
+        line += f"  {report['error']}"
+    elif report["warnings"]:
+        line += f"  ({len(report['warnings'])} warnings)"
+    print(line, flush=True)
+    for warning in report["warnings"]:
+        print(f"    warning: {warning}", flush=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze YouTube videos in bulk and store them in history.")
+    parser.add_argument("input", help="file with one YouTube URL or video ID per line")
+    parser.add_argument("--workers", type=int, default=2, help="videos processed at the same time (default: 2)")
+    parser.add_argument("--processes", action="store_true",
+                        help="use worker processes instead of threads; GEMINI_RPM and GEMINI_TPM are split between them")
+    parser.add_argument("--skip-existing", action="store_true", help="skip videos that are already in history")
+    parser.add_argument("--language", default="en", help="transcript language (default: en)")
+    parser.add_argument("--report", help="write per-video results to this JSON file")
+    args = parser.parse_args(argv)
+
+    reports = []
+    video_ids = []
+    seen = set()
+    for line, video_id in read_video_list(args.input):
+        if not video_id:
+            reports.append({"video_id": line, "status": "failed", "seconds": 0.0,
+                            "error": "Invalid YouTube URL format", "warnings": []})
+            continue
+        if video_id in seen:
+            continue
+        seen.add(video_id)
+        if args.skip_existing and has_history_entry(video_id):
+            reports.append({"video_id": video_id, "status": "skipped", "seconds": 0.0,
+                            "error": None, "warnings": []})
+        else:
+            video_ids.append(video_id)
+
+    total = len(reports) + len(video_ids)
+    for done, report in enumerate(reports, 1):
+        print_report(report, done, total)
+
+    started = time.perf_counter()
+    workers = max(args.workers, 1)
+    if args.processes:
+        # Every process has its own rate limiter, so each gets a share of the quota
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=share_gemini_quota, initargs=(workers,))
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+    with pool:
+        futures = [pool.submit(process_video, video_id, args.language) for video_id in video_ids]
+        for future in as_completed(futures):
+            reports.append(future.result())
+            print_report(reports[-1], len(reports), total)
+    elapsed = time.perf_counter() - started
+
+    counts = {status: sum(1 for r in reports if r["status"] == status) for status in ("ok", "skipped", "failed")}
+    print(
+        f"\n{counts['ok']} analyzed, {counts['skipped']} skipped, {counts['failed']} failed "
+        f"in {elapsed:.1f}s"
+    )
+    for report in reports:
+        if report["status"] == "failed":
+            print(f"  {report['video_id']}: {report['error']}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+
+    return 1 if counts["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
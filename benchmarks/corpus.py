@@ -0,0 +1,65 @@
+import random
+
+# Episodes of the benchmark corpus: name -> duration in seconds. The
+# transcripts are generated from a fixed seed, so every run and every
+# machine benchmarks exactly the same text.
+CORPUS = {
+    "10min": 10 * 60,
+    "1h": 60 * 60,
+    "3h": 3 * 60 * 60
+}
+CORPUS_SEED = 1234
+
+# Words per caption segment and speaking rate of typical podcast captions
+WORDS_PER_SEGMENT = (6, 14)
+WORDS_PER_SECOND = 2.6
+
+_SUBJECTS = [
+    "the team", "our guest", "the market", "this approach", "the research", "my co-founder",
+    "the product", "the community", "the data", "the first version", "the industry", "everyone"
+]
+_VERBS = [
+    "changed", "improved", "struggled with", "built", "questioned", "explained", "measured",
+    "rethought", "shipped", "learned from", "underestimated", "focused on"
+]
+_OBJECTS = [
+    "the hiring process", "long term strategy", "customer feedback", "the pricing model",
+    "remote work", "open source", "the early prototype", "burnout", "scaling the platform",
+    "the funding round", "user privacy", "the whole roadmap"
+]
+_ADJECTIVES = [
+    "great", "terrible", "surprising", "difficult", "simple", "amazing", "boring", "important",
+    "risky", "wonderful", "frustrating", "honest", "not bad", "very good", "really hard"
+]
+_FILLERS = ["you know", "I mean", "honestly", "so", "and", "but", "actually", "basically"]
+
+def _sentence(rng):
+    kind = rng.random()
+    if kind < 0.15:
+        return f"What do you think about {rng.choice(_OBJECTS)}?"
+    words = f"{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)}"
+    if kind < 0.6:
+        words += f" and it was {rng.choice(_ADJECTIVES)}"
+    if rng.random() < 0.3:
+        words = f"{rng.choice(_FILLERS)} {words}"
+    return words[0].upper() + words[1:] + "."
+
+def generate_segments(duration, seed=CORPUS_SEED):
+    """Generate caption segments covering ``duration`` seconds, in YouTubeTranscriptApi format."""
+    rng = random.Random(f"{seed}:{duration}")
+    words = []
+    segments = []
+    start = 0.0
+    while start < duration:
+        count = rng.randint(*WORDS_PER_SEGMENT)
+        while len(words) < count:
+            words.extend(_sentence(rng).split())
+        text, words = " ".join(words[:count]), words[count:]
+        segment_duration = round(count / WORDS_PER_SECOND, 3)
+        segments.append({"text": text, "start": round(start, 3), "duration": segment_duration})
+        start += segment_duration
+    return segments
+
+def corpus_video_id(name):
+    """Stable 11-character video ID under which an episode is stored."""
+    return f"bench{name}".ljust(11, "_")[:11]
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""Check how per-window speaker labels are merged across diarization windows.
+
+Every case is a ground-truth speaker per segment and the window bounds the
+transcript is cut into. Each window is labelled the way the model does it,
+with its own "Speaker 1", "Speaker 2", ... in order of appearance, and the
+windows are merged with the pipeline's reconciliation. Windows can be made
+to fail, once (their retry as two halves succeeds) or for good. A case
+passes when the merged labels split the labelled segments exactly like the
+ground truth.
+
+Usage:
+    python -m benchmarks.diarization_windows
+"""
+import sys
+
+from utils.nlp import _reconcile_windows, _retry_failed_windows, _window_bounds
+
+def _turns(*turns):
+    """Ground truth from (speaker, number of segments) turns."""
+    return [speaker for speaker, length in turns for _ in range(length)]
+
+# Host asking short questions, guest giving long answers; every stretch of
+# _INTERVIEW_OVERLAP segments has both of them talking
+_INTERVIEW = _turns(*[(speaker, length) for _ in range(8) for speaker, length in (("A", 2), ("B", 5))])
+_INTERVIEW_OVERLAP = 7
+
+# name -> (ground truth, window bounds, {speaker: name or role given by the model},
+#          {index of a failing window: failed attempts, 1 or 2})
+CASES = {
+    # Guest C only joins after A stopped talking and must not take A's label
+    "late guest": (
+        _turns(("A", 6), ("B", 6), ("C", 6), ("D", 6)),
+        [(0, 10), (6, 16), (12, 22), (18, 24)],
+        {},
+        {}
+    ),
+    "alternating host and guest": (
+        _turns(*[(speaker, 3) for speaker in "ABABABABAB"]),
+        _window_bounds(30, 10, 4),
+        {},
+        {}
+    ),
+    # The host is silent for a whole window and is recognised again by role
+    "host returns": (
+        _turns(("A", 8), ("B", 12), ("A", 6)),
+        [(0, 10), (6, 16), (12, 22), (18, 26)],
+        {"A": "host"},
+        {}
+    ),
+    "single speaker": (
+        _turns(("A", 25)),
+        _window_bounds(25, 10, 3),
+        {"A": "host"},
+        {}
+    ),
+    # A failed window is retried as two halves that overlap its neighbours
+    "failed window retried": (
+        _INTERVIEW,
+        _window_bounds(len(_INTERVIEW), 14, _INTERVIEW_OVERLAP),
+        {},
+        {2: 1}
+    ),
+    # The retry fails too: the windows after the gap must not bring new speakers
+    "failed window gap": (
+        _INTERVIEW,
+        _window_bounds(len(_INTERVIEW), 14, _INTERVIEW_OVERLAP),
+        {},
+        {2: 2}
+    )
+}
+
+def window_results(truth, bounds, names, failing=()):
+    """Per-window (labels, names) as the model would return them, None for windows within ``failing``."""
+    results = []
+    for start, end in bounds:
+        if any(low <= start and end <= high for low, high in failing):
+            results.append(None)
+            continue
+        local = {}
+        for speaker in truth[start:end]:
+            local.setdefault(speaker, f"Speaker {len(local) + 1}")
+        results.append((
+            [local[speaker] for speaker in truth[start:end]],
+            {label: names.get(speaker, "") for speaker, label in local.items()}
+        ))
+    return results
+
+def same_split(truth, owners):
+    """Whether the labels group the labelled segments exactly like the ground truth."""
+    labelled = [(speaker, owner) for speaker, owner in zip(truth, owners) if owner is not None]
+    pairs = set(labelled)
+    return len(pairs) == len({speaker for speaker, _ in labelled}) == len({owner for _, owner in labelled})
+
+def main():
+    failures = 0
+    for name, (truth, bounds, names, failing) in CASES.items():
+        first_attempt = [bounds[i] for i in failing]
+        for_good = [bounds[i] for i, attempts in failing.items() if attempts > 1]
+        results = window_results(truth, bounds, names, first_attempt)
+        bounds, results = _retry_failed_windows(
+            bounds, results, lambda windows: window_results(truth, windows, names, for_good),
+            overlap=_INTERVIEW_OVERLAP
+        )
+        owners = _reconcile_windows(len(truth), bounds, results)
+        passed = same_split(truth, owners)
+        failures += not passed
+        print(f"{'ok  ' if passed else 'FAIL'} {name}")
+        if not passed:
+            print(f"     expected {''.join(truth)}\n     got      {' '.join(str(owner) for owner in owners)}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""Measure how long the app takes to import and to render its start page.
+
+Every sample runs in a fresh Python process, so nothing is already imported:
+
+- time to first render: the first run of app.py through Streamlit's AppTest,
+  i.e. what a user waits for before the start page appears on a cold server;
+- import breakdown: ``python -X importtime -c "import app"``, summed per
+  top-level package, to see which dependencies the start page pulls in.
+
+It also lists which of the heavy service libraries were loaded by the first
+render; none of them should be until a video is analyzed or a file built.
+
+Usage:
+    python -m benchmarks.import_time [--samples 5] [--output results.json] [--compare old.json]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+from benchmarks.run_pipeline import git_commit, REGRESSION_THRESHOLD
+
+# Libraries that should only be imported once they are actually needed
+HEAVY_MODULES = [
+    "google.generativeai", "reportlab", "textblob", "deep_translator", "gtts", "youtube_transcript_api"
+]
+# Number of packages listed in the import breakdown
+TOP_PACKAGES = 15
+
+_FIRST_RENDER_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+app = AppTest.from_file("app.py", default_timeout=120)
+app.run()
+finished = time.perf_counter()
+print(json.dumps({
+    "streamlit_import_seconds": imported - started,
+    "first_render_seconds": finished - imported,
+    "total_seconds": finished - started,
+    "exception": [str(e.value) for e in app.exception],
+    "heavy_modules_loaded": [name for name in %r if name in sys.modules]
+}))
+"""
+
+def _run_python(args):
+    """Run the interpreter in a fresh process from the repository root."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.run([sys.executable] + args, capture_output=True, text=True, check=True, cwd=root)
+
+def measure_first_render():
+    """Render the start page once in a fresh process and return its timings."""
+    output = _run_python(["-c", _FIRST_RENDER_SCRIPT % HEAVY_MODULES]).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def measure_imports():
+    """Return (seconds to import app.py, self time in seconds per top-level package)."""
+    stderr = _run_python(["-X", "importtime", "-c", "import app"]).stderr
+    packages = {}
+    total = 0.0
+    for line in stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(self_us) / 1e6
+        if name == "app":
+            total = int(cumulative_us) / 1e6
+    return total, packages
+
+def _change(value, old):
+    if not old:
+        return ""
+    change = value / old - 1
+    return f"  {change:+7.1%}" + ("  <- slower" if change > REGRESSION_THRESHOLD else "")
+
+def print_report(results, previous=None):
+    previous = previous or {}
+    print()
+    for name in ("first_render_seconds", "streamlit_import_seconds", "app_import_seconds"):
+        value = results[name]
+        print(f"  {name:<28} {value:>8.3f}s{_change(value, previous.get(name))}")
+    if results["heavy_modules_loaded"]:
+        print(f"\n  Heavy modules loaded by the first render: {', '.join(results['heavy_modules_loaded'])}")
+    print("\n  Slowest packages imported by app.py (self time):")
+    for package, seconds in results["packages"].items():
+        print(f"    {package:<26} {seconds:>8.3f}s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold import and first render time of the app.")
+    parser.add_argument("--samples", type=int, default=5, help="fresh processes per measurement (default: 5)")
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/imports-<commit>.json)")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    renders = []
+    imports = []
+    for i in range(args.samples):
+        print(f"Sample {i + 1} of {args.samples}...", flush=True)
+        renders.append(measure_first_render())
+        imports.append(measure_imports())
+
+    packages = {}
+    for _, sample in imports:
+        for package, seconds in sample.items():
+            packages[package] = packages.get(package, 0.0) + seconds / len(imports)
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:TOP_PACKAGES]
+
+    commit = git_commit()
+    results = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "samples": args.samples
+        },
+        # Medians, so a single slow process start does not skew the numbers
+        "first_render_seconds": round(statistics.median(r["first_render_seconds"] for r in renders), 4),
+        "streamlit_import_seconds": round(statistics.median(r["streamlit_import_seconds"] for r in renders), 4),
+        "app_import_seconds": round(statistics.median(total for total, _ in imports), 4),
+        "heavy_modules_loaded": sorted({name for r in renders for name in r["heavy_modules_loaded"]}),
+        "exceptions": sorted({error for r in renders for error in r["exception"]}),
+        "packages": {package: round(seconds, 4) for package, seconds in slowest}
+    }
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+    print_report(results, previous)
+
+    output = args.output or os.path.join("benchmarks", "results", f"imports-{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\nResults written to {output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,305 @@
+"""Benchmark the analysis pipeline on a fixed corpus, without network access.
+
+Every episode of benchmarks/corpus.py (10 minutes, 1 hour, 3 hours) is
+analyzed twice against the fake backends of utils/backends.py:
+
+- step by step, one stage at a time, to get per-stage wall time, CPU time,
+  peak RSS and payload sizes (transcript fetch, summary, translation,
+  diarization, insights, sentiment, then the PDFs and audio);
+- as a whole with the normal stage concurrency, to get end-to-end numbers.
+
+Caches start empty for every run. Results are written as JSON so runs from
+different commits can be compared.
+
+Usage:
+    python -m benchmarks.run_pipeline [--episodes 10min 1h] [--latency-scale 0]
+                                      [--output results.json] [--compare old.json]
+
+With the default latency scale of 0 the fake services answer instantly, so
+the numbers measure our own overhead. Use --latency-scale 1 to include the
+simulated service latency (configured with the FAKE_* variables).
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.corpus import CORPUS, generate_segments, corpus_video_id
+
+# Stage timings that grew by more than this fraction are flagged by --compare
+REGRESSION_THRESHOLD = 0.2
+
+def configure_environment(work_dir, latency_scale):
+    """Point every store at work_dir and select the fake backends.
+
+    Must run before anything from utils is imported, since the modules read
+    their settings at import time.
+    """
+    os.environ.update({
+        "BACKEND": "fake",
+        "FAKE_LATENCY_SCALE": str(latency_scale),
+        "LLM_CACHE_PATH": os.path.join(work_dir, "llm_cache.sqlite3"),
+        "TRANSLATION_MEMORY_PATH": os.path.join(work_dir, "translation_memory.sqlite3"),
+        "TRANSCRIPT_STORE_PATH": os.path.join(work_dir, "transcripts.sqlite3"),
+        "HISTORY_DB_PATH": os.path.join(work_dir, "history.sqlite3"),
+        "BACKEND_RECORDINGS_PATH": os.path.join(work_dir, "recordings.sqlite3"),
+        "ARTIFACT_DIR": os.path.join(work_dir, "artifacts"),
+        "TRACE_EXPORT_PATH": os.path.join(work_dir, "traces.jsonl"),
+        "METRICS_EXPORT_PATH": os.path.join(work_dir, "metrics.prom")
+    })
+    # The quota limiter would only add sleeps; it is not what we measure here
+    os.environ.setdefault("GEMINI_RPM", "1000000")
+    os.environ.setdefault("GEMINI_TPM", "1000000000000")
+
+class RSSSampler:
+    """Samples resident memory on a background thread to find per-step peaks.
+
+    Uses /proc/self/statm where available; elsewhere falls back to the
+    process-wide peak from getrusage, which never goes down between steps.
+    """
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.source = "statm" if os.path.exists("/proc/self/statm") else "maxrss"
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if self.source == "statm" else 1
+        self.peak = self.current()
+        threading.Thread(target=self._sample, daemon=True).start()
+
+    def current(self):
+        if self.source == "statm":
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * self._page_size
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+    def reset(self):
+        self.peak = self.current()
+
+    def _sample(self):
+        while True:
+            self.peak = max(self.peak, self.current())
+            time.sleep(self.interval)
+
+def payload_bytes(value):
+    """Approximate size of a stage input or output."""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if hasattr(value, "getvalue"):
+        return len(value.getvalue())
+    if hasattr(value, "polarity_sum"):
+        # SentimentScores arrays
+        return int(value.polarity_sum.nbytes + value.subjectivity_sum.nbytes + value.word_count.nbytes)
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+def measure(sampler, func, *args, **kwargs):
+    """Call func and return (its return value, wall/CPU/peak RSS measurements)."""
+    sampler.reset()
+    wall, cpu = time.perf_counter(), time.process_time()
+    value = func(*args, **kwargs)
+    sampler.peak = max(sampler.peak, sampler.current())
+    return value, {
+        "wall_seconds": round(time.perf_counter() - wall, 4),
+        "cpu_seconds": round(time.process_time() - cpu, 4),
+        "peak_rss_mb": round(sampler.peak / 2 ** 20, 1)
+    }
+
+def reset_caches(pipeline):
+    """Start from cold caches so every run does the full work."""
+    pipeline["nlp"].llm_cache.clear()
+    pipeline["nlp"].translation_memory.clear()
+    shutil.rmtree(pipeline["artifacts"].ARTIFACT_DIR, ignore_errors=True)
+
+def load_pipeline():
+    """Import the pipeline modules once the environment is configured."""
+    from utils import nlp, artifacts, processing, youtube, executor, llm, sentiment
+    # Load the sentiment lexicon up front; it is parsed once per process
+    sentiment.load_lexicon()
+    return {
+        "nlp": nlp, "artifacts": artifacts, "processing": processing,
+        "youtube": youtube, "executor": executor, "llm": llm
+    }
+
+def benchmark_stages(pipeline, sampler, video_id):
+    """Run every stage on its own and measure it."""
+    processing, executor = pipeline["processing"], pipeline["executor"]
+    report = {}
+
+    (text, segments, error), metrics = measure(sampler, pipeline["youtube"].fetch_transcript, video_id)
+    metrics.update(input_bytes=0, output_bytes=payload_bytes(segments), error=error)
+    report["transcript"] = metrics
+
+    def measured(stage):
+        def run(**kwargs):
+            (value, error), metrics = measure(sampler, stage.func, **kwargs)
+            metrics.update(
+                input_bytes=payload_bytes(kwargs) if kwargs else len(text.encode("utf-8")),
+                output_bytes=payload_bytes(value),
+                error=error
+            )
+            report[stage.name] = metrics
+            return value, error
+        return executor.Stage(stage.name, run, stage.deps, stage.label, stage.critical)
+
+    stages = processing.build_analysis_stages(text, segments)
+    run = executor.run_stages([measured(stage) for stage in stages], max_workers=1)
+
+    # Downloads are built on request in the app; measure each of them too
+    summary = run.value("summary", "")
+    artifact_inputs = {
+        "transcript_pdf": {"text": text},
+        "summary_pdf": {"text": summary},
+        "dual_summary_pdf": {"english": summary, "hindi": run.value("hindi_summary", "")},
+        "speaker_pdf": {"speaker_data": run.value("diarization", {"speakers": []})},
+        "insights_pdf": {"insights_data": run.value("insights", {})},
+        "audio": {"text": summary, "language": "en"}
+    }
+    artifacts = {}
+    for kind, inputs in artifact_inputs.items():
+        builder, _ = pipeline["artifacts"].ARTIFACT_BUILDERS[kind]
+        (buffer, error), metrics = measure(sampler, builder, **inputs)
+        metrics.update(input_bytes=payload_bytes(inputs), output_bytes=payload_bytes(buffer), error=error)
+        artifacts[kind] = metrics
+
+    return report, artifacts
+
+def benchmark_pipeline(pipeline, sampler, video_id):
+    """Run the whole analysis with its normal concurrency and measure it."""
+    processing = pipeline["processing"]
+    client = pipeline["llm"].get_gemini_client()
+    requests_before = client.metrics()["requests"]
+    result, metrics = measure(
+        sampler, processing.analyze, video_id, processing.AnalysisOptions(save_to_history=False)
+    )
+    metrics.update(
+        llm_requests=client.metrics()["requests"] - requests_before,
+        output_bytes=payload_bytes(result.history_data()),
+        error=result.error,
+        stage_errors=result.errors
+    )
+    return metrics
+
+def benchmark_episode(pipeline, sampler, name, duration):
+    segments = generate_segments(duration)
+    video_id = corpus_video_id(name)
+    youtube = pipeline["youtube"]
+    # Serve the corpus from the transcript store, as for an already fetched video
+    youtube.transcript_store.set(f"{video_id}:en", youtube._pack_segments(segments))
+
+    reset_caches(pipeline)
+    stages, artifacts = benchmark_stages(pipeline, sampler, video_id)
+    reset_caches(pipeline)
+    whole = benchmark_pipeline(pipeline, sampler, video_id)
+
+    return {
+        "duration_seconds": duration,
+        "segments": len(segments),
+        "transcript_chars": sum(len(segment["text"]) + 1 for segment in segments),
+        "stages": stages,
+        "artifacts": artifacts,
+        "pipeline": whole
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def print_report(results, previous=None):
+    """Print a table of wall times, with the change against a previous run."""
+    for name, episode in results["episodes"].items():
+        print(f"\n{name} ({episode['segments']} segments, {episode['transcript_chars']} chars)")
+        rows = [("stage", step) for step in episode["stages"]]
+        rows += [("artifact", step) for step in episode["artifacts"]]
+        rows.append(("pipeline", None))
+        for group, step in rows:
+            if group == "pipeline":
+                metrics, label = episode["pipeline"], "whole pipeline"
+            else:
+                metrics, label = episode[group + "s"][step], step
+            line = (
+                f"  {label:<20} {metrics['wall_seconds']:>9.3f}s wall {metrics['cpu_seconds']:>9.3f}s cpu "
+                f"{metrics['peak_rss_mb']:>8.1f} MB"
+            )
+            old = _previous_metrics(previous, name, group, step)
+            if old and old["wall_seconds"]:
+                change = metrics["wall_seconds"] / old["wall_seconds"] - 1
+                line += f"  {change:+7.1%}"
+                if change > REGRESSION_THRESHOLD:
+                    line += "  <- slower"
+            if metrics.get("error"):
+                line += f"  ({metrics['error']})"
+            print(line)
+
+def _previous_metrics(previous, episode, group, step):
+    if not previous:
+        return None
+    episode = previous.get("episodes", {}).get(episode)
+    if not episode:
+        return None
+    if group == "pipeline":
+        return episode.get("pipeline")
+    return episode.get(group + "s", {}).get(step)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline on a fixed transcript corpus.")
+    parser.add_argument("--episodes", nargs="+", choices=list(CORPUS), default=list(CORPUS),
+                        help="corpus episodes to run (default: all)")
+    parser.add_argument("--latency-scale", type=float, default=0.0,
+                        help="multiplier for the simulated service latency (default: 0)")
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="podcast-bench-")
+    configure_environment(work_dir, args.latency_scale)
+    try:
+        pipeline = load_pipeline()
+        sampler = RSSSampler()
+        commit = git_commit()
+        results = {
+            "meta": {
+                "commit": commit,
+                "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "latency_scale": args.latency_scale,
+                "rss_source": sampler.source,
+                "fake_backend": {key: value for key, value in os.environ.items() if key.startswith("FAKE_")}
+            },
+            "episodes": {}
+        }
+        for name in args.episodes:
+            print(f"Running {name}...", flush=True)
+            results["episodes"][name] = benchmark_episode(pipeline, sampler, name, CORPUS[name])
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+    print_report(results, previous)
+
+    output = args.output or os.path.join("benchmarks", "results", f"{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\nResults written to {output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
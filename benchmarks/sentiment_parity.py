@@ -0,0 +1,74 @@
+"""Check that the vectorized sentiment scorer agrees with TextBlob.
+
+Scores a fixed set of sentences that exercise modifiers, negations and
+exclamation marks, plus the segments of a generated corpus episode, once
+with ``score_texts`` and once with ``TextBlob(text).sentiment``, and lists
+every text where polarity or subjectivity differ.
+
+Usage:
+    python -m benchmarks.sentiment_parity [--episode 10min] [--tolerance 1e-6]
+"""
+import argparse
+import sys
+
+from benchmarks.corpus import CORPUS, generate_segments
+from utils.sentiment import score_texts
+
+SENTENCES = [
+    "The show was not very good.",
+    "It was never really funny.",
+    "This isn't very helpful",
+    "That was good.",
+    "That was not good.",
+    "It is not bad at all.",
+    "A very good episode.",
+    "Really not good.",
+    "She was very, very happy with the result.",
+    "Not a good idea, but a very interesting one.",
+    "No good deed goes unpunished.",
+    "I don't think it's a great plan.",
+    "It was extremely boring and terribly slow.",
+    "Honestly it was amazing!",
+    "Great!! Really great!",
+    "The guest was really... interesting.",
+    "The first version was simple but risky.",
+    "We never thought it would be so difficult.",
+    "It's a wonderful, wonderful, frustrating thing.",
+    "The well-known approach was not really terrible.",
+    "Terribly good and horribly bad.",
+    "Our guest was happily surprised by the very honest feedback.",
+    "Nothing here.",
+    ""
+]
+
+def compare(texts, tolerance):
+    """Return (text, ours, TextBlob's) for every text the two score differently."""
+    from textblob import TextBlob
+    scores = score_texts(texts)
+    polarity = scores.segment_polarity()
+    subjectivity = scores.subjectivity_sum / scores.word_count.clip(min=1)
+    mismatches = []
+    for i, text in enumerate(texts):
+        expected = TextBlob(text).sentiment
+        actual = (float(polarity[i]), float(subjectivity[i]))
+        if abs(actual[0] - expected.polarity) > tolerance or abs(actual[1] - expected.subjectivity) > tolerance:
+            mismatches.append((text, actual, (expected.polarity, expected.subjectivity)))
+    return mismatches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the vectorized sentiment scorer with TextBlob.")
+    parser.add_argument("--episode", default="10min", choices=sorted(CORPUS),
+                        help="corpus episode whose segments are compared too (default: 10min)")
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="largest accepted difference")
+    args = parser.parse_args(argv)
+
+    texts = SENTENCES + [segment["text"] for segment in generate_segments(CORPUS[args.episode])]
+    mismatches = compare(texts, args.tolerance)
+    for text, actual, expected in mismatches:
+        print(f"{text!r}\n  ours:     polarity {actual[0]:+.4f}  subjectivity {actual[1]:.4f}"
+              f"\n  TextBlob: polarity {expected[0]:+.4f}  subjectivity {expected[1]:.4f}")
+    print(f"{len(texts) - len(mismatches)} of {len(texts)} texts match TextBlob")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
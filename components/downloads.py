@@ -0,0 +1,46 @@
+import streamlit as st
+from utils.artifacts import find_artifact, get_artifact, read_artifact
+
+def prepare_artifact(kind, inputs, prepare_label, key, use_container_width=True):
+    """Return an artifact's path, offering a button to generate it on first use."""
+    path = find_artifact(kind, **inputs)
+    if path is not None:
+        return path
+    
+    if st.button(prepare_label, key=f"prepare_{key}", use_container_width=use_container_width):
+        with st.spinner("Preparing file..."):
+            path, error = get_artifact(kind, **inputs)
+        if error:
+            st.warning(error)
+        return path
+    return None
+
+def render_artifact_download(kind, inputs, label, file_name, mime, key, prepare_label=None, use_container_width=True):
+    """Render a download button for an artifact that is only built when requested."""
+    path = prepare_artifact(
+        kind,
+        inputs,
+        prepare_label or f"⚙️ Prepare {file_name}",
+        key,
+        use_container_width=use_container_width
+    )
+    if path is not None:
+        st.download_button(
+            label,
+            data=read_artifact(path),
+            file_name=file_name,
+            mime=mime,
+            key=f"download_{key}",
+            use_container_width=use_container_width
+        )
+    return path
+
+def render_audio_player(path, label="Audio Player"):
+    """Play a stored MP3 through Streamlit's media endpoint.
+
+    The file is registered with Streamlit's media file manager, which serves
+    it with HTTP range requests under a URL derived from its content. Reruns
+    reuse the same URL, so the browser does not download the audio again.
+    """
+    st.markdown(f'<p class="audio-label">{label}</p>', unsafe_allow_html=True)
+    st.audio(path, format="audio/mp3")
\ No newline at end of file
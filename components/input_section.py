@@ -1,5 +1,5 @@
 import streamlit as st
-from utils.processing import process_youtube_url
+from utils.session import process_youtube_url
 
 def render_input_section():
     """Render the YouTube URL input form."""
@@ -38,5 +38,18 @@ def render_input_section():
             if not youtube_link or 'youtube.com' not in youtube_link and 'youtu.be' not in youtube_link:
                 st.error("Please enter a valid YouTube URL")
             else:
-                with st.spinner("Processing your video..."):
-                    process_youtube_url()
\ No newline at end of file
+                process_youtube_url()
+
+def render_job_status(job):
+    """Show the progress of the background job, or how it ended."""
+    if job.status == "failed":
+        st.error(job.error)
+        return
+    
+    warnings = [error for name, error in job.result.errors.items() if name != "transcript"]
+    if job.active:
+        done = len(job.finished_stages)
+        total = len(job.steps)
+        st.progress(done / total if total else 0.0, text=f"{job.label} ({done}/{total} steps done)")
+    for warning in warnings:
+        st.warning(warning)
\ No newline at end of file
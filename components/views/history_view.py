@@ -1,102 +1,151 @@
 import streamlit as st
-from utils.history import load_video_from_history
+import html
+from utils.history import query_history_entries, count_history_entries, HISTORY_SORT_ORDERS
+from utils.session import load_video_from_history, delete_from_history, clear_history
+
+PAGE_SIZES = [10, 25, 50]
+
+def _reset_history_page():
+    """Go back to the first page whenever the filter or sorting changes."""
+    st.session_state.history_page = 1
+
+def render_history_card(entry):
+    """Render a single history entry with its action buttons."""
+    video_id = entry["video_id"]
+    video_title = html.escape(entry["video_title"])
+    timestamp = entry["timestamp"]
+    
+    st.markdown(
+        f"""
+        <div class="history-card">
+            <div class="history-card-content">
+                <div class="history-thumbnail">
+                    <img src="https://img.youtube.com/vi/{video_id}/mqdefault.jpg" alt="Thumbnail" loading="lazy" decoding="async">
+                </div>
+                <div class="history-details">
+                    <h3 class="history-title">{video_title}</h3>
+                    <p class="history-timestamp">Processed on: {timestamp}</p>
+                    <p class="history-video-id">Video ID: {video_id}</p>
+                </div>
+            </div>
+            <div class="history-card-actions" id="actions-{video_id}">
+                <!-- Action buttons are added via Streamlit -->
+            </div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    
+    # Create a unique key for this card's actions
+    cols = st.columns(3)
+    
+    with cols[0]:
+        # Button to load this video's data
+        if st.button(
+            "📂 Load Data", 
+            key=f"load_{video_id}",
+            use_container_width=True
+        ):
+            with st.spinner("Loading video data..."):
+                load_video_from_history(video_id)
+                st.success("Video data loaded successfully!")
+                st.rerun()  # Force a rerun to update all tabs
+    
+    with cols[1]:
+        # Button to watch the video
+        if st.button(
+            "▶️ Watch Video", 
+            key=f"watch_{video_id}",
+            use_container_width=True
+        ):
+            st.video(f"https://www.youtube.com/watch?v={video_id}")
+    
+    with cols[2]:
+        # Option to delete this entry
+        if st.button(
+            "🗑️ Delete", 
+            key=f"delete_{video_id}",
+            use_container_width=True
+        ):
+            delete_from_history(video_id)
+            st.success("Entry deleted successfully!")
+            st.rerun()  # Force a rerun to update the history list
 
 def render_history_view():
     """Render the history tab view."""
     st.markdown('<h2 class="view-title">📚 Video History</h2>', unsafe_allow_html=True)
     st.markdown('<p class="view-description">Access previously processed videos without reprocessing them.</p>', unsafe_allow_html=True)
     
-    # Check if we have any history
-    if st.session_state.video_history:
-        # Create a sorted list of history entries (most recent first)
-        history_entries = list(st.session_state.video_history.values())
-        history_entries.sort(key=lambda x: x["timestamp"], reverse=True)
+    if "history_page" not in st.session_state:
+        st.session_state.history_page = 1
+    
+    # Filter and sorting controls
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        search = st.text_input(
+            "Search history",
+            key="history_search",
+            placeholder="Filter by title or video ID...",
+            on_change=_reset_history_page
+        )
+    with col2:
+        sort = st.selectbox(
+            "Sort by",
+            list(HISTORY_SORT_ORDERS.keys()),
+            key="history_sort",
+            on_change=_reset_history_page
+        )
+    with col3:
+        page_size = st.selectbox(
+            "Per page",
+            PAGE_SIZES,
+            key="history_page_size",
+            on_change=_reset_history_page
+        )
+    
+    # Only the visible page is read from the store and rendered
+    total = count_history_entries(search)
+    if total:
+        num_pages = (total + page_size - 1) // page_size
+        page = min(max(st.session_state.history_page, 1), num_pages)
+        st.session_state.history_page = page
+        
+        history_entries = query_history_entries(
+            search=search,
+            sort=sort,
+            limit=page_size,
+            offset=(page - 1) * page_size
+        )
+        
+        st.caption(f"Showing {len(history_entries)} of {total} videos (page {page} of {num_pages})")
         
         # Display history entries as cards
         for entry in history_entries:
-            video_id = entry["video_id"]
-            video_title = entry["video_title"]
-            timestamp = entry["timestamp"]
-            
-            st.markdown(
-                f"""
-                <div class="history-card">
-                    <div class="history-card-content">
-                        <div class="history-thumbnail">
-                            <img src="https://img.youtube.com/vi/{video_id}/mqdefault.jpg" alt="Thumbnail">
-                        </div>
-                        <div class="history-details">
-                            <h3 class="history-title">{video_title}</h3>
-                            <p class="history-timestamp">Processed on: {timestamp}</p>
-                            <p class="history-video-id">Video ID: {video_id}</p>
-                        </div>
-                    </div>
-                    <div class="history-card-actions" id="actions-{video_id}">
-                        <!-- Action buttons are added via Streamlit -->
-                    </div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-            
-            # Create a unique key for this card's actions
-            cols = st.columns(3)
-            
-            with cols[0]:
-                # Button to load this video's data
-                if st.button(
-                    "📂 Load Data", 
-                    key=f"load_{video_id}",
-                    use_container_width=True
-                ):
-                    with st.spinner("Loading video data..."):
-                        load_video_from_history(video_id)
-                        st.success("Video data loaded successfully!")
-                        st.rerun()  # Force a rerun to update all tabs
-            
-            with cols[1]:
-                # Button to watch the video
-                if st.button(
-                    "▶️ Watch Video", 
-                    key=f"watch_{video_id}",
-                    use_container_width=True
-                ):
-                    st.video(f"https://www.youtube.com/watch?v={video_id}")
-            
-            with cols[2]:
-                # Option to delete this entry
-                if st.button(
-                    "🗑️ Delete", 
-                    key=f"delete_{video_id}",
-                    use_container_width=True
-                ):
-                    if video_id in st.session_state.video_history:
-                        del st.session_state.video_history[video_id]
-                        # Update disk storage
-                        try:
-                            import os
-                            import pickle
-                            os.makedirs('.streamlit', exist_ok=True)
-                            with open('.streamlit/video_history.pkl', 'wb') as f:
-                                pickle.dump(st.session_state.video_history, f)
-                        except Exception as e:
-                            st.warning(f"Could not update history file: {e}")
-                        st.success("Entry deleted successfully!")
-                        st.rerun()  # Force a rerun to update the history list
+            render_history_card(entry)
+        
+        # Pagination controls
+        if num_pages > 1:
+            prev_col, page_col, next_col = st.columns([1, 2, 1])
+            with prev_col:
+                if st.button("◀ Previous", key="history_prev", disabled=page <= 1, use_container_width=True):
+                    st.session_state.history_page = page - 1
+                    st.rerun()
+            with page_col:
+                st.markdown(
+                    f'<p class="history-timestamp" style="text-align: center;">Page {page} of {num_pages}</p>',
+                    unsafe_allow_html=True
+                )
+            with next_col:
+                if st.button("Next ▶", key="history_next", disabled=page >= num_pages, use_container_width=True):
+                    st.session_state.history_page = page + 1
+                    st.rerun()
         
         # Clear all history button
         if st.button("🧹 Clear All History", type="secondary"):
-            st.session_state.video_history = {}
-            # Update disk storage
-            try:
-                import os
-                import pickle
-                os.makedirs('.streamlit', exist_ok=True)
-                with open('.streamlit/video_history.pkl', 'wb') as f:
-                    pickle.dump(st.session_state.video_history, f)
-            except Exception as e:
-                st.warning(f"Could not update history file: {e}")
+            clear_history()
             st.success("History cleared successfully!")
             st.rerun()  # Force a rerun to update the UI
+    elif search:
+        st.info("No videos in your history match this search.")
     else:
         st.info("No video processing history available. Process some videos to see them here!")
\ No newline at end of file
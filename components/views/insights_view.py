@@ -1,19 +1,28 @@
 import streamlit as st
+from components.downloads import render_artifact_download
 
 def render_insights_view():
     """Render the key insights tab view."""
     st.markdown('<h2 class="view-title">🔍 Key Insights</h2>', unsafe_allow_html=True)
     st.markdown('<p class="view-description">Automatically extracted valuable insights from the video content.</p>', unsafe_allow_html=True)
     
-    # Download full insights PDF
-    if st.session_state.insights_pdf:
-        st.download_button(
-            "⬇️ Download Complete Insights as PDF",
-            data=st.session_state.insights_pdf,
-            file_name="Video_Insights.pdf",
-            mime="application/pdf",
-            use_container_width=False
-        )
+    # Download full insights PDF, built the first time it is requested
+    insights_data = {
+        "key_points": st.session_state.key_points,
+        "quotes": st.session_state.impactful_quotes,
+        "qa_pairs": st.session_state.questions_answers,
+        "themes": st.session_state.key_themes
+    }
+    render_artifact_download(
+        "insights_pdf",
+        {"insights_data": insights_data},
+        "⬇️ Download Complete Insights as PDF",
+        file_name="Video_Insights.pdf",
+        mime="application/pdf",
+        key="insights_pdf",
+        prepare_label="📄 Prepare Insights PDF",
+        use_container_width=False
+    )
     
     # Create tabs for different types of insights
     insight_tabs = st.tabs(["Key Points", "Quotes", "Q&A", "Themes"])
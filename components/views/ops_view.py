@@ -0,0 +1,73 @@
+import streamlit as st
+import pandas as pd
+from utils.tracing import get_tracer
+from utils.llm import gemini_metrics
+
+# Number of recent analyses listed under "Recent runs"
+RECENT_RUNS = 20
+
+def _latency_table(rows):
+    """Turn latency_summary rows into a display table, in seconds."""
+    return pd.DataFrame([
+        {
+            "Step": row["name"],
+            "Runs": row["count"],
+            "Errors": row["errors"],
+            "p50 (s)": round(row["p50_seconds"], 3),
+            "p95 (s)": round(row["p95_seconds"], 3),
+            "Max (s)": round(row["max_seconds"], 3)
+        }
+        for row in rows
+    ])
+
+def render_ops_view():
+    """Render per-stage latency and request metrics of this server process."""
+    st.markdown('<h2 class="view-title">📈 Pipeline Metrics</h2>', unsafe_allow_html=True)
+    st.markdown(
+        '<p class="view-description">Latency of every analysis stage and external call for recent runs on this server.</p>',
+        unsafe_allow_html=True
+    )
+    tracer = get_tracer()
+
+    runs = tracer.spans(kind="analysis")
+    if not runs:
+        st.info("No analysis has finished since the server started.")
+    else:
+        st.subheader("Stages")
+        st.dataframe(_latency_table(tracer.latency_summary(kind="stage")), hide_index=True, use_container_width=True)
+
+        st.subheader("External calls")
+        external = [
+            row for row in tracer.latency_summary()
+            if row["kind"] in ("external", "llm", "artifact")
+        ]
+        if external:
+            st.dataframe(_latency_table(external), hide_index=True, use_container_width=True)
+
+        st.subheader("Recent runs")
+        st.dataframe(pd.DataFrame([
+            {
+                "Video ID": run.attributes.get("video_id"),
+                "Started": pd.Timestamp(run.start, unit="s").strftime("%Y-%m-%d %H:%M:%S"),
+                "Duration (s)": round(run.duration, 1),
+                "Transcript chars": run.attributes.get("transcript_chars"),
+                "Failed stages": ", ".join(run.attributes.get("stage_errors", [])),
+                "Error": run.error or ""
+            }
+            for run in reversed(runs[-RECENT_RUNS:])
+        ]), hide_index=True, use_container_width=True)
+
+    st.subheader("Gemini requests")
+    metrics = gemini_metrics()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Requests", metrics["requests"])
+    col2.metric("Retries", metrics["retries"])
+    col3.metric("Rate limited", metrics["rate_limited"])
+    col4.metric("Avg latency", f"{metrics['average_latency_seconds']:.2f}s")
+
+    st.download_button(
+        "⬇️ Download Prometheus metrics",
+        tracer.prometheus_text(),
+        file_name="metrics.prom",
+        mime="text/plain"
+    )
\ No newline at end of file
@@ -1,4 +1,7 @@
 import streamlit as st
+import pandas as pd
+
+from utils.youtube import format_timestamp
 
 def display_sentiment_gauge(polarity, title="Sentiment"):
     """Create a sentiment gauge visualization."""
@@ -56,6 +59,49 @@ def sentiment_to_text(polarity):
     else:
         return "Neutral"
 
+def _seek_to(seconds):
+    """Restart the embedded video at the given position."""
+    st.session_state.video_start_time = int(seconds)
+    st.rerun()
+
+def render_sentiment_timeline(timeline):
+    """Render the rolling-window polarity chart with controls to seek the video."""
+    polarity = timeline.get("polarity", [])
+    if len(polarity) < 2:
+        return
+    step = timeline.get("step_seconds", 15)
+    times = [i * step for i in range(len(polarity))]
+
+    st.markdown('<h3 class="section-title">Sentiment Over Time</h3>', unsafe_allow_html=True)
+    st.markdown(
+        f'<p class="view-description">Average polarity over a rolling '
+        f'{timeline.get("window_seconds", 120) // 60}-minute window.</p>',
+        unsafe_allow_html=True
+    )
+    chart_data = pd.DataFrame({"Minute": [t / 60 for t in times], "Polarity": polarity})
+    st.line_chart(chart_data, x="Minute", y="Polarity", height=250)
+
+    # Charts cannot report clicks here, so seeking uses a slider over the same points
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        position = st.select_slider(
+            "Jump to",
+            options=times,
+            value=min(times, key=lambda t: abs(t - st.session_state.video_start_time)),
+            format_func=lambda t: f"{format_timestamp(t)} ({polarity[t // step]:+.2f})",
+            key="sentiment_seek"
+        )
+        if st.button("▶️ Play from here", key="sentiment_play"):
+            _seek_to(position)
+    with col2:
+        most_positive = max(range(len(polarity)), key=polarity.__getitem__)
+        if st.button(f"😊 Most positive ({format_timestamp(times[most_positive])})", key="sentiment_positive"):
+            _seek_to(times[most_positive])
+    with col3:
+        most_negative = min(range(len(polarity)), key=polarity.__getitem__)
+        if st.button(f"😔 Most negative ({format_timestamp(times[most_negative])})", key="sentiment_negative"):
+            _seek_to(times[most_negative])
+
 def render_sentiment_view():
     """Render the sentiment analysis tab view."""
     st.markdown('<h2 class="view-title">😊 Sentiment Analysis</h2>', unsafe_allow_html=True)
@@ -115,6 +161,8 @@ def render_sentiment_view():
                 unsafe_allow_html=True
             )
         
+        render_sentiment_timeline(st.session_state.sentiment_timeline)
+        
         # Per-speaker sentiment
         if speaker_sentiment:
             st.markdown('<h3 class="section-title">Sentiment by Speaker</h3>', unsafe_allow_html=True)
@@ -1,5 +1,13 @@
 import streamlit as st
-from utils.audio import create_audio, get_audio_player_html
+from utils.artifacts import transcript_preview, read_artifact
+from utils.youtube import format_timestamp
+from components.downloads import prepare_artifact, render_artifact_download, render_audio_player
+
+def _turn_time(segment):
+    """Format a speaker turn's time range, or just its start if no end is known."""
+    if "end" in segment:
+        return f'{format_timestamp(segment["start"])} - {format_timestamp(segment["end"])}'
+    return format_timestamp(segment["start"])
 
 def render_speaker_view():
     """Render the speaker diarization tab view."""
@@ -10,19 +18,26 @@ def render_speaker_view():
     
     if speaker_data and "speakers" in speaker_data:
         # Download full speaker transcript
-        if "speaker_pdf" in st.session_state and st.session_state.speaker_pdf:
-            st.download_button(
-                "⬇️ Download Complete Speaker Transcript",
-                data=st.session_state.speaker_pdf,
-                file_name="Speaker_Transcript.pdf",
-                mime="application/pdf",
-                use_container_width=True
-            )
+        render_artifact_download(
+            "speaker_pdf",
+            {"speaker_data": speaker_data},
+            "⬇️ Download Complete Speaker Transcript",
+            file_name="Speaker_Transcript.pdf",
+            mime="application/pdf",
+            key="speaker_pdf",
+            prepare_label="📄 Prepare Speaker Transcript PDF"
+        )
         
         # Show speaker segments in expandable sections
         for speaker in speaker_data["speakers"]:
             speaker_id = speaker['id']
             speaker_text = "\n\n".join([segment["text"] for segment in speaker["segments"]])
+            # Prefix each turn with its time range when diarization kept it
+            display_text = "\n\n".join(
+                f'<span class="speaker-timestamp">[{_turn_time(segment)}]</span> {segment["text"]}'
+                if "start" in segment else segment["text"]
+                for segment in speaker["segments"]
+            )
             
             with st.expander(f"{speaker_id}", expanded=False):
                 st.markdown(
@@ -30,41 +45,30 @@ def render_speaker_view():
                     <div class="speaker-container">
                         <div class="speaker-icon">👤</div>
                         <div class="speaker-content">
-                            {speaker_text}
+                            {display_text}
                         </div>
                     </div>
                     """,
                     unsafe_allow_html=True
                 )
                 
-                # Create audio for this speaker's transcript
-                if st.button(
-                    f"🔊 Generate Audio for {speaker_id}", 
-                    key=f"audio_{speaker_id}",
-                    use_container_width=True
-                ):
-                    with st.spinner(f"Creating audio for {speaker_id}..."):
-                        # Limit to first 1000 words
-                        preview_text = " ".join(speaker_text.split()[:1000])
-                        speaker_audio, audio_error = create_audio(preview_text, 'en')
-                        
-                        if audio_error:
-                            st.warning(audio_error)
-                        elif speaker_audio:
-                            st.markdown(
-                                get_audio_player_html(
-                                    speaker_audio, 
-                                    f"{speaker_id} Audio"
-                                ), 
-                                unsafe_allow_html=True
-                            )
-                            st.download_button(
-                                f"⬇️ Download {speaker_id} Audio",
-                                data=speaker_audio,
-                                file_name=f"{speaker_id.replace(' ', '_')}_Audio.mp3",
-                                mime="audio/mp3",
-                                use_container_width=True
-                            )
+                # Create audio for this speaker's transcript (limited to first 1000 words)
+                speaker_audio = prepare_artifact(
+                    "audio",
+                    {"text": transcript_preview(speaker_text, 1000), "language": "en"},
+                    f"🔊 Generate Audio for {speaker_id}",
+                    key=f"audio_{speaker_id}"
+                )
+                if speaker_audio:
+                    render_audio_player(speaker_audio, f"{speaker_id} Audio")
+                    st.download_button(
+                        f"⬇️ Download {speaker_id} Audio",
+                        data=read_artifact(speaker_audio),
+                        file_name=f"{speaker_id.replace(' ', '_')}_Audio.mp3",
+                        mime="audio/mp3",
+                        key=f"download_audio_{speaker_id}",
+                        use_container_width=True
+                    )
     else:
         st.warning("Speaker identification could not be performed for this transcript.")
 
@@ -107,27 +111,14 @@ def render_speaker_summaries():
                         )
                         
                         # Generate PDF for this speaker's summary
-                        if st.button(
-                            f"📄 Create PDF", 
+                        render_artifact_download(
+                            "speaker_summary_pdf",
+                            {"text": summary, "title": f"Summary of {speaker_id}'s Contribution"},
+                            f"⬇️ Download PDF",
+                            file_name=f"{speaker_id.replace(' ', '_')}_Summary.pdf",
+                            mime="application/pdf",
                             key=f"pdf_{speaker_id}",
-                            use_container_width=True
-                        ):
-                            with st.spinner(f"Creating PDF for {speaker_id}..."):
-                                from utils.pdf import create_pdf
-                                summary_pdf, pdf_error = create_pdf(
-                                    summary, 
-                                    title=f"Summary of {speaker_id}'s Contribution"
-                                )
-                                
-                                if pdf_error:
-                                    st.warning(pdf_error)
-                                elif summary_pdf:
-                                    st.download_button(
-                                        f"⬇️ Download PDF",
-                                        data=summary_pdf,
-                                        file_name=f"{speaker_id.replace(' ', '_')}_Summary.pdf",
-                                        mime="application/pdf",
-                                        use_container_width=True
-                                    )
+                            prepare_label=f"📄 Create PDF"
+                        )
     else:
         st.warning("Speaker summaries could not be generated for this transcript.")
\ No newline at end of file
@@ -1,12 +1,34 @@
 import streamlit as st
-from utils.audio import get_audio_player_html
+from components.downloads import prepare_artifact, render_artifact_download, render_audio_player
+
+def render_streaming_summary():
+    """Render the part of the summary written so far, while it is being generated."""
+    if not st.session_state.final_summary:
+        st.info("⏳ Still working on this section - it will appear here as soon as it is ready.")
+        return
+    st.markdown(
+        f"""
+        <div class="summary-container">
+            <div class="summary-content">
+                {st.session_state.final_summary} ▌
+            </div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    st.caption("✍️ Writing the summary...")
 
 def render_summary_view():
     """Render the summary tab view."""
     st.markdown('<h2 class="view-title">📝 Video Summary</h2>', unsafe_allow_html=True)
     
+    if "summary" in st.session_state.pending_stages:
+        render_streaming_summary()
+        return
+    
     # Create tabs for English and Hindi summaries
     summary_tabs = st.tabs(["English Summary", "Hindi Summary", "Audio"])
+    audio_inputs = {"text": st.session_state.final_summary, "language": "en"}
     
     with summary_tabs[0]:
         # English Summary
@@ -21,62 +43,72 @@ def render_summary_view():
             unsafe_allow_html=True
         )
     
-    with summary_tabs[1]:
-        # Hindi Summary
-        st.markdown(
-            f"""
-            <div class="summary-container">
-                <div class="summary-content hindi-text">
-                    {st.session_state.hindi_summary}
-                </div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    hindi_pending = "hindi_summary" in st.session_state.pending_stages
     
-    with summary_tabs[2]:
-        # Audio player for summary
-        if st.session_state.summary_audio:
-            st.session_state.summary_audio.seek(0)  # Reset pointer
+    with summary_tabs[1]:
+        if hindi_pending:
+            st.info("⏳ Translating the summary to Hindi...")
+        else:
+            # Hindi Summary
             st.markdown(
-                get_audio_player_html(
-                    st.session_state.summary_audio, 
-                    "Summary Audio (English)"
-                ), 
+                f"""
+                <div class="summary-container">
+                    <div class="summary-content hindi-text">
+                        {st.session_state.hindi_summary}
+                    </div>
+                </div>
+                """,
                 unsafe_allow_html=True
             )
+    
+    with summary_tabs[2]:
+        # Audio player for summary, generated the first time it is requested
+        summary_audio = prepare_artifact(
+            "audio",
+            audio_inputs,
+            "🔊 Generate Summary Audio",
+            key="summary_audio_player"
+        )
+        if summary_audio:
+            render_audio_player(summary_audio, "Summary Audio (English)")
         else:
-            st.info("Summary audio is not available.")
+            st.info("Summary audio is generated on request.")
     
     # Download buttons
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        if st.session_state.dual_summary_pdf:
-            st.download_button(
+        if hindi_pending:
+            st.caption("The bilingual summary is available once the Hindi translation is done.")
+        else:
+            render_artifact_download(
+                "dual_summary_pdf",
+                {"english": st.session_state.final_summary, "hindi": st.session_state.hindi_summary},
                 "⬇️ Download Bilingual Summary", 
-                data=st.session_state.dual_summary_pdf, 
                 file_name="Summary_English_Hindi.pdf",
                 mime="application/pdf",
-                use_container_width=True
+                key="dual_summary_pdf",
+                prepare_label="📄 Prepare Bilingual Summary"
             )
     
     with col2:
-        if st.session_state.summary_pdf:
-            st.download_button(
-                "⬇️ Download English Summary", 
-                data=st.session_state.summary_pdf, 
-                file_name="Summary_English.pdf",
-                mime="application/pdf",
-                use_container_width=True
-            )
+        render_artifact_download(
+            "summary_pdf",
+            {"text": st.session_state.final_summary},
+            "⬇️ Download English Summary", 
+            file_name="Summary_English.pdf",
+            mime="application/pdf",
+            key="summary_pdf",
+            prepare_label="📄 Prepare English Summary"
+        )
     
     with col3:
-        if st.session_state.summary_audio:
-            st.download_button(
-                "⬇️ Download Summary Audio", 
-                data=st.session_state.summary_audio, 
-                file_name="Summary_English.mp3",
-                mime="audio/mp3",
-                use_container_width=True
-            )
\ No newline at end of file
+        render_artifact_download(
+            "audio",
+            audio_inputs,
+            "⬇️ Download Summary Audio", 
+            file_name="Summary_English.mp3",
+            mime="audio/mp3",
+            key="summary_audio",
+            prepare_label="🔊 Prepare Summary Audio"
+        )
\ No newline at end of file
@@ -1,5 +1,177 @@
 import streamlit as st
-from utils.audio import get_audio_player_html
+import html
+import re
+from utils.artifacts import transcript_preview
+from utils.youtube import format_timestamp, parse_timestamp
+from utils.transcript_index import TranscriptIndex, segments_from_text, query_words
+from components.downloads import prepare_artifact, render_artifact_download, render_audio_player
+
+PAGE_SIZES = [25, 50, 100]
+
+def _transcript_index():
+    """Return the search index of the current transcript, built once per video."""
+    segments = st.session_state.transcript_segments
+    key = (st.session_state.video_id, len(segments), len(st.session_state.final_transcript))
+    cached = st.session_state.get("transcript_index")
+    if cached is None or cached[0] != key:
+        # Older history entries only have the plain text
+        index = TranscriptIndex(segments or segments_from_text(st.session_state.final_transcript))
+        st.session_state.transcript_index = (key, index)
+        st.session_state.transcript_page = 1
+        st.session_state.transcript_focus = None
+        st.session_state.transcript_search = ""
+        return index
+    return cached[1]
+
+def _reset_transcript_page():
+    """Go back to the first page whenever the search or page size changes."""
+    st.session_state.transcript_page = 1
+    st.session_state.transcript_focus = None
+
+def _go_to_segment(segment, seek=False):
+    """Show the page holding a segment, optionally restarting the video there."""
+    index = st.session_state.transcript_index[1]
+    st.session_state.transcript_search = ""
+    st.session_state.transcript_page = segment // st.session_state.transcript_page_size + 1
+    st.session_state.transcript_focus = segment
+    if seek and index.timed:
+        st.session_state.video_start_time = int(index.segments[segment]["start"])
+
+def _jump_to_time():
+    """Go to the segment spoken at the time typed into the jump box."""
+    index = st.session_state.transcript_index[1]
+    seconds = parse_timestamp(st.session_state.transcript_jump)
+    st.session_state.transcript_jump_error = seconds is None and bool(st.session_state.transcript_jump.strip())
+    if seconds is not None:
+        _go_to_segment(index.segment_at(seconds), seek=True)
+
+def _highlighter(query):
+    """Regex matching the searched words in a segment, like TranscriptIndex.search does."""
+    words = query_words(query)
+    if not words:
+        return None
+    alternatives = [re.escape(word) for word in words[:-1]] + [re.escape(words[-1]) + r"\w*"]
+    return re.compile(r"\b(?:" + "|".join(alternatives) + r")\b", re.IGNORECASE)
+
+def _segment_html(index, i, highlight, focus):
+    segment = index.segments[i]
+    raw = segment["text"]
+    if highlight:
+        # Match on the raw text and escape each piece, so searching "amp" or "lt" cannot split an entity
+        pieces = []
+        position = 0
+        for match in highlight.finditer(raw):
+            pieces.append(html.escape(raw[position:match.start()], quote=False))
+            pieces.append(f"<mark>{html.escape(match.group(0), quote=False)}</mark>")
+            position = match.end()
+        pieces.append(html.escape(raw[position:], quote=False))
+        text = "".join(pieces)
+    else:
+        text = html.escape(raw, quote=False)
+    timestamp = f'<span class="speaker-timestamp">{format_timestamp(segment["start"])}</span> ' if index.timed else ""
+    css_class = "transcript-segment current" if i == focus else "transcript-segment"
+    return f'<div class="{css_class}">{timestamp}{text}</div>'
+
+def render_transcript_browser():
+    """Render one page of transcript segments with search and jump-to-time.
+
+    Only the visible page is turned into HTML, and search goes through a
+    word index built once per video, so a rerun costs the same however long
+    the episode is.
+    """
+    index = _transcript_index()
+    
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        search = st.text_input(
+            "Search transcript",
+            key="transcript_search",
+            placeholder="Find words in the transcript...",
+            on_change=_reset_transcript_page
+        )
+    with col2:
+        if index.timed:
+            st.text_input(
+                "Jump to time",
+                key="transcript_jump",
+                placeholder="e.g. 12:30 or 1:05:00",
+                on_change=_jump_to_time
+            )
+            if st.session_state.get("transcript_jump_error"):
+                st.caption("Enter a time as m:ss or h:mm:ss.")
+    with col3:
+        page_size = st.selectbox(
+            "Per page",
+            PAGE_SIZES,
+            key="transcript_page_size",
+            on_change=_reset_transcript_page
+        )
+    
+    # Rows are segment indices: every segment, or only those matching the search
+    rows = index.search(search) if search.strip() else range(len(index))
+    if not rows:
+        st.info("No part of the transcript matches this search." if search.strip() else "No transcript available.")
+        return
+    
+    num_pages = (len(rows) + page_size - 1) // page_size
+    page = min(max(st.session_state.transcript_page, 1), num_pages)
+    st.session_state.transcript_page = page
+    page_rows = list(rows[(page - 1) * page_size:page * page_size])
+    
+    if search.strip():
+        st.caption(f"{len(rows)} matching segments (page {page} of {num_pages})")
+    else:
+        st.caption(f"Segments {page_rows[0] + 1}-{page_rows[-1] + 1} of {len(rows)} (page {page} of {num_pages})")
+    
+    highlight = _highlighter(search) if search.strip() else None
+    focus = st.session_state.transcript_focus
+    segments_html = "".join(_segment_html(index, i, highlight, focus) for i in page_rows)
+    st.markdown(
+        f"""
+        <div class="transcript-container">
+            <div class="transcript-content">{segments_html}</div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    
+    if index.timed:
+        # Seek the video to one of the segments on this page
+        play_col, button_col = st.columns([3, 1])
+        with play_col:
+            segment = st.selectbox(
+                "Play from",
+                page_rows,
+                index=page_rows.index(focus) if focus in page_rows else 0,
+                format_func=lambda i: f"{format_timestamp(index.segments[i]['start'])} - {index.segments[i]['text'][:60]}",
+                key=f"transcript_play_{page}_{focus}_{search}",
+                label_visibility="collapsed"
+            )
+        with button_col:
+            st.button(
+                "▶️ Play from here",
+                key="transcript_play_button",
+                on_click=_go_to_segment,
+                args=(segment, True),
+                use_container_width=True
+            )
+    
+    # Pagination controls
+    if num_pages > 1:
+        prev_col, page_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            if st.button("◀ Previous", key="transcript_prev", disabled=page <= 1, use_container_width=True):
+                st.session_state.transcript_page = page - 1
+                st.rerun()
+        with page_col:
+            st.markdown(
+                f'<p class="history-timestamp" style="text-align: center;">Page {page} of {num_pages}</p>',
+                unsafe_allow_html=True
+            )
+        with next_col:
+            if st.button("Next ▶", key="transcript_next", disabled=page >= num_pages, use_container_width=True):
+                st.session_state.transcript_page = page + 1
+                st.rerun()
 
 def render_transcript_view():
     """Render the transcript tab view."""
@@ -7,52 +179,45 @@ def render_transcript_view():
     
     # Create a tab-like interface for different transcript views
     transcript_tabs = st.tabs(["Text View", "Audio Preview"])
+    audio_inputs = {"text": transcript_preview(st.session_state.final_transcript), "language": "en"}
     
     with transcript_tabs[0]:
-        st.markdown(
-            f"""
-            <div class="transcript-container">
-                <div class="transcript-content">
-                    {st.session_state.final_transcript}
-                </div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+        render_transcript_browser()
         
         col1, col2 = st.columns(2)
         
         with col1:
-            if st.session_state.transcript_pdf:
-                st.download_button(
-                    "⬇️ Download Transcript as PDF", 
-                    data=st.session_state.transcript_pdf, 
-                    file_name="Transcript.pdf",
-                    mime="application/pdf",
-                    use_container_width=True
-                )
+            render_artifact_download(
+                "transcript_pdf",
+                {"text": st.session_state.final_transcript},
+                "⬇️ Download Transcript as PDF",
+                file_name="Transcript.pdf",
+                mime="application/pdf",
+                key="transcript_pdf",
+                prepare_label="📄 Prepare Transcript PDF"
+            )
         
         with col2:
-            if st.session_state.transcript_audio:
-                st.download_button(
-                    "⬇️ Download Audio Preview", 
-                    data=st.session_state.transcript_audio, 
-                    file_name="Transcript_Preview.mp3",
-                    mime="audio/mp3",
-                    use_container_width=True
-                )
+            render_artifact_download(
+                "audio",
+                audio_inputs,
+                "⬇️ Download Audio Preview",
+                file_name="Transcript_Preview.mp3",
+                mime="audio/mp3",
+                key="transcript_audio",
+                prepare_label="🔊 Prepare Audio Preview"
+            )
     
     with transcript_tabs[1]:
-        # Audio player for transcript
-        if st.session_state.transcript_audio:
-            st.session_state.transcript_audio.seek(0)  # Reset pointer
-            st.markdown(
-                get_audio_player_html(
-                    st.session_state.transcript_audio, 
-                    "Transcript Audio Preview"
-                ), 
-                unsafe_allow_html=True
-            )
+        # Audio player for transcript, generated the first time it is requested
+        transcript_audio = prepare_artifact(
+            "audio",
+            audio_inputs,
+            "🔊 Generate Audio Preview",
+            key="transcript_audio_player"
+        )
+        if transcript_audio:
+            render_audio_player(transcript_audio, "Transcript Audio Preview")
             st.caption("Note: Audio preview is limited to approximately the first 500 words")
         else:
-            st.info("Audio preview is not available.")
\ No newline at end of file
+            st.info("Audio preview is generated on request.")
\ No newline at end of file
@@ -118,6 +118,16 @@ def apply_custom_css():
             line-height: 1.6;
         }
         
+        .transcript-segment {
+            padding: calc(var(--spacing-unit) * 0.5) calc(var(--spacing-unit));
+            border-radius: var(--border-radius);
+        }
+        
+        .transcript-segment.current {
+            background-color: rgba(30, 136, 229, 0.1);
+            border-left: 3px solid var(--primary-color);
+        }
+        
         /* Summary Section */
         .summary-container {
             background-color: var(--card-background);
@@ -160,6 +170,12 @@ def apply_custom_css():
             white-space: pre-line;
         }
         
+        .speaker-timestamp {
+            color: var(--primary-color);
+            font-weight: 600;
+            font-variant-numeric: tabular-nums;
+        }
+        
         .speaker-summary-card {
             background-color: var(--card-background);
             border-radius: var(--border-radius);
@@ -0,0 +1,129 @@
+import json
+import os
+import tempfile
+
+from utils.cache import make_key
+from utils.pdf import create_pdf, create_dual_language_summary_pdf
+from utils.audio import create_audio
+from utils.backends import get_backend
+from utils.tracing import trace
+
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", ".streamlit/artifacts")
+# Oldest artifacts are removed once the directory grows past this size
+ARTIFACT_MAX_BYTES = int(os.getenv("ARTIFACT_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Number of words read out in the transcript audio preview
+TRANSCRIPT_AUDIO_WORDS = 500
+
+def transcript_preview(transcript_text, max_words=TRANSCRIPT_AUDIO_WORDS):
+    """Return the first words of a transcript, used for the audio preview."""
+    return " ".join(transcript_text.split()[:max_words])
+
+def _build_insights_pdf(insights_data):
+    return create_pdf(
+        "",
+        title="Video Insights",
+        is_insights=True,
+        insights_data=insights_data
+    )
+
+def _build_speaker_pdf(speaker_data):
+    return create_pdf(
+        "",
+        title="Speaker Transcript",
+        is_transcript_with_speakers=True,
+        speaker_data=speaker_data
+    )
+
+# Every downloadable file, mapped to (builder, file extension). Builders take
+# the artifact inputs as keyword arguments and return a (BytesIO, error) tuple.
+ARTIFACT_BUILDERS = {
+    "transcript_pdf": (lambda text: create_pdf(text, title="Transcript"), ".pdf"),
+    "summary_pdf": (lambda text: create_pdf(text, title="Summary"), ".pdf"),
+    "dual_summary_pdf": (
+        lambda english, hindi: create_dual_language_summary_pdf(
+            english, hindi, title="Video Summary (English & Hindi)"
+        ),
+        ".pdf"
+    ),
+    "speaker_pdf": (_build_speaker_pdf, ".pdf"),
+    "insights_pdf": (_build_insights_pdf, ".pdf"),
+    "speaker_summary_pdf": (lambda text, title: create_pdf(text, title=title), ".pdf"),
+    "audio": (lambda text, language='en': create_audio(text, language), ".mp3"),
+}
+
+def artifact_path(kind, **inputs):
+    """Return the content-addressed path of an artifact built from ``inputs``."""
+    _, extension = ARTIFACT_BUILDERS[kind]
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False)
+    if kind == "audio" and get_backend("tts").fake:
+        # Fake speech is stored apart so it is never served as real audio
+        key = make_key("fake", kind, payload)
+    else:
+        key = make_key(kind, payload)
+    return os.path.join(ARTIFACT_DIR, key + extension)
+
+def find_artifact(kind, **inputs):
+    """Return the path of an already generated artifact, or None."""
+    path = artifact_path(kind, **inputs)
+    try:
+        # Touch the file so pruning removes the least recently used ones first
+        os.utime(path)
+        return path
+    except OSError:
+        return None
+
+def get_artifact(kind, **inputs):
+    """Return an artifact's path, generating and storing it on first request."""
+    path = find_artifact(kind, **inputs)
+    if path is not None:
+        return path, None
+
+    builder, _ = ARTIFACT_BUILDERS[kind]
+    with trace(kind, kind="artifact") as span:
+        buffer, error = builder(**inputs)
+        span.error = error
+        if buffer is not None:
+            span.set(output_bytes=len(buffer.getvalue()))
+    if error:
+        return None, error
+
+    try:
+        os.makedirs(ARTIFACT_DIR, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=ARTIFACT_DIR, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(buffer.getvalue())
+        path = artifact_path(kind, **inputs)
+        os.replace(tmp_path, path)
+        _prune_artifacts()
+    except OSError as e:
+        return None, f"Could not store generated file: {str(e)}"
+
+    return path, None
+
+def read_artifact(path):
+    """Return the bytes of a stored artifact."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _prune_artifacts():
+    """Delete least recently used artifacts once the directory is too large."""
+    entries = []
+    for name in os.listdir(ARTIFACT_DIR):
+        path = os.path.join(ARTIFACT_DIR, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= ARTIFACT_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
\ No newline at end of file
@@ -1,28 +1,12 @@
 import io
-from gtts import gTTS
+from utils.backends import get_backend
+from utils.tracing import trace
 
 def create_audio(text, language='en'):
     """Create an MP3 audio file from text using Google TTS."""
     try:
-        audio_buffer = io.BytesIO()
-        tts = gTTS(text=text, lang=language, slow=False)
-        tts.write_to_fp(audio_buffer)
-        audio_buffer.seek(0)
+        with trace("tts.synthesize", kind="external", chars=len(text), language=language):
+            audio_buffer = io.BytesIO(get_backend("tts").synthesize(text, language))
         return audio_buffer, None
     except Exception as e:
-        return None, f"Audio creation failed: {str(e)}"
-
-def get_audio_player_html(audio_data, label="Audio Player"):
-    """Create an HTML audio player with the given audio data."""
-    import base64
-    audio_base64 = base64.b64encode(audio_data.read()).decode()
-    audio_html = f"""
-        <div class="audio-player">
-            <p class="audio-label">{label}</p>
-            <audio controls class="audio-control">
-                <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mp3">
-                Your browser does not support the audio element.
-            </audio>
-        </div>
-    """
-    return audio_html
\ No newline at end of file
+        return None, f"Audio creation failed: {str(e)}"
\ No newline at end of file
@@ -0,0 +1,392 @@
+import base64
+import io
+import json
+import os
+import random
+import re
+import threading
+import time
+
+from utils.cache import DiskCache, make_key
+
+# External services used by the pipeline, behind swappable backends.
+#
+# Each service has one small interface:
+#
+# - LLM: ``generate(prompt, stream=False)`` returns the response text, or an
+#   iterator of text pieces when ``stream`` is True.
+# - Translation: ``translate(text, target_language)`` returns the translation.
+# - Text to speech: ``synthesize(text, language)`` returns MP3 bytes.
+#
+# The backend of every service is chosen with ``BACKEND`` and can be
+# overridden per service with ``LLM_BACKEND``, ``TRANSLATION_BACKEND`` and
+# ``TTS_BACKEND``:
+#
+# - ``live``: the real Gemini, Google Translate and gTTS services.
+# - ``fake``: local stand-ins with configurable latency and error rates, for
+#   load testing without network access or quota.
+# - ``record``: the live services, with every response also stored on disk.
+# - ``replay``: responses stored by ``record``, without any network access.
+
+GEMINI_MODEL = "gemini-1.5-pro"
+BACKEND_MODES = ("live", "fake", "record", "replay")
+
+# Responses captured in record mode, never evicted
+recordings = DiskCache(os.getenv("BACKEND_RECORDINGS_PATH", ".streamlit/recordings.sqlite3"))
+# Replay responses after the time the live call took, or immediately
+REPLAY_LATENCY = os.getenv("REPLAY_LATENCY", "1") == "1"
+
+# Fake backends: latency distributions as "<kind>:<params>" (see
+# parse_latency), error probabilities per call, and the seed that makes
+# latencies, errors and fake responses reproducible between runs
+FAKE_SEED = os.getenv("FAKE_SEED", "0")
+FAKE_LATENCY_SCALE = float(os.getenv("FAKE_LATENCY_SCALE", "1.0"))
+FAKE_LLM_LATENCY = os.getenv("FAKE_LLM_LATENCY", "lognormal:2.0:0.5")
+FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+FAKE_LLM_RATE_LIMIT_RATE = float(os.getenv("FAKE_LLM_RATE_LIMIT_RATE", "0"))
+FAKE_LLM_OUTPUT_WORDS = int(os.getenv("FAKE_LLM_OUTPUT_WORDS", "150"))
+FAKE_TRANSLATION_LATENCY = os.getenv("FAKE_TRANSLATION_LATENCY", "lognormal:0.3:0.3")
+FAKE_TRANSLATION_ERROR_RATE = float(os.getenv("FAKE_TRANSLATION_ERROR_RATE", "0"))
+FAKE_TTS_LATENCY = os.getenv("FAKE_TTS_LATENCY", "lognormal:1.0:0.4")
+FAKE_TTS_ERROR_RATE = float(os.getenv("FAKE_TTS_ERROR_RATE", "0"))
+
+def backend_mode(service):
+    """Configured mode of a service ("llm", "translation" or "tts")."""
+    mode = os.getenv(f"{service.upper()}_BACKEND", os.getenv("BACKEND", "live")).lower()
+    if mode not in BACKEND_MODES:
+        raise ValueError(f"Unknown {service} backend '{mode}', expected one of: {', '.join(BACKEND_MODES)}")
+    return mode
+
+# Live services
+
+class GeminiBackend:
+    """Google Gemini through google-generativeai."""
+    fake = False
+
+    def __init__(self, model_name=GEMINI_MODEL):
+        import google.generativeai as genai
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if api_key:
+            genai.configure(api_key=api_key)
+        self._model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt, stream=False):
+        if not stream:
+            return self._model.generate_content(prompt).text
+        return self._stream(prompt)
+
+    def _stream(self, prompt):
+        for chunk in self._model.generate_content(prompt, stream=True):
+            try:
+                yield chunk.text
+            except ValueError:
+                # Chunks without text (e.g. only safety ratings) carry nothing to show
+                continue
+
+class GoogleTranslateBackend:
+    """Google Translate through deep_translator."""
+    fake = False
+
+    def __init__(self):
+        # GoogleTranslator keeps per-request state on the instance, so every
+        # thread gets its own translator per target language
+        self._local = threading.local()
+
+    def _translator(self, target_language):
+        translators = getattr(self._local, "translators", None)
+        if translators is None:
+            translators = self._local.translators = {}
+        if target_language not in translators:
+            from deep_translator import GoogleTranslator
+            translators[target_language] = GoogleTranslator(source='auto', target=target_language)
+        return translators[target_language]
+
+    def translate(self, text, target_language):
+        return self._translator(target_language).translate(text) or ""
+
+class GTTSBackend:
+    """Google text to speech through gTTS."""
+    fake = False
+
+    def synthesize(self, text, language):
+        from gtts import gTTS
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=language, slow=False).write_to_fp(buffer)
+        return buffer.getvalue()
+
+# Fake services
+
+class FakeBackendError(Exception):
+    """Simulated API failure, carrying an HTTP status like google.api_core errors."""
+
+    def __init__(self, message, code):
+        super().__init__(message)
+        self.code = code
+
+def parse_latency(spec):
+    """Parse a latency distribution into a function of a random.Random.
+
+    Supported forms (seconds): "fixed:<s>", "uniform:<low>:<high>",
+    "normal:<mean>:<std>", "lognormal:<median>:<sigma>" and
+    "exponential:<mean>".
+    """
+    kind, *params = spec.split(":")
+    params = [float(param) for param in params]
+    samplers = {
+        "fixed": lambda rng: params[0],
+        "uniform": lambda rng: rng.uniform(params[0], params[1]),
+        "normal": lambda rng: rng.gauss(params[0], params[1]),
+        "lognormal": lambda rng: params[0] * rng.lognormvariate(0, params[1]),
+        "exponential": lambda rng: rng.expovariate(1 / params[0]) if params[0] > 0 else 0.0
+    }
+    if kind not in samplers:
+        raise ValueError(f"Unknown latency distribution '{kind}'")
+    sampler = samplers[kind]
+    return lambda rng: max(sampler(rng), 0.0) * FAKE_LATENCY_SCALE
+
+class _FakeService:
+    """Latency and failure simulation shared by the fake backends.
+
+    Every call gets its own random generator, seeded from FAKE_SEED, the
+    request and how often that request was made before, so results do not
+    depend on thread scheduling.
+    """
+    fake = True
+
+    def __init__(self, service, latency, error_rate):
+        self.service = service
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _rng(self, *request):
+        key = make_key(self.service, *request)
+        with self._lock:
+            attempt = self._calls.get(key, 0)
+            self._calls[key] = attempt + 1
+        return random.Random(make_key(FAKE_SEED, key, attempt))
+
+    def _fail(self, rng, rate_limit_rate=0.0):
+        """Raise a simulated error according to the configured rates."""
+        roll = rng.random()
+        if roll < rate_limit_rate:
+            raise FakeBackendError(
+                f"429 Resource has been exhausted. Please retry in {rng.uniform(0.5, 2.0):.1f}s.", 429
+            )
+        if roll < rate_limit_rate + self.error_rate:
+            raise FakeBackendError("503 The service is currently unavailable.", 503)
+
+_INDEXED_SEGMENT = re.compile(r"^\[(\d+)\]", re.MULTILINE)
+_SENTENCE = re.compile(r"[^.!?\n]+[.!?]?")
+
+class FakeLLMBackend(_FakeService):
+    """Answers every prompt the pipeline sends with plausible, well-formed output."""
+
+    def __init__(self):
+        super().__init__("llm", FAKE_LLM_LATENCY, FAKE_LLM_ERROR_RATE)
+        self.rate_limit_rate = FAKE_LLM_RATE_LIMIT_RATE
+
+    def generate(self, prompt, stream=False):
+        rng = self._rng(prompt)
+        latency = self.latency(rng)
+        if not stream:
+            time.sleep(latency)
+            self._fail(rng, self.rate_limit_rate)
+            return self._respond(prompt, rng)
+        return self._stream(prompt, rng, latency)
+
+    def _stream(self, prompt, rng, latency):
+        # Most of the latency is spent before the first piece arrives
+        time.sleep(latency * 0.3)
+        self._fail(rng, self.rate_limit_rate)
+        words = self._respond(prompt, rng).split(" ")
+        pieces = [" ".join(words[i:i + 8]) + " " for i in range(0, len(words), 8)]
+        for piece in pieces:
+            time.sleep(latency * 0.7 / len(pieces))
+            yield piece
+
+    def _sentences(self, text, rng, count):
+        sentences = [s.strip() for s in _SENTENCE.findall(text) if len(s.split()) >= 4]
+        if not sentences:
+            sentences = ["The speakers discuss the topic of the video."]
+        return [rng.choice(sentences) for _ in range(count)]
+
+    def _respond(self, prompt, rng):
+        from utils import constants
+        if prompt.startswith(constants.INDEXED_DIARIZATION_PROMPT):
+            return json.dumps(self._diarization(prompt, rng))
+        if prompt.startswith((constants.COMBINED_INSIGHTS_PROMPT, constants.INSIGHTS_MERGE_PROMPT)):
+            return json.dumps(self._insights(prompt, rng))
+        sections = {
+            constants.KEY_POINTS_PROMPT: "key_points",
+            constants.QUOTES_PROMPT: "quotes",
+            constants.QA_PROMPT: "qa_pairs",
+            constants.THEMES_PROMPT: "themes"
+        }
+        for section_prompt, key in sections.items():
+            if prompt.startswith(section_prompt):
+                return json.dumps({key: self._insights(prompt, rng)[key]})
+
+        # Summaries of any kind: sentences picked from the input
+        text = " ".join(self._sentences(prompt, rng, max(FAKE_LLM_OUTPUT_WORDS // 12, 1)))
+        return " ".join(text.split()[:FAKE_LLM_OUTPUT_WORDS])
+
+    def _diarization(self, prompt, rng):
+        indexes = [int(index) for index in _INDEXED_SEGMENT.findall(prompt)]
+        ranges = {"Speaker 1": [], "Speaker 2": []}
+        position = 0
+        speaker = "Speaker 1"
+        while position < len(indexes):
+            length = rng.randint(3, 15)
+            chunk = indexes[position:position + length]
+            ranges[speaker].append([chunk[0], chunk[-1]])
+            position += length
+            speaker = "Speaker 2" if speaker == "Speaker 1" else "Speaker 1"
+        return {
+            "speakers": [
+                {"id": speaker_id, "name": "host" if speaker_id == "Speaker 1" else "", "ranges": speaker_ranges}
+                for speaker_id, speaker_ranges in ranges.items() if speaker_ranges
+            ]
+        }
+
+    def _insights(self, prompt, rng):
+        sentences = self._sentences(prompt, rng, 16)
+        return {
+            "key_points": sentences[:6],
+            "quotes": [{"text": sentence, "speaker": "Speaker 1"} for sentence in sentences[6:9]],
+            "qa_pairs": [{
+                "question": sentences[9].rstrip(".!") + "?",
+                "asker": "Speaker 1",
+                "answer": sentences[10],
+                "answerer": "Speaker 2"
+            }],
+            "themes": [
+                {"name": " ".join(sentence.split()[:3]).title(), "description": sentence}
+                for sentence in sentences[11:15]
+            ]
+        }
+
+class FakeTranslationBackend(_FakeService):
+    """Marks every line with the target language, keeping the line structure."""
+
+    def __init__(self):
+        super().__init__("translation", FAKE_TRANSLATION_LATENCY, FAKE_TRANSLATION_ERROR_RATE)
+
+    def translate(self, text, target_language):
+        rng = self._rng(target_language, text)
+        time.sleep(self.latency(rng))
+        self._fail(rng)
+        return "\n".join(f"[{target_language}] {line}" for line in text.split("\n"))
+
+class FakeTTSBackend(_FakeService):
+    """Returns placeholder bytes about as large as the real MP3 would be."""
+
+    def __init__(self):
+        super().__init__("tts", FAKE_TTS_LATENCY, FAKE_TTS_ERROR_RATE)
+
+    def synthesize(self, text, language):
+        rng = self._rng(language, text)
+        time.sleep(self.latency(rng))
+        self._fail(rng)
+        # gTTS produces roughly 1 KB of MP3 per 10 characters of text
+        return b"ID3" + bytes(len(text) * 100)
+
+# Record and replay
+
+class RecordingBackend:
+    """Calls the live backend and stores every successful response."""
+    fake = False
+
+    def __init__(self, service, backend):
+        self.service = service
+        self._backend = backend
+
+    def generate(self, prompt, stream=False):
+        started = time.monotonic()
+        if not stream:
+            text = self._backend.generate(prompt)
+            self._store(("generate", prompt), {"pieces": [text]}, started)
+            return text
+        return self._record_stream(prompt, started)
+
+    def _record_stream(self, prompt, started):
+        pieces = []
+        for piece in self._backend.generate(prompt, stream=True):
+            pieces.append(piece)
+            yield piece
+        self._store(("generate", prompt), {"pieces": pieces}, started)
+
+    def translate(self, text, target_language):
+        started = time.monotonic()
+        translated = self._backend.translate(text, target_language)
+        self._store(("translate", text, target_language), {"text": translated}, started)
+        return translated
+
+    def synthesize(self, text, language):
+        started = time.monotonic()
+        audio = self._backend.synthesize(text, language)
+        self._store(("synthesize", text, language), {"audio": base64.b64encode(audio).decode("ascii")}, started)
+        return audio
+
+    def _store(self, request, response, started):
+        response["seconds"] = time.monotonic() - started
+        recordings.set(make_key(self.service, *request), response)
+
+class ReplayBackend:
+    """Serves responses stored by RecordingBackend, without network access."""
+    fake = False
+
+    def __init__(self, service):
+        self.service = service
+
+    def _load(self, *request):
+        response = recordings.get(make_key(self.service, *request))
+        if response is None:
+            # Not retryable: record this request first
+            raise LookupError(f"No recorded {self.service} response for this request")
+        if REPLAY_LATENCY:
+            time.sleep(response.get("seconds", 0))
+        return response
+
+    def generate(self, prompt, stream=False):
+        pieces = self._load("generate", prompt)["pieces"]
+        return iter(pieces) if stream else "".join(pieces)
+
+    def translate(self, text, target_language):
+        return self._load("translate", text, target_language)["text"]
+
+    def synthesize(self, text, language):
+        return base64.b64decode(self._load("synthesize", text, language)["audio"])
+
+# Backend selection
+
+_LIVE_BACKENDS = {
+    "llm": GeminiBackend,
+    "translation": GoogleTranslateBackend,
+    "tts": GTTSBackend
+}
+_FAKE_BACKENDS = {
+    "llm": FakeLLMBackend,
+    "translation": FakeTranslationBackend,
+    "tts": FakeTTSBackend
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+def get_backend(service):
+    """Return the configured backend of a service, created once per process."""
+    with _backends_lock:
+        if service not in _backends:
+            mode = backend_mode(service)
+            if mode == "fake":
+                backend = _FAKE_BACKENDS[service]()
+            elif mode == "replay":
+                backend = ReplayBackend(service)
+            elif mode == "record":
+                backend = RecordingBackend(service, _LIVE_BACKENDS[service]())
+            else:
+                backend = _LIVE_BACKENDS[service]()
+            _backends[service] = backend
+        return _backends[service]
\ No newline at end of file
@@ -0,0 +1,316 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+
+# Hit/miss counters and access times are kept in memory and written once
+# this many lookups or seconds have passed, so a lookup is a single read
+STATS_FLUSH_LOOKUPS = 100
+STATS_FLUSH_SECONDS = 10
+# Eviction runs only once a limit is exceeded and then shrinks the cache
+# to this fraction of its limits, so the next writes do not evict again
+EVICTION_TARGET = 0.9
+# Keys looked up per query by get_many, below SQLite's bound parameter limit
+KEYS_PER_QUERY = 500
+
+def make_key(*parts):
+    """Build a content-addressed cache key from any number of string parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = str(part).encode("utf-8")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+class DiskCache:
+    """Persistent key/value cache backed by a SQLite file.
+
+    Values are stored as zlib-compressed JSON, so anything JSON-serializable
+    can be cached. The file can be shared by several Streamlit sessions and
+    processes at once. Entries expire after ``ttl`` seconds (``None`` keeps
+    them forever) and the least recently used entries are evicted once
+    ``max_entries`` or ``max_bytes`` is exceeded. Hit and miss counters are
+    stored in the same file so they cover every process using it, next to
+    the number and size of the entries, which triggers keep up to date.
+    """
+
+    def __init__(self, path, max_entries=None, max_bytes=None, ttl=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._local = threading.local()
+        self._pending_lock = threading.Lock()
+        self._pending = {"hits": 0, "misses": 0}
+        self._touched = {}
+        self._last_flush = time.time()
+
+    @contextmanager
+    def _connect(self):
+        """Use this thread's connection and commit on success."""
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    directory = os.path.dirname(self.path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    conn = sqlite3.connect(self.path, timeout=30)
+                    try:
+                        self._create_schema(conn)
+                    finally:
+                        conn.close()
+                    self._initialized = True
+
+        conn = getattr(self._local, "conn", None)
+        # A connection must not be shared with a forked child process
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        try:
+            with conn:
+                yield conn
+        except Exception:
+            # Start over with a fresh connection next time
+            self._local.conn = None
+            conn.close()
+            raise
+
+    def _create_schema(self, conn):
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_created ON entries (created)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, count INTEGER NOT NULL)"
+        )
+        conn.commit()
+
+        # Running totals, so writes never have to scan the table to evict
+        conn.execute("BEGIN IMMEDIATE")
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'entries_insert'"
+        ).fetchone()
+        if not exists:
+            conn.execute(
+                "INSERT OR REPLACE INTO stats (name, count) "
+                "SELECT 'entries', COUNT(*) FROM entries UNION ALL "
+                "SELECT 'bytes', COALESCE(SUM(size), 0) FROM entries"
+            )
+            conn.execute(
+                """CREATE TRIGGER entries_insert AFTER INSERT ON entries BEGIN
+                    UPDATE stats SET count = count + 1 WHERE name = 'entries';
+                    UPDATE stats SET count = count + NEW.size WHERE name = 'bytes';
+                END"""
+            )
+            conn.execute(
+                """CREATE TRIGGER entries_delete AFTER DELETE ON entries BEGIN
+                    UPDATE stats SET count = count - 1 WHERE name = 'entries';
+                    UPDATE stats SET count = count - OLD.size WHERE name = 'bytes';
+                END"""
+            )
+            conn.execute(
+                """CREATE TRIGGER entries_update AFTER UPDATE OF size ON entries BEGIN
+                    UPDATE stats SET count = count - OLD.size + NEW.size WHERE name = 'bytes';
+                END"""
+            )
+        conn.commit()
+
+    def _totals(self, conn):
+        """Return the number of entries and their size in bytes."""
+        totals = dict(conn.execute("SELECT name, count FROM stats WHERE name IN ('entries', 'bytes')"))
+        return totals.get("entries", 0), totals.get("bytes", 0)
+
+    def _record(self, conn, now, hits=(), misses=0):
+        """Count hits and misses and write the counters once enough have piled up."""
+        with self._pending_lock:
+            self._pending["hits"] += len(hits)
+            self._pending["misses"] += misses
+            for key in hits:
+                self._touched[key] = now
+            due = (
+                self._pending["hits"] + self._pending["misses"] >= STATS_FLUSH_LOOKUPS
+                or now - self._last_flush >= STATS_FLUSH_SECONDS
+            )
+        if due:
+            self._flush(conn, now)
+
+    def _flush(self, conn, now):
+        """Write the pending hit/miss counts and access times."""
+        with self._pending_lock:
+            pending, touched = self._pending, self._touched
+            self._pending = {"hits": 0, "misses": 0}
+            self._touched = {}
+            self._last_flush = now
+        if touched:
+            conn.executemany(
+                "UPDATE entries SET accessed = MAX(accessed, ?) WHERE key = ?",
+                [(accessed, key) for key, accessed in touched.items()]
+            )
+        counts = [(name, count) for name, count in pending.items() if count]
+        if counts:
+            conn.executemany(
+                "INSERT INTO stats (name, count) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET count = count + excluded.count",
+                counts
+            )
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` or ``default`` on a miss."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value, created FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                now = time.time()
+
+                if row and self.ttl is not None and now - row[1] > self.ttl:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    row = None
+
+                if row is None:
+                    self._record(conn, now, misses=1)
+                    return default
+
+                self._record(conn, now, hits=[key])
+                return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+        except Exception:
+            # A broken cache must never break the app - treat it as a miss
+            return default
+
+    def get_many(self, keys):
+        """Return ``{key: value}`` for every one of ``keys`` in the cache.
+
+        Looks up all keys over one connection, so thousands of lookups cost
+        a few queries instead of a round trip each.
+        """
+        keys = list(dict.fromkeys(keys))
+        try:
+            with self._connect() as conn:
+                rows = []
+                for i in range(0, len(keys), KEYS_PER_QUERY):
+                    batch = keys[i:i + KEYS_PER_QUERY]
+                    rows += conn.execute(
+                        f"SELECT key, value, created FROM entries WHERE key IN ({', '.join('?' * len(batch))})",
+                        batch
+                    ).fetchall()
+                now = time.time()
+
+                if self.ttl is not None:
+                    expired = [(key,) for key, _, created in rows if now - created > self.ttl]
+                    conn.executemany("DELETE FROM entries WHERE key = ?", expired)
+                    rows = [row for row in rows if now - row[2] <= self.ttl]
+
+                found = {key: json.loads(zlib.decompress(value).decode("utf-8")) for key, value, _ in rows}
+                self._record(conn, now, hits=list(found), misses=len(keys) - len(found))
+                return found
+        except Exception:
+            return {}
+
+    def set(self, key, value):
+        """Store ``value`` under ``key`` and evict old entries if needed."""
+        return self.set_many({key: value})
+
+    def set_many(self, items):
+        """Store every value of the ``items`` dict in one transaction."""
+        try:
+            now = time.time()
+            rows = []
+            for key, value in items.items():
+                data = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+                rows.append((key, data, len(data), now, now))
+            with self._connect() as conn:
+                self._flush(conn, now)
+                # An upsert rather than INSERT OR REPLACE, whose implicit delete skips the triggers
+                conn.executemany(
+                    "INSERT INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                    "created = excluded.created, accessed = excluded.accessed",
+                    rows
+                )
+                self._evict(conn, now)
+            return True
+        except Exception:
+            return False
+
+    def delete(self, key):
+        """Remove a single entry."""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return True
+        except Exception:
+            return False
+
+    def clear(self):
+        """Remove every entry and reset the hit/miss counters."""
+        try:
+            with self._pending_lock:
+                self._pending = {"hits": 0, "misses": 0}
+                self._touched = {}
+            with self._connect() as conn:
+                conn.execute("DELETE FROM entries")
+                conn.execute("DELETE FROM stats WHERE name IN ('hits', 'misses')")
+            return True
+        except Exception:
+            return False
+
+    def _evict(self, conn, now):
+        if self.ttl is not None:
+            conn.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl,))
+
+        if self.max_entries is None and self.max_bytes is None:
+            return
+        entries, size = self._totals(conn)
+        over_entries = self.max_entries is not None and entries > self.max_entries
+        over_bytes = self.max_bytes is not None and size > self.max_bytes
+        if not over_entries and not over_bytes:
+            return
+
+        # Walk from the least recently used entry until we are well below the limits
+        excess_entries = entries - int(self.max_entries * EVICTION_TARGET) if self.max_entries is not None else 0
+        excess_bytes = size - int(self.max_bytes * EVICTION_TARGET) if self.max_bytes is not None else 0
+        to_delete = []
+        for key, entry_size in conn.execute("SELECT key, size FROM entries ORDER BY accessed ASC"):
+            if excess_entries <= 0 and excess_bytes <= 0:
+                break
+            to_delete.append((key,))
+            excess_entries -= 1
+            excess_bytes -= entry_size
+        conn.executemany("DELETE FROM entries WHERE key = ?", to_delete)
+
+    def stats(self):
+        """Return hit/miss counters and current size of the cache."""
+        try:
+            with self._connect() as conn:
+                self._flush(conn, time.time())
+                counts = dict(conn.execute("SELECT name, count FROM stats").fetchall())
+                entries, size = counts.get("entries", 0), counts.get("bytes", 0)
+        except Exception:
+            counts, entries, size = {}, 0, 0
+
+        hits = counts.get("hits", 0)
+        misses = counts.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size
+        }
\ No newline at end of file
@@ -28,6 +28,23 @@ Return your response as a JSON object with this format:
 }
 Here's the transcript: """
 
+# Compact diarization: the model only returns segment index ranges per speaker
+INDEXED_DIARIZATION_PROMPT = """You're analyzing a transcript from a YouTube video to identify different speakers.
+The transcript is split into numbered segments, one per line, in the form "[index] text".
+Identify the distinct speakers and which segments each of them spoke.
+Label speakers as Speaker 1, Speaker 2, etc. in order of first appearance.
+If a speaker's name or role (for example "host") is evident from the transcript, add it as "name".
+Do NOT repeat the transcript text. Return only a JSON object listing, for each speaker,
+the inclusive ranges of segment indexes they spoke, with this format:
+{
+    "speakers": [
+        {"id": "Speaker 1", "name": "host", "ranges": [[0, 4], [9, 12]]},
+        {"id": "Speaker 2", "name": "", "ranges": [[5, 8], [13, 20]]}
+    ]
+}
+Every segment index should belong to exactly one range.
+Here's the transcript: """
+
 SPEAKER_SUMMARY_PROMPT = """You're analyzing a transcript segment from a specific speaker in a YouTube video.
 Please provide a concise summary (50-100 words) of this speaker's key points and contributions.
 Focus on their main arguments, insights, or information they shared.
@@ -93,4 +110,58 @@ Format your response as a JSON array with this structure:
         }
     ]
 }
-Here's the transcript: """
\ No newline at end of file
+Here's the transcript: """
+
+# All four insight types in a single request, sharing one copy of the transcript
+COMBINED_INSIGHTS_PROMPT = """Analyze this YouTube video transcript and extract four kinds of insights:
+- "key_points": the 5-7 most valuable and important points, each a concise sentence that would be useful to someone who hasn't watched the video.
+- "quotes": 3-5 of the most impactful, insightful or memorable quotes, using the exact quote text.
+- "qa_pairs": the explicit questions asked and the answers given to them.
+- "themes": 3-5 main themes or topics, each with a brief description of how it relates to the video.
+Respond with only a JSON object, no other text, with exactly this structure:
+{
+    "key_points": [
+        "First important point in a concise sentence",
+        "Second important point in a concise sentence"
+    ],
+    "quotes": [
+        {
+            "text": "The exact quote text",
+            "speaker": "Speaker name/number if available, otherwise 'Unknown'"
+        }
+    ],
+    "qa_pairs": [
+        {
+            "question": "The exact question text",
+            "asker": "Speaker who asked the question (if known, otherwise 'Unknown')",
+            "answer": "The answer provided in response to the question",
+            "answerer": "Speaker who provided the answer (if known, otherwise 'Unknown')"
+        }
+    ],
+    "themes": [
+        {
+            "name": "Name of the theme/topic",
+            "description": "Brief explanation of this theme and its importance in the video"
+        }
+    ]
+}
+Use an empty list for any section with nothing to report.
+Here's the transcript: """
+
+# Prompts for long transcripts that are processed part by part (map-reduce)
+CHUNK_SUMMARY_PROMPT = """You are summarizing one part of a longer YouTube video transcript.
+Summarize the important points of this part in under 200 words.
+Keep names, numbers, arguments and conclusions so the parts can be combined later.
+Here's the transcript part: """
+
+PARTIAL_SUMMARIES_NOTE = """(The transcript was too long to process at once. Below are summaries of its
+consecutive parts, in order. Treat them together as the full video.)
+
+"""
+
+INSIGHTS_MERGE_PROMPT = """The following JSON objects were extracted from consecutive parts of one long YouTube video transcript.
+Merge them into a single JSON object with exactly the same keys and the same item structure.
+Remove duplicates and keep only the most important items, as many as the instructions below ask for
+when extracting from the whole video.
+Instructions used for each part:
+"""
\ No newline at end of file
@@ -0,0 +1,139 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+
+from utils.tracing import trace, in_current_span
+
+@dataclass
+class Stage:
+    """A unit of pipeline work and the stages whose results it needs.
+
+    ``func`` is called with one keyword argument per dependency (the value
+    produced by that stage) and must return a ``(value, error)`` tuple, like
+    the rest of the helpers in ``utils``.
+    """
+    name: str
+    func: object
+    deps: tuple = ()
+    label: str = ""
+    critical: bool = False
+
+@dataclass
+class StageResult:
+    """Outcome of a single stage run."""
+    value: object = None
+    error: str = None
+    skipped: bool = False
+
+@dataclass
+class RunResult:
+    """Outcome of a whole stage graph run."""
+    results: dict = field(default_factory=dict)
+    failed_stage: str = None
+
+    def value(self, name, default=None):
+        result = self.results.get(name)
+        if result is None or result.skipped:
+            return default
+        return result.value
+
+    def error(self, name):
+        result = self.results.get(name)
+        return result.error if result else None
+
+def _validate(stages):
+    """Check stage names are unique, dependencies exist and there are no cycles."""
+    by_name = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        by_name[stage.name] = stage
+
+    for stage in stages:
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+    # Kahn's algorithm - every stage must become ready at some point
+    remaining = {stage.name: set(stage.deps) for stage in stages}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Stage graph has a cycle between: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+    return by_name
+
+def _call_stage(stage, kwargs):
+    """Run a stage function in its own span, turning exceptions into an error tuple."""
+    with trace(stage.name, kind="stage", critical=stage.critical) as span:
+        try:
+            value, error = stage.func(**kwargs)
+            result = StageResult(value=value, error=error)
+        except Exception as e:
+            result = StageResult(error=f"{stage.name} failed: {str(e)}", skipped=True)
+        span.error = result.error
+        span.set(skipped=result.skipped)
+    return result
+
+def run_stages(stages, max_workers=4, on_start=None, on_finish=None):
+    """Run a graph of stages, executing every ready stage concurrently.
+
+    Scheduling and the ``on_start(stage)`` / ``on_finish(stage, result)``
+    callbacks happen on the calling thread, so callbacks may safely use
+    Streamlit elements. Only the stage functions run on worker threads.
+
+    A stage whose function raised is marked as skipped and so are all stages
+    that depend on it. When a ``critical`` stage reports an error no further
+    stages are started and the run stops once in-flight stages finish.
+    """
+    by_name = _validate(stages)
+    run = RunResult()
+    pending = [stage.name for stage in stages]
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            # Start every stage whose dependencies have all finished
+            if run.failed_stage is None:
+                for name in list(pending):
+                    stage = by_name[name]
+                    if not all(dep in run.results for dep in stage.deps):
+                        continue
+                    pending.remove(name)
+
+                    failed_deps = [dep for dep in stage.deps if run.results[dep].skipped]
+                    if failed_deps:
+                        result = StageResult(
+                            error=f"{name} skipped because {', '.join(failed_deps)} failed",
+                            skipped=True
+                        )
+                        run.results[name] = result
+                        if on_finish:
+                            on_finish(stage, result)
+                        continue
+
+                    kwargs = {dep: run.results[dep].value for dep in stage.deps}
+                    if on_start:
+                        on_start(stage)
+                    running[pool.submit(in_current_span(_call_stage), stage, kwargs)] = stage
+
+            if not running:
+                # Either everything is done, or newly skipped stages unblocked others
+                if pending and run.failed_stage is None:
+                    continue
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                result = future.result()
+                run.results[stage.name] = result
+                if on_finish:
+                    on_finish(stage, result)
+                if stage.critical and result.error and run.failed_stage is None:
+                    run.failed_stage = stage.name
+
+    return run
\ No newline at end of file
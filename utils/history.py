@@ -1,84 +1,130 @@
-import streamlit as st
-import datetime
 import pickle
 import os
+import json
+import sqlite3
+import zlib
+from contextlib import contextmanager
 
-def save_to_history(video_id, video_title, data_dict):
-    """Save video processing results to history."""
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", ".streamlit/history.sqlite3")
+# Whole-file pickle used by older versions, imported once into the database
+LEGACY_HISTORY_PATH = ".streamlit/video_history.pkl"
+
+_schema_ready = False
+
+@contextmanager
+def _connect():
+    """Open a connection to the history database, creating it if needed."""
+    global _schema_ready
+    os.makedirs(os.path.dirname(HISTORY_DB_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(HISTORY_DB_PATH, timeout=30)
     try:
-        # Create a timestamp
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Create history entry
-        history_entry = {
-            "video_id": video_id,
-            "video_title": video_title,
-            "timestamp": timestamp,
-            "data": data_dict
-        }
-        
-        # Add to history dictionary using video_id as key
-        st.session_state.video_history[video_id] = history_entry
-        
-        # Optionally save to disk for persistence across sessions
-        try:
-            # Make sure directory exists
-            os.makedirs('.streamlit', exist_ok=True)
-            with open('.streamlit/video_history.pkl', 'wb') as f:
-                pickle.dump(st.session_state.video_history, f)
-        except Exception as e:
-            st.warning(f"Could not save history to disk: {e}")
-            
-        return True
-    except Exception as e:
-        st.warning(f"Error saving history: {e}")
-        return False
+        with conn:
+            if not _schema_ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS history (
+                        video_id TEXT PRIMARY KEY,
+                        video_title TEXT NOT NULL,
+                        timestamp TEXT NOT NULL,
+                        data BLOB NOT NULL
+                    )"""
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS history_timestamp ON history (timestamp)")
+                conn.execute("CREATE INDEX IF NOT EXISTS history_title ON history (video_title COLLATE NOCASE)")
+                _migrate_legacy_history(conn)
+                _schema_ready = True
+            yield conn
+    finally:
+        conn.close()
+
+def _encode(data_dict):
+    return zlib.compress(json.dumps(data_dict, ensure_ascii=False).encode("utf-8"))
 
-def load_history_from_disk():
-    """Load history from disk file."""
+def _decode(blob):
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+def _migrate_legacy_history(conn):
+    """Import entries from the old pickle file, then move it out of the way."""
+    if not os.path.exists(LEGACY_HISTORY_PATH):
+        return
     try:
-        with open('.streamlit/video_history.pkl', 'rb') as f:
-            st.session_state.video_history = pickle.load(f)
-        return True
+        with open(LEGACY_HISTORY_PATH, 'rb') as f:
+            legacy_history = pickle.load(f)
+        for entry in legacy_history.values():
+            conn.execute(
+                "INSERT OR IGNORE INTO history (video_id, video_title, timestamp, data) VALUES (?, ?, ?, ?)",
+                (entry["video_id"], entry["video_title"], entry["timestamp"], _encode(entry["data"]))
+            )
+        os.replace(LEGACY_HISTORY_PATH, LEGACY_HISTORY_PATH + ".migrated")
     except Exception:
-        # If file doesn't exist or can't be read, just use empty dict
-        if "video_history" not in st.session_state:
-            st.session_state.video_history = {}
-        return False
+        # Leave the old file in place; the app keeps working with the new store
+        pass
+
+# Sort options for the history list, mapped to their ORDER BY clause
+HISTORY_SORT_ORDERS = {
+    "Newest first": "timestamp DESC",
+    "Oldest first": "timestamp ASC",
+    "Title (A-Z)": "video_title COLLATE NOCASE ASC, timestamp DESC",
+    "Title (Z-A)": "video_title COLLATE NOCASE DESC, timestamp DESC"
+}
+
+def _search_clause(search):
+    """Build a WHERE clause matching the search text against title and ID."""
+    if not search:
+        return "", ()
+    pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return (
+        "WHERE video_title LIKE ? ESCAPE '\\' OR video_id LIKE ? ESCAPE '\\'",
+        (pattern, pattern)
+    )
 
-def load_video_from_history(video_id):
-    """Load a specific video's data from history."""
-    if video_id in st.session_state.video_history:
-        history_entry = st.session_state.video_history[video_id]
-        data = history_entry["data"]
-        
-        # Load data back into session state
-        st.session_state.final_summary = data.get("summary", "")
-        st.session_state.hindi_summary = data.get("hindi_summary", "")
-        st.session_state.final_transcript = data.get("transcript", "")
-        st.session_state.speaker_data = data.get("speaker_data", {})
-        st.session_state.speaker_summaries = data.get("speaker_summaries", {})
-        st.session_state.sentiment_data = data.get("sentiment_data", {})
-        st.session_state.speaker_sentiment = data.get("speaker_sentiment", {})
-        st.session_state.key_points = data.get("key_points", [])
-        st.session_state.impactful_quotes = data.get("impactful_quotes", [])
-        st.session_state.questions_answers = data.get("questions_answers", [])
-        st.session_state.key_themes = data.get("key_themes", [])
-        st.session_state.video_id = video_id
-        
-        # Regenerate dual language PDF for summary
-        from utils.pdf import create_dual_language_summary_pdf
-        dual_summary_pdf, pdf_error = create_dual_language_summary_pdf(
-            st.session_state.final_summary, 
-            st.session_state.hindi_summary,
-            title="Video Summary (English & Hindi)"
+def query_history_entries(search="", sort="Newest first", limit=10, offset=0):
+    """Return one page of history metadata, without the heavy data."""
+    where, params = _search_clause(search)
+    order = HISTORY_SORT_ORDERS.get(sort, HISTORY_SORT_ORDERS["Newest first"])
+    with _connect() as conn:
+        rows = conn.execute(
+            f"SELECT video_id, video_title, timestamp FROM history {where} "
+            f"ORDER BY {order} LIMIT ? OFFSET ?",
+            params + (limit, offset)
+        ).fetchall()
+    return [
+        {"video_id": video_id, "video_title": video_title, "timestamp": timestamp}
+        for video_id, video_title, timestamp in rows
+    ]
+
+def count_history_entries(search=""):
+    """Return how many history entries match the search text."""
+    where, params = _search_clause(search)
+    with _connect() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM history {where}", params).fetchone()[0]
+
+def get_history_data(video_id):
+    """Return the stored analysis data for a single video, or None."""
+    with _connect() as conn:
+        row = conn.execute("SELECT data FROM history WHERE video_id = ?", (video_id,)).fetchone()
+    return _decode(row[0]) if row else None
+
+def has_history_entry(video_id):
+    """Return True if the video has already been analyzed."""
+    with _connect() as conn:
+        row = conn.execute("SELECT 1 FROM history WHERE video_id = ?", (video_id,)).fetchone()
+    return row is not None
+
+def store_history_entry(video_id, video_title, timestamp, data_dict):
+    """Insert or replace a single history entry."""
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO history (video_id, video_title, timestamp, data) VALUES (?, ?, ?, ?)",
+            (video_id, video_title, timestamp, _encode(data_dict))
         )
-        
-        if pdf_error:
-            st.warning(pdf_error)
-        else:
-            st.session_state.dual_summary_pdf = dual_summary_pdf
-        
-        st.session_state.processing_complete = True
-        return True
-    return False
\ No newline at end of file
+
+def delete_history_entry(video_id):
+    """Delete a single history entry."""
+    with _connect() as conn:
+        conn.execute("DELETE FROM history WHERE video_id = ?", (video_id,))
+
+def clear_history_entries():
+    """Delete every history entry."""
+    with _connect() as conn:
+        conn.execute("DELETE FROM history")
\ No newline at end of file
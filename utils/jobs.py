@@ -0,0 +1,164 @@
+import os
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, replace
+
+from utils.processing import (
+    analyze, analysis_steps, apply_stage_value, AnalysisOptions, AnalysisResult
+)
+from utils.sentiment import load_lexicon
+
+# Number of videos analyzed at the same time, across every browser session
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Finished jobs are kept this long so reconnecting pages can pick them up
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+
+@dataclass
+class Job:
+    """A queued or running analysis and its partial result."""
+    job_id: str
+    video_id: str
+    options: AnalysisOptions
+    status: str = "queued"  # queued, running, done or failed
+    label: str = "Waiting for a free worker..."
+    steps: list = field(default_factory=list)
+    finished_stages: list = field(default_factory=list)
+    result: AnalysisResult = None
+    error: str = None
+    created: float = field(default_factory=time.time)
+    finished: float = None
+
+    @property
+    def active(self):
+        return self.status in ("queued", "running")
+
+    @property
+    def pending_stages(self):
+        """Steps whose results are not available yet."""
+        if not self.active:
+            return []
+        return [name for name in self.steps if name not in self.finished_stages]
+
+def video_id_from_job_id(job_id):
+    """Return the video a job ID belongs to."""
+    # Job IDs are "<video ID>-<hex suffix>"; video IDs may contain dashes too
+    return job_id.rsplit("-", 1)[0]
+
+class JobQueue:
+    """Runs analyses on background worker threads.
+
+    Jobs are kept in a registry shared by the whole process, so they keep
+    running across Streamlit reruns and browser reconnects and any session
+    can look one up by its ID. Threads are enough here because the stages
+    themselves are network-bound and already run on their own thread pool.
+    """
+
+    def __init__(self, workers=JOB_WORKERS):
+        self._queue = queue.Queue()
+        self._jobs = {}
+        self._lock = threading.Lock()
+        for i in range(max(workers, 1)):
+            threading.Thread(target=self._work, name=f"analysis-worker-{i}", daemon=True).start()
+        # Parse the sentiment lexicon while the first transcript is being fetched
+        threading.Thread(target=load_lexicon, name="lexicon-loader", daemon=True).start()
+
+    def submit(self, video_id, options=None):
+        """Queue an analysis and return its job ID.
+
+        A video that is already queued or running is not analyzed twice; the
+        existing job's ID is returned instead.
+        """
+        with self._lock:
+            self._prune()
+            for job in self._jobs.values():
+                if job.video_id == video_id and job.active:
+                    return job.job_id
+            job = Job(
+                job_id=f"{video_id}-{uuid.uuid4().hex[:8]}",
+                video_id=video_id,
+                options=options or AnalysisOptions(),
+                steps=analysis_steps(),
+                result=AnalysisResult(video_id=video_id)
+            )
+            self._jobs[job.job_id] = job
+        self._queue.put(job.job_id)
+        return job.job_id
+
+    def get(self, job_id):
+        """Return a snapshot of a job, or None if it is unknown or expired."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            # Workers only ever assign new values, so shallow copies are consistent
+            return replace(job, finished_stages=list(job.finished_stages), result=replace(job.result))
+
+    def _prune(self):
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished < cutoff]:
+            del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            with self._lock:
+                job = self._jobs.get(job_id)
+            if job is not None:
+                self._run(job)
+
+    def _run(self, job):
+        running = []
+
+        def on_start(stage):
+            with self._lock:
+                job.status = "running"
+                running.append(stage)
+                job.label = running[0].label
+
+        def on_finish(stage, stage_result):
+            with self._lock:
+                if stage in running:
+                    running.remove(stage)
+                if running:
+                    job.label = running[0].label
+                apply_stage_value(job.result, stage.name, None if stage_result.skipped else stage_result.value)
+                if stage_result.error:
+                    job.result.errors = {**job.result.errors, stage.name: stage_result.error}
+                job.finished_stages = job.finished_stages + [stage.name]
+
+        def on_summary_chunk(piece):
+            # The summary tab shows the text written so far until the stage finishes
+            with self._lock:
+                job.result.summary = job.result.summary + piece
+
+        try:
+            result = analyze(
+                job.video_id, job.options,
+                on_start=on_start, on_finish=on_finish, on_summary_chunk=on_summary_chunk
+            )
+            error = result.error
+        except Exception as e:
+            result, error = None, f"Processing failed: {str(e)}"
+
+        with self._lock:
+            if error:
+                job.status = "failed"
+                job.error = error
+            else:
+                job.status = "done"
+                job.result = result
+            job.label = ""
+            job.finished = time.time()
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+def get_job_queue():
+    """Return the process-wide job queue, starting its workers on first use."""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue()
+        return _job_queue
\ No newline at end of file
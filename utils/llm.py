@@ -0,0 +1,254 @@
+import os
+import random
+import re
+import threading
+import time
+
+from utils.backends import GEMINI_MODEL, get_backend
+from utils.tracing import trace
+
+# Quotas of our API key. Requests wait for the limiter instead of failing
+# with a 429, so set these to the limits shown in the Google AI console.
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", "60"))
+GEMINI_TPM = int(os.getenv("GEMINI_TPM", "1000000"))
+# Requests in flight at the same time, across every session in the process
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "5"))
+GEMINI_BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", "1.0"))
+GEMINI_BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", "60.0"))
+
+# Tokens are estimated from characters before a request is sent; the answer
+# is charged once it is known. Summaries and insights rarely exceed this.
+CHARS_PER_TOKEN = 4
+OUTPUT_TOKEN_ESTIMATE = 1024
+
+# HTTP status codes worth retrying: rate limited, or a transient server error
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+_RETRY_IN = re.compile(r"retry in ([\d.]+)\s*s", re.IGNORECASE)
+
+class TokenBucket:
+    """Thread-safe token bucket holding ``capacity`` tokens, refilled over ``period`` seconds."""
+
+    def __init__(self, capacity, period=60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount=1):
+        """Take ``amount`` tokens, waiting until they are available.
+
+        Requests larger than the bucket only wait for a full bucket. Returns
+        the number of seconds spent waiting.
+        """
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def charge(self, amount):
+        """Take tokens without waiting; the balance may go negative."""
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+# gRPC status names and the HTTP status they correspond to
+_GRPC_STATUS_CODES = {
+    "RESOURCE_EXHAUSTED": 429,
+    "INTERNAL": 500,
+    "UNAVAILABLE": 503,
+    "DEADLINE_EXCEEDED": 504
+}
+
+def _error_code(error):
+    """HTTP status of an API error, if it has one."""
+    code = getattr(error, "code", None)
+    if callable(code):
+        # Raw gRPC errors expose their status as a method
+        code = _GRPC_STATUS_CODES.get(getattr(code(), "name", None))
+    return code if isinstance(code, int) else None
+
+def is_retryable(error):
+    """Return True for rate limits, transient server errors and network errors."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return _error_code(error) in RETRYABLE_CODES
+
+def retry_hint(error):
+    """Seconds the API asked us to wait before retrying, or None."""
+    for detail in getattr(error, "details", None) or []:
+        # google.rpc.RetryInfo attached to ResourceExhausted errors
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            return delay.seconds + delay.nanos / 1e9
+    response = getattr(error, "response", None)
+    retry_after = getattr(response, "headers", {}).get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    match = _RETRY_IN.search(str(error))
+    return float(match.group(1)) if match else None
+
+def backoff_delay(attempt, hint=None):
+    """Jittered exponential backoff, never shorter than the server's hint."""
+    delay = random.uniform(0, min(GEMINI_BACKOFF_MAX, GEMINI_BACKOFF_BASE * 2 ** attempt))
+    if hint is not None:
+        # Spread retries after the hint so waiting requests do not all fire at once
+        delay = hint + random.uniform(0, GEMINI_BACKOFF_BASE)
+    return delay
+
+class GeminiClient:
+    """Gemini model shared by every request in the process.
+
+    Every call waits for the requests-per-minute and tokens-per-minute
+    buckets, holds a slot of the global concurrency semaphore while it runs,
+    and is retried with jittered exponential backoff on rate limits and
+    transient errors. Counters are available from ``metrics()``, and every
+    call is traced as a "gemini.generate" span covering all of its attempts.
+    """
+
+    def __init__(self, model_name=GEMINI_MODEL, rpm=GEMINI_RPM, tpm=GEMINI_TPM,
+                 max_concurrency=GEMINI_MAX_CONCURRENCY, max_retries=GEMINI_MAX_RETRIES):
+        self.model_name = model_name
+        self.max_retries = max_retries
+        # Live Gemini, or a fake / recorded stand-in (see utils/backends.py)
+        self._backend = get_backend("llm")
+        self.fake = self._backend.fake
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._metrics = {
+            "requests": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "throttled_seconds": 0.0,
+            "backoff_seconds": 0.0,
+            "latency_seconds": 0.0,
+            "input_tokens": 0,
+            "output_tokens": 0
+        }
+
+    def _count(self, **changes):
+        with self._lock:
+            for name, change in changes.items():
+                self._metrics[name] += change
+            self._metrics["peak_in_flight"] = max(self._metrics["peak_in_flight"], self._metrics["in_flight"])
+
+    def metrics(self):
+        """Return a copy of the request counters."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        attempts = metrics["requests"] - metrics["in_flight"]
+        metrics["average_latency_seconds"] = metrics["latency_seconds"] / attempts if attempts else 0.0
+        return metrics
+
+    def _call(self, prompt, on_chunk):
+        if not on_chunk:
+            return self._backend.generate(prompt)
+        pieces = []
+        for piece in self._backend.generate(prompt, stream=True):
+            pieces.append(piece)
+            on_chunk(piece)
+        return "".join(pieces)
+
+    def generate(self, prompt, on_chunk=None):
+        """Return the response text for ``prompt``, streaming it to ``on_chunk`` if given."""
+        input_tokens = estimate_tokens(prompt)
+        streamed = []
+        if on_chunk:
+            def on_chunk_tracked(piece):
+                streamed.append(piece)
+                on_chunk(piece)
+        else:
+            on_chunk_tracked = None
+
+        throttled = 0.0
+        rate_limited = 0
+        with trace("gemini.generate", kind="external", model=self.model_name, fake=self.fake) as span:
+            span.set(prompt_chars=len(prompt), input_tokens=input_tokens)
+            for attempt in range(self.max_retries + 1):
+                waited = self._requests.acquire(1)
+                waited += self._tokens.acquire(input_tokens + OUTPUT_TOKEN_ESTIMATE)
+                self._count(requests=1, throttled_seconds=waited)
+                throttled += waited
+                span.set(retries=attempt, throttled_seconds=round(throttled, 3))
+
+                with self._semaphore:
+                    self._count(in_flight=1)
+                    started = time.monotonic()
+                    try:
+                        content = self._call(prompt, on_chunk_tracked)
+                        error = None
+                    except Exception as e:
+                        content, error = None, e
+                    finally:
+                        self._count(in_flight=-1, latency_seconds=time.monotonic() - started)
+
+                if error is None:
+                    output_tokens = estimate_tokens(content)
+                    # Settle the estimate taken up front against the real answer size
+                    self._tokens.charge(output_tokens - OUTPUT_TOKEN_ESTIMATE)
+                    self._count(succeeded=1, input_tokens=input_tokens, output_tokens=output_tokens)
+                    span.set(output_tokens=output_tokens)
+                    return content
+
+                if _error_code(error) == 429:
+                    self._count(rate_limited=1)
+                    rate_limited += 1
+                    span.set(rate_limited=rate_limited)
+                # A partly streamed answer cannot be retried without repeating text
+                if not is_retryable(error) or streamed or attempt == self.max_retries:
+                    self._count(failed=1)
+                    raise error
+
+                delay = backoff_delay(attempt, retry_hint(error))
+                self._count(retries=1, backoff_seconds=delay)
+                time.sleep(delay)
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_gemini_client():
+    """Return the process-wide Gemini client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GeminiClient()
+        return _client
+
+def limit_gemini_client(rpm, tpm):
+    """Replace the process-wide client with one held to lower quotas.
+
+    For worker processes that share the API key, and so its quota, with
+    other processes.
+    """
+    global _client
+    with _client_lock:
+        _client = GeminiClient(rpm=rpm, tpm=tpm)
+
+def gemini_metrics():
+    """Request counters of the shared Gemini client."""
+    return get_gemini_client().metrics()
\ No newline at end of file
@@ -1,65 +1,484 @@
-import streamlit as st
 import re
 import json
-import google.generativeai as genai
-from textblob import TextBlob
-from deep_translator import GoogleTranslator
 import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
-# Initialize Gemini API
-api_key = os.getenv("GOOGLE_API_KEY")
-if api_key:
-    genai.configure(api_key=api_key)
+from utils.cache import DiskCache, make_key
+from utils.llm import GEMINI_MODEL, get_gemini_client
+from utils.backends import get_backend
+from utils.youtube import format_timestamp
+from utils.sentiment import score_texts
+from utils.tracing import trace, annotate, in_current_span
 
-def generate_summary(text, prompt):
-    """Generate a summary using Gemini Pro API."""
+# Inputs longer than this are split into parts and processed map-reduce style
+MAX_PROMPT_CHARS = 100000
+# Size of each part, and how many parts are sent to Gemini at the same time
+CHUNK_CHARS = int(os.getenv("SUMMARY_CHUNK_CHARS", "30000"))
+SUMMARY_WORKERS = int(os.getenv("SUMMARY_WORKERS", "4"))
+
+# Diarization runs over overlapping windows of transcript segments so that
+# every request stays small; the overlap is used to match speaker labels.
+DIARIZATION_WINDOW_SEGMENTS = int(os.getenv("DIARIZATION_WINDOW_SEGMENTS", "400"))
+DIARIZATION_WINDOW_OVERLAP = int(os.getenv("DIARIZATION_WINDOW_OVERLAP", "40"))
+DIARIZATION_WORKERS = int(os.getenv("DIARIZATION_WORKERS", "4"))
+SPEAKER_SUMMARY_WORKERS = int(os.getenv("SPEAKER_SUMMARY_WORKERS", "4"))
+
+# Shared response cache: identical model + prompt + input never hits the API twice.
+# It lives on disk so every Streamlit session and process reuses the same answers.
+llm_cache = DiskCache(
+    os.getenv("LLM_CACHE_PATH", ".streamlit/llm_cache.sqlite3"),
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000")),
+    max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+    ttl=int(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+)
+
+# Translation memory: (target language, source sentence) -> translated sentence
+translation_memory = DiskCache(
+    os.getenv("TRANSLATION_MEMORY_PATH", ".streamlit/translation_memory.sqlite3"),
+    max_entries=int(os.getenv("TRANSLATION_MEMORY_MAX_ENTRIES", "200000"))
+)
+
+# Maximum number of translation requests running at the same time
+TRANSLATION_WORKERS = int(os.getenv("TRANSLATION_WORKERS", "4"))
+
+def _parse_json(content):
+    """Parse a JSON response, unwrapping markdown code blocks if present."""
+    json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', content)
+    if json_match:
+        content = json_match.group(1)
+    return json.loads(content)
+
+def _generate(prompt, text, parse=None, on_chunk=None):
+    """Run prompt + text through Gemini, going through the response cache.
+
+    When ``parse`` is given the response is only cached once it parses, so a
+    malformed answer is retried on the next run instead of being replayed.
+    When ``on_chunk`` is given the response is streamed and every new piece of
+    text is passed to it as it arrives (a cached response arrives in one piece).
+    """
+    client = get_gemini_client()
+    # Fake responses are cached apart so they never replace real ones
+    model = "fake:" + GEMINI_MODEL if client.fake else GEMINI_MODEL
+    key = make_key(model, prompt, text)
+    with trace("llm.generate", kind="llm", prompt_chars=len(prompt) + len(text), streamed=bool(on_chunk)) as span:
+        content = llm_cache.get(key)
+        span.set(cache_hit=content is not None)
+        if content is None:
+            # Rate limiting, retries and the concurrency cap live in the shared client
+            content = client.generate(prompt + text, on_chunk)
+            result = parse(content) if parse else content
+            llm_cache.set(key, content)
+            return result
+        if on_chunk:
+            on_chunk(content)
+        return parse(content) if parse else content
+
+def _chunk_transcript(text, segments, max_chars):
+    """Split a transcript into parts of at most max_chars characters.
+
+    When the timestamped segments are available the split follows segment
+    boundaries and each part carries its start and end time; otherwise the
+    text is split on sentence boundaries. Returns (text, start, end) tuples.
+    """
+    if segments:
+        groups = []
+        current = []
+        size = 0
+        for segment in segments:
+            added = len(segment["text"]) + 1
+            if current and size + added > max_chars:
+                groups.append(current)
+                current, size = [], 0
+            current.append(segment)
+            size += added
+        if current:
+            groups.append(current)
+        return [
+            (
+                " ".join(segment["text"] for segment in group),
+                group[0]["start"],
+                group[-1]["start"] + group[-1].get("duration", 0)
+            )
+            for group in groups
+        ]
+    
+    sentences = [sentence for sentence, _ in _split_sentences(text, max_chars) if sentence.strip()]
+    return [(" ".join(chunk), None, None) for chunk in _pack_chunks(sentences, max_chars)]
+
+def _part_header(index, total, start, end):
+    """Label a transcript part, including its time range when known."""
+    header = f"[Part {index} of {total}"
+    if start is not None:
+        header += f", {format_timestamp(start)} - {format_timestamp(end)}"
+    return header + "]"
+
+def _map_chunks(func, chunks, max_workers=None):
+    """Apply func to every chunk concurrently, keeping the original order."""
+    with ThreadPoolExecutor(max_workers=min(max_workers or SUMMARY_WORKERS, len(chunks))) as pool:
+        return list(pool.map(in_current_span(func), chunks))
+
+def _truncate(text, max_length=MAX_PROMPT_CHARS):
+    """Limit text length to avoid API limits."""
+    if len(text) > max_length:
+        return text[:max_length] + "... (truncated due to length)"
+    return text
+
+def generate_summary(text, prompt, segments=None, on_chunk=None):
+    """Generate a summary using Gemini Pro API.
+
+    Transcripts longer than MAX_PROMPT_CHARS are summarized part by part in
+    parallel and the partial summaries are then combined with ``prompt``.
+    With ``on_chunk`` the final summary is streamed to it piece by piece.
+    """
     try:
-        # Limit text length to avoid API limits
-        max_length = 100000
-        if len(text) > max_length:
-            text = text[:max_length] + "... (truncated due to length)"
-        
-        model = genai.GenerativeModel("gemini-1.5-pro")
-        response = model.generate_content(prompt + text)
-        return response.text, None
+        if len(text) <= MAX_PROMPT_CHARS:
+            return _generate(prompt, text, on_chunk=on_chunk), None
+        
+        from utils.constants import CHUNK_SUMMARY_PROMPT, PARTIAL_SUMMARIES_NOTE
+        chunks = _chunk_transcript(text, segments, CHUNK_CHARS)
+        partials = _map_chunks(lambda chunk: _generate(CHUNK_SUMMARY_PROMPT, chunk[0]), chunks)
+        
+        combined = "\n\n".join(
+            f"{_part_header(i, len(chunks), start, end)}\n{partial}"
+            for i, ((_, start, end), partial) in enumerate(zip(chunks, partials), 1)
+        )
+        return _generate(prompt, _truncate(PARTIAL_SUMMARIES_NOTE + combined), on_chunk=on_chunk), None
     except Exception as e:
         return "", f"Summary generation failed: {str(e)}"
 
+# Sentence boundaries: line breaks, or whitespace after end-of-sentence punctuation
+_SENTENCE_BOUNDARY = re.compile(r'(\n+|(?<=[.!?।])\s+)')
+
+def _split_sentences(text, max_size):
+    """Split text into (sentence, separator) pairs on paragraph and sentence boundaries.
+
+    Sentences longer than ``max_size`` are split on the last space that fits,
+    so words are never cut in half unless a single word is longer than that.
+    """
+    parts = _SENTENCE_BOUNDARY.split(text)
+    units = []
+    for i in range(0, len(parts), 2):
+        sentence = parts[i]
+        separator = parts[i + 1] if i + 1 < len(parts) else ""
+        while len(sentence) > max_size:
+            cut = sentence.rfind(" ", 0, max_size)
+            if cut <= 0:
+                units.append((sentence[:max_size], ""))
+                sentence = sentence[max_size:]
+            else:
+                units.append((sentence[:cut], " "))
+                sentence = sentence[cut + 1:]
+        units.append((sentence, separator))
+    return units
+
+def _pack_chunks(sentences, max_size):
+    """Group sentences into newline-joined chunks of at most max_size characters."""
+    chunks = []
+    current = []
+    current_size = 0
+    for sentence in sentences:
+        added = len(sentence) + (1 if current else 0)
+        if current and current_size + added > max_size:
+            chunks.append(current)
+            current, current_size = [], 0
+            added = len(sentence)
+        current.append(sentence)
+        current_size += added
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _translation_service():
+    """Translation memory namespace of the configured translation backend."""
+    return "fake" if get_backend("translation").fake else "google"
+
+def _translate_chunk(sentences, target_language):
+    """Translate a group of sentences in one request and store them in the memory.
+
+    If the translation comes back with a different number of lines, the
+    group is split in halves and translated again, down to single sentences.
+    """
+    text = "\n".join(sentences)
+    with trace("translate", kind="external", chars=len(text), sentences=len(sentences), language=target_language):
+        translated = get_backend("translation").translate(text, target_language)
+    lines = translated.split("\n")
+    
+    if len(lines) != len(sentences):
+        if len(sentences) == 1:
+            # A single sentence translated with line breaks of its own
+            lines = [translated]
+        else:
+            # Line breaks were not preserved - translate each half on its own until they are
+            middle = len(sentences) // 2
+            result = _translate_chunk(sentences[:middle], target_language)
+            result.update(_translate_chunk(sentences[middle:], target_language))
+            return result
+    
+    service = _translation_service()
+    translation_memory.set_many({
+        make_key(service, target_language, sentence): line for sentence, line in zip(sentences, lines)
+    })
+    return dict(zip(sentences, lines))
+
 def translate_text(text, target_language):
     """Translate text to target language."""
     try:
-        # Handle text in chunks if it's too long
+        # Chunk on sentence and paragraph boundaries below the translator limit
         max_chunk_size = 4900  # Google Translator limit is 5000 characters
+        units = _split_sentences(text, max_chunk_size)
         
-        if len(text) <= max_chunk_size:
-            translator = GoogleTranslator(source='auto', target=target_language)
-            return translator.translate(text), None
+        # Reuse earlier translations of the same sentence from the translation memory
+        service = _translation_service()
+        sentences = list(dict.fromkeys(sentence for sentence, _ in units if sentence.strip()))
+        keys = {sentence: make_key(service, target_language, sentence) for sentence in sentences}
+        cached = translation_memory.get_many(keys.values())
+        translations = {sentence: cached[keys[sentence]] for sentence in sentences if keys[sentence] in cached}
+        missing = [sentence for sentence in sentences if keys[sentence] not in cached]
         
-        # Split text into chunks for translation
-        chunks = [text[i:i+max_chunk_size] for i in range(0, len(text), max_chunk_size)]
-        translator = GoogleTranslator(source='auto', target=target_language)
-        translated_chunks = [translator.translate(chunk) for chunk in chunks]
+        # Translate the remaining sentences concurrently, several per request
+        chunks = _pack_chunks(missing, max_chunk_size)
+        annotate(memory_hits=len(translations), memory_misses=len(missing), translation_requests=len(chunks))
+        if chunks:
+            translate_chunk = in_current_span(lambda chunk: _translate_chunk(chunk, target_language))
+            with ThreadPoolExecutor(max_workers=min(TRANSLATION_WORKERS, len(chunks))) as pool:
+                for result in pool.map(translate_chunk, chunks):
+                    translations.update(result)
         
-        return ''.join(translated_chunks), None
+        return ''.join(translations.get(sentence, sentence) + separator for sentence, separator in units), None
     except Exception as e:
         return "", f"Translation failed: {str(e)}"
 
-def perform_speaker_diarization(transcript):
-    """Identify different speakers in the transcript."""
+def _number_segments(segments):
+    """Render transcript segments as "[index] text" lines for indexed prompts."""
+    return "\n".join(
+        f"[{i}] {' '.join(segment['text'].split())}" for i, segment in enumerate(segments)
+    )
+
+def _segment_owners(segments, response):
+    """Map every segment index to a speaker ID from a ranges response."""
+    owners = [None] * len(segments)
+    for speaker in response.get("speakers", []):
+        speaker_id = str(speaker.get("id") or "Unknown")
+        for index_range in speaker.get("ranges", []):
+            if isinstance(index_range, int):
+                first = last = index_range
+            else:
+                first, last = int(index_range[0]), int(index_range[-1])
+            for i in range(max(first, 0), min(last, len(segments) - 1) + 1):
+                # Overlapping ranges: the first speaker to claim a segment keeps it
+                if owners[i] is None:
+                    owners[i] = speaker_id
+    
+    if not any(owners):
+        raise ValueError("no speaker ranges in the response")
+    
+    # Segments the model skipped belong to whoever was speaking just before
+    previous = next(owner for owner in owners if owner)
+    for i, owner in enumerate(owners):
+        if owner is None:
+            owners[i] = previous
+        else:
+            previous = owner
+    return owners
+
+def _window_bounds(count, size, overlap):
+    """Return (start, end) bounds of overlapping windows covering count items."""
+    step = max(size - overlap, 1)
+    bounds = []
+    start = 0
+    while True:
+        end = min(start + size, count)
+        bounds.append((start, end))
+        if end >= count:
+            return bounds
+        start += step
+
+def _diarize_window(window):
+    """Diarize one window of segments.
+
+    Returns (per-segment labels, {label: lowercased name}) or None on failure.
+    """
+    from utils.constants import INDEXED_DIARIZATION_PROMPT
     try:
-        model = genai.GenerativeModel("gemini-1.5-pro")
-        from utils.constants import DIARIZATION_PROMPT
-        response = model.generate_content(DIARIZATION_PROMPT + transcript)
+        response = _generate(INDEXED_DIARIZATION_PROMPT, _number_segments(window), parse=_parse_json)
+        names = {
+            str(speaker.get("id") or "Unknown"): str(speaker.get("name") or "").strip().lower()
+            for speaker in response.get("speakers", [])
+        }
+        return _segment_owners(window, response), names
+    except Exception:
+        return None
+
+def _reconcile_windows(count, bounds, window_results):
+    """Merge per-window speaker labels into one consistent labelling.
+
+    A window's labels are matched to the speaker they share the most
+    segments with in the overlap with the previous window, or else to a
+    speaker with the same name or role; any other label is a new speaker,
+    since a guest who only joins later must not take over the label of
+    someone who stopped talking. A window that overlaps no labelled segment,
+    because the one before it failed, has no overlap to go by: its labels
+    are paired with the last labelled window's speakers, busiest first.
+    Inside an overlap the first half keeps the earlier window's labels and
+    the second half takes the later one's, so every segment is labelled by
+    the window it sits deepest in.
+    """
+    owners = [None] * count
+    speaker_names = {}
+    next_label = 0
+    previous_end = 0
+    # Segments per speaker in the last labelled window
+    last_counts = Counter()
+    for (start, end), result in zip(bounds, window_results):
+        if result is None:
+            continue
+        local, local_names = result
+        
+        shared = [i for i in range(start, min(end, previous_end)) if owners[i] is not None]
+        votes = Counter((local[i - start], owners[i]) for i in shared)
+        mapping = {}
+        used = set()
+        for (local_label, global_label), _ in votes.most_common():
+            if local_label not in mapping and global_label not in used:
+                mapping[local_label] = global_label
+                used.add(global_label)
+        
+        unmatched = [label for label in dict.fromkeys(local) if label not in mapping]
+        for local_label in unmatched:
+            name = local_names.get(local_label, "")
+            named = [label for label, known in speaker_names.items() if name and known == name and label not in used]
+            if named:
+                mapping[local_label] = named[0]
+                used.add(named[0])
+        
+        if not shared and last_counts:
+            # Across a gap left by a failed window, pair speakers by how much they talk
+            local_counts = Counter(local)
+            previous_speakers = [label for label, _ in last_counts.most_common() if label not in used]
+            for local_label in sorted(unmatched, key=lambda label: -local_counts[label]):
+                if local_label not in mapping and previous_speakers:
+                    mapping[local_label] = previous_speakers.pop(0)
+                    used.add(mapping[local_label])
         
-        # Parse the JSON from the response
-        content = response.text
-        # Extract JSON if it's wrapped in markdown code blocks
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', content)
-        if json_match:
-            content = json_match.group(1)
+        for local_label in unmatched:
+            if local_label not in mapping:
+                mapping[local_label] = next_label
+                next_label += 1
         
-        # Clean any remaining text and parse JSON
-        speaker_data = json.loads(content)
+        for local_label, global_label in mapping.items():
+            if local_names.get(local_label) and global_label not in speaker_names:
+                speaker_names[global_label] = local_names[local_label]
+        
+        keep_until = start + (max(previous_end, start) - start) // 2
+        for i in range(start, end):
+            if i < keep_until and owners[i] is not None:
+                continue
+            owners[i] = mapping[local[i - start]]
+        previous_end = max(previous_end, end)
+        last_counts = Counter(mapping[label] for label in local)
+    return owners
+
+def _name_speakers(owners):
+    """Rename labels to Speaker 1, Speaker 2, ... in order of first appearance."""
+    names = {}
+    for owner in owners:
+        if owner is not None and owner not in names:
+            names[owner] = f"Speaker {len(names) + 1}"
+    # Segments from windows that failed have no label at all
+    return [names.get(owner, "Speaker (Unknown)") for owner in owners]
+
+def _split_window(start, end, overlap):
+    """Split a window in two halves that overlap each other by about ``overlap`` items."""
+    middle = (start + end) // 2
+    half_overlap = min(overlap, (end - start) // 2) // 2
+    return [(start, middle + half_overlap), (middle - half_overlap, end)]
+
+def _retry_failed_windows(bounds, window_results, diarize, overlap=DIARIZATION_WINDOW_OVERLAP):
+    """Retry every failed window once, as two smaller windows.
+
+    The halves start and end where the failed window did, so they still
+    overlap its neighbours and are reconciled like any other window.
+    ``diarize`` maps a list of bounds to their results. Returns the new
+    bounds and results.
+    """
+    failed = [window for window, result in zip(bounds, window_results) if result is None]
+    if not failed:
+        return bounds, window_results
+    halves = [half for window in failed for half in _split_window(*window, overlap)]
+    retried = iter(diarize(halves))
+    new_bounds = []
+    new_results = []
+    for window, result in zip(bounds, window_results):
+        if result is not None:
+            new_bounds.append(window)
+            new_results.append(result)
+            continue
+        for half in _split_window(*window, overlap):
+            new_bounds.append(half)
+            new_results.append(next(retried))
+    return new_bounds, new_results
+
+def _diarize_segments(segments):
+    """Label every segment with a speaker, one window per request, in parallel."""
+    def diarize(windows):
+        return _map_chunks(
+            lambda window: _diarize_window(segments[window[0]:window[1]]),
+            windows,
+            DIARIZATION_WORKERS
+        )
+    
+    bounds = _window_bounds(len(segments), DIARIZATION_WINDOW_SEGMENTS, DIARIZATION_WINDOW_OVERLAP)
+    window_results = diarize(bounds)
+    # Answers that do not parse are not retried by the client, so ask again in smaller pieces
+    bounds, window_results = _retry_failed_windows(bounds, window_results, diarize)
+    annotate(diarization_windows=len(bounds), failed_windows=sum(result is None for result in window_results))
+    if not any(window_results):
+        raise ValueError("no diarization window could be processed")
+    return _name_speakers(_reconcile_windows(len(segments), bounds, window_results))
+
+def _build_speaker_data(segments, owners):
+    """Rebuild the speaker_data structure from per-segment speaker IDs.
+
+    Consecutive segments of the same speaker are merged into one turn with
+    the start and end time of the segments it covers. Turns are listed per
+    speaker and, in order, under "turns".
+    """
+    speakers = {}
+    turns = []
+    turn_start = 0
+    for i in range(1, len(segments) + 1):
+        if i < len(segments) and owners[i] == owners[turn_start]:
+            continue
+        turn = segments[turn_start:i]
+        start = turn[0]["start"]
+        end = turn[-1]["start"] + turn[-1].get("duration", 0)
+        speakers.setdefault(owners[turn_start], []).append({
+            "text": " ".join(segment["text"] for segment in turn),
+            "start": start,
+            "end": end
+        })
+        turns.append({"speaker": owners[turn_start], "start": start, "end": end})
+        turn_start = i
+    return {
+        "speakers": [{"id": speaker_id, "segments": speaker_turns} for speaker_id, speaker_turns in speakers.items()],
+        "turns": turns
+    }
+
+def perform_speaker_diarization(transcript, segments=None):
+    """Identify different speakers in the transcript.
+
+    With the timestamped segments available, only segment index ranges are
+    requested from the model and the speaker texts are rebuilt locally.
+    Long transcripts are diarized over overlapping windows in parallel, so
+    every request stays small however long the episode is.
+    """
+    try:
+        if segments:
+            return _build_speaker_data(segments, _diarize_segments(segments)), None
+        
+        from utils.constants import DIARIZATION_PROMPT
+        speaker_data = _generate(DIARIZATION_PROMPT, transcript, parse=_parse_json)
         return speaker_data, None
     except Exception as e:
         return {}, f"Speaker diarization failed: {str(e)}"
@@ -67,44 +486,63 @@ def perform_speaker_diarization(transcript):
 def generate_speaker_summary(speaker_text):
     """Generate a summary for a specific speaker's text."""
     try:
-        model = genai.GenerativeModel("gemini-1.5-pro")
         from utils.constants import SPEAKER_SUMMARY_PROMPT
-        response = model.generate_content(SPEAKER_SUMMARY_PROMPT + speaker_text)
-        return response.text, None
+        return _generate(SPEAKER_SUMMARY_PROMPT, speaker_text), None
     except Exception as e:
         return "", f"Speaker summary generation failed: {str(e)}"
 
+def generate_speaker_summaries(speaker_texts):
+    """Summarize every speaker concurrently.
+
+    ``speaker_texts`` maps speaker IDs to their joined text. At most
+    SPEAKER_SUMMARY_WORKERS requests run at once, so the stage takes about as
+    long as its slowest speaker rather than the sum of all of them. Speakers
+    whose summary fails get an error message instead of a summary.
+    """
+    speaker_ids = list(speaker_texts)
+    if not speaker_ids:
+        return {}
+    
+    results = _map_chunks(
+        lambda speaker_id: generate_speaker_summary(speaker_texts[speaker_id]),
+        speaker_ids,
+        SPEAKER_SUMMARY_WORKERS
+    )
+    summaries = {}
+    for speaker_id, (speaker_summary, summary_error) in zip(speaker_ids, results):
+        if not summary_error:
+            summaries[speaker_id] = speaker_summary
+        else:
+            summaries[speaker_id] = f"Could not generate summary: {summary_error}"
+    return summaries
+
 def analyze_sentiment(text):
     """Perform sentiment analysis on text."""
     try:
-        # Use TextBlob for sentiment analysis
-        blob = TextBlob(text)
-        # Get polarity score (-1 to 1, where -1 is negative, 0 is neutral, 1 is positive)
-        polarity = blob.sentiment.polarity
-        # Get subjectivity score (0 to 1, where 0 is objective, 1 is subjective)
-        subjectivity = blob.sentiment.subjectivity
-        
-        # Determine sentiment category
-        if polarity > 0.1:
-            sentiment = "Positive"
-        elif polarity < -0.1:
-            sentiment = "Negative"
-        else:
-            sentiment = "Neutral"
-            
-        return {
-            "polarity": polarity,
-            "subjectivity": subjectivity,
-            "sentiment": sentiment
-        }, None
+        # Polarity: -1 (negative) to 1 (positive); subjectivity: 0 (objective) to 1 (subjective)
+        return score_texts([text]).summary(), None
     except Exception as e:
         return {}, f"Sentiment analysis failed: {str(e)}"
 
-def extract_insights(transcript, prompt_type):
-    """Extract various types of insights from transcript."""
+def score_transcript_sentiment(transcript, segments=None):
+    """Score every transcript segment in a single vectorized pass.
+
+    The returned SentimentScores give episode, speaker and segment level
+    sentiment without tokenizing the transcript again.
+    """
+    try:
+        texts = [segment["text"] for segment in segments] if segments else [transcript]
+        return score_texts(texts), None
+    except Exception as e:
+        return None, f"Sentiment analysis failed: {str(e)}"
+
+def extract_insights(transcript, prompt_type, segments=None):
+    """Extract various types of insights from transcript.
+
+    Like generate_summary, long transcripts are handled part by part and the
+    partial results merged into one answer.
+    """
     try:
-        model = genai.GenerativeModel("gemini-1.5-pro")
-        
         prompt = ""
         if prompt_type == "key_points":
             from utils.constants import KEY_POINTS_PROMPT
@@ -119,21 +557,113 @@ def extract_insights(transcript, prompt_type):
             from utils.constants import THEMES_PROMPT
             prompt = THEMES_PROMPT
         
-        # Limit text length to avoid API limits
-        max_length = 100000
-        if len(transcript) > max_length:
-            transcript = transcript[:max_length] + "... (truncated due to length)"
-            
-        response = model.generate_content(prompt + transcript)
-        content = response.text
-        
-        # Extract JSON if it's wrapped in markdown code blocks
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', content)
-        if json_match:
-            content = json_match.group(1)
-            
-        # Parse JSON response
-        result = json.loads(content)
+        if len(transcript) <= MAX_PROMPT_CHARS:
+            # Parse JSON response
+            result = _generate(prompt, transcript, parse=_parse_json)
+            return result, None
+        
+        # Long transcript: extract from every part in parallel, then merge
+        chunks = _chunk_transcript(transcript, segments, CHUNK_CHARS)
+        partials = _map_chunks(lambda chunk: _generate(prompt, chunk[0], parse=_parse_json), chunks)
+        
+        if prompt_type == "qa":
+            # Every question-answer pair is worth keeping, so just concatenate
+            return {"qa_pairs": [pair for partial in partials for pair in partial.get("qa_pairs", [])]}, None
+        
+        from utils.constants import INSIGHTS_MERGE_PROMPT
+        merge_prompt = INSIGHTS_MERGE_PROMPT + prompt + "\n\nExtracted parts:\n"
+        result = _generate(merge_prompt, json.dumps(partials, ensure_ascii=False), parse=_parse_json)
         return result, None
     except Exception as e:
-        return {}, f"Insights extraction failed for {prompt_type}: {str(e)}"
\ No newline at end of file
+        return {}, f"Insights extraction failed for {prompt_type}: {str(e)}"
+
+# Insight types, mapped to the key of their list in the JSON response and the
+# field every item must have (None for plain strings)
+INSIGHT_SECTIONS = {
+    "key_points": ("key_points", None),
+    "quotes": ("quotes", "text"),
+    "qa": ("qa_pairs", "question"),
+    "themes": ("themes", "name")
+}
+
+def _valid_section(items, required_field):
+    """Check that a parsed insights section has the expected item structure."""
+    if not isinstance(items, list):
+        return False
+    for item in items:
+        if required_field is None:
+            if not isinstance(item, str):
+                return False
+        elif not isinstance(item, dict) or required_field not in item:
+            return False
+    return True
+
+def _combined_insights_part(chunk):
+    """Combined insights of one transcript part, or None if it failed twice."""
+    from utils.constants import COMBINED_INSIGHTS_PROMPT
+    for _ in range(2):
+        try:
+            partial = _generate(COMBINED_INSIGHTS_PROMPT, chunk[0], parse=_parse_json)
+        except Exception:
+            # Unparseable answers are not cached, so the second attempt asks again
+            continue
+        if isinstance(partial, dict):
+            return partial
+    return None
+
+def extract_all_insights(transcript, segments=None):
+    """Extract key points, quotes, Q&A pairs and themes in a single request.
+
+    Returns a dict keyed like the individual responses (key_points, quotes,
+    qa_pairs, themes). A section that is missing or malformed in the combined
+    response is retried on its own with extract_insights. On long transcripts
+    a part whose answer does not parse is retried once and otherwise left
+    out of the merge, so it cannot fail every section.
+    """
+    from utils.constants import COMBINED_INSIGHTS_PROMPT, INSIGHTS_MERGE_PROMPT
+    try:
+        if len(transcript) <= MAX_PROMPT_CHARS:
+            combined = _generate(COMBINED_INSIGHTS_PROMPT, transcript, parse=_parse_json)
+        else:
+            # Long transcript: one combined request per part, then one merge request
+            chunks = _chunk_transcript(transcript, segments, CHUNK_CHARS)
+            partials = [partial for partial in _map_chunks(_combined_insights_part, chunks) if partial is not None]
+            annotate(insight_parts=len(chunks), failed_insight_parts=len(chunks) - len(partials))
+            combined = {}
+            if partials:
+                merge_prompt = INSIGHTS_MERGE_PROMPT + COMBINED_INSIGHTS_PROMPT + "\n\nExtracted parts:\n"
+                try:
+                    combined = _generate(merge_prompt, json.dumps(partials, ensure_ascii=False), parse=_parse_json)
+                except Exception:
+                    # The sections a failed merge lacks are retried on their own below
+                    combined = {}
+                if not isinstance(combined, dict):
+                    combined = {}
+                # Every question-answer pair is worth keeping, so just concatenate
+                qa_pairs = [partial.get("qa_pairs") for partial in partials]
+                if all(_valid_section(pairs, "question") for pairs in qa_pairs):
+                    combined["qa_pairs"] = [pair for pairs in qa_pairs for pair in pairs]
+        if not isinstance(combined, dict):
+            combined = {}
+    except Exception:
+        # Fall back to retrying every section on its own
+        combined = {}
+    
+    insights = {}
+    errors = []
+    for prompt_type, (result_key, required_field) in INSIGHT_SECTIONS.items():
+        items = combined.get(result_key)
+        if _valid_section(items, required_field):
+            insights[result_key] = items
+            continue
+        
+        # Only this section failed to parse - retry it with its own prompt
+        data, error = extract_insights(transcript, prompt_type, segments)
+        items = data.get(result_key) if isinstance(data, dict) else None
+        if error or not _valid_section(items, required_field):
+            errors.append(error or f"Insights extraction failed for {prompt_type}: unexpected response format")
+            insights[result_key] = []
+        else:
+            insights[result_key] = items
+    
+    return insights, "; ".join(errors) if errors else None
\ No newline at end of file
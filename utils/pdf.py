@@ -1,42 +1,42 @@
 import io
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
+from functools import lru_cache
 
-def create_pdf(text, title="Document", is_transcript_with_speakers=False, speaker_data=None, is_insights=False, insights_data=None):
-    """Create a PDF document with the provided text and formatting."""
-    try:
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        styles = getSampleStyleSheet()
-        
-        # Create custom styles
-        speaker_style = ParagraphStyle(
+# reportlab is imported on first use: most page loads never build a PDF
+
+@lru_cache(maxsize=1)
+def _stylesheet():
+    """Return the sample stylesheet and our custom paragraph styles.
+
+    Built once per process and shared by every PDF; styles are only read
+    while a document is built, so threads can use them at the same time.
+    """
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+
+    styles = getSampleStyleSheet()
+    custom_styles = {
+        "speaker": ParagraphStyle(
             'SpeakerStyle',
             parent=styles['Heading2'],
             textColor=colors.blue,
             spaceBefore=12,
             spaceAfter=6
-        )
-        
-        heading_style = ParagraphStyle(
+        ),
+        "heading": ParagraphStyle(
             'HeadingStyle',
             parent=styles['Heading1'],
             textColor=colors.black,
             spaceBefore=12,
             spaceAfter=6
-        )
-        
-        subheading_style = ParagraphStyle(
+        ),
+        "subheading": ParagraphStyle(
             'SubheadingStyle',
             parent=styles['Heading2'],
             textColor=colors.darkblue,
             spaceBefore=10,
             spaceAfter=5
-        )
-        
-        highlight_style = ParagraphStyle(
+        ),
+        "highlight": ParagraphStyle(
             'HighlightStyle',
             parent=styles['Normal'],
             textColor=colors.black,
@@ -46,7 +46,29 @@ def create_pdf(text, title="Document", is_transcript_with_speakers=False, speake
             borderWidth=1,
             borderColor=colors.grey,
             borderPadding=5
+        ),
+        "language_heading": ParagraphStyle(
+            'LanguageHeading',
+            parent=styles['Heading2'],
+            textColor=colors.darkblue,
+            spaceBefore=12,
+            spaceAfter=6
         )
+    }
+    return styles, custom_styles
+
+def create_pdf(text, title="Document", is_transcript_with_speakers=False, speaker_data=None, is_insights=False, insights_data=None):
+    """Create a PDF document with the provided text and formatting."""
+    try:
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=letter)
+        styles, custom_styles = _stylesheet()
+        speaker_style = custom_styles["speaker"]
+        heading_style = custom_styles["heading"]
+        subheading_style = custom_styles["subheading"]
+        highlight_style = custom_styles["highlight"]
         
         story = []
         
@@ -142,26 +164,13 @@ def create_pdf(text, title="Document", is_transcript_with_speakers=False, speake
 def create_dual_language_summary_pdf(english_summary, hindi_summary, title="Dual Language Summary"):
     """Create a PDF with both English and Hindi summaries."""
     try:
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
-        styles = getSampleStyleSheet()
-        
-        # Create custom styles
-        heading_style = ParagraphStyle(
-            'HeadingStyle',
-            parent=styles['Heading1'],
-            textColor=colors.black,
-            spaceBefore=12,
-            spaceAfter=6
-        )
-        
-        language_heading_style = ParagraphStyle(
-            'LanguageHeading',
-            parent=styles['Heading2'],
-            textColor=colors.darkblue,
-            spaceBefore=12,
-            spaceAfter=6
-        )
+        styles, custom_styles = _stylesheet()
+        heading_style = custom_styles["heading"]
+        language_heading_style = custom_styles["language_heading"]
         
         story = []
         
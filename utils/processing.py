@@ -1,245 +1,256 @@
-import streamlit as st
-import re
-import json
-import io
+import datetime
+from dataclasses import dataclass, field
 
-from utils.youtube import extract_transcript_details, get_video_title
+from utils.youtube import fetch_transcript, get_video_title
 from utils.nlp import (
     generate_summary, translate_text, perform_speaker_diarization, 
-    generate_speaker_summary, analyze_sentiment, extract_insights
-)
-from utils.pdf import (
-    create_pdf, create_dual_language_summary_pdf
-)
-from utils.audio import create_audio
-from utils.history import save_to_history
-from utils.constants import (
-    SUMMARY_PROMPT, DIARIZATION_PROMPT, SPEAKER_SUMMARY_PROMPT,
-    KEY_POINTS_PROMPT, QUOTES_PROMPT, QA_PROMPT, THEMES_PROMPT
+    generate_speaker_summaries, score_transcript_sentiment, extract_all_insights
 )
+from utils.sentiment import speaker_sentiment_from_scores, sentiment_timeline
+from utils.history import store_history_entry
+from utils.executor import Stage, StageResult, run_stages
+from utils.tracing import trace
+from utils.constants import SUMMARY_PROMPT
 
-def process_youtube_url():
-    """Process a YouTube URL to extract transcript and generate all analyses."""
-    
-    with st.status("Processing video...", expanded=True) as status:
-        status.update(label="Extracting transcript from YouTube...", state="running")
-        transcript_text, video_id, transcript_segments, transcript_error = extract_transcript_details(st.session_state.youtube_link)
-        
-        if transcript_error:
-            st.error(transcript_error)
-            status.update(label=f"Error: {transcript_error}", state="error")
-            return False
-        
-        st.session_state.transcript_text = transcript_text
-        st.session_state.transcript_segments = transcript_segments
-        st.session_state.video_id = video_id
-        video_title = get_video_title(video_id)
-        
-        # Generate summary
-        status.update(label="Generating summary...", state="running")
-        summary, summary_error = generate_summary(transcript_text, SUMMARY_PROMPT)
-        if summary_error:
-            st.error(summary_error)
-            status.update(label=f"Error: {summary_error}", state="error")
-            return False
-        
-        # Store English summary
-        st.session_state.final_summary = summary
-        
-        # Generate Hindi translation of summary
-        status.update(label="Translating summary to Hindi...", state="running")
-        hindi_summary, hindi_trans_error = translate_text(summary, 'hi')
-        if hindi_trans_error:
-            st.warning(hindi_trans_error)
-            st.session_state.hindi_summary = "Hindi translation failed"
-        else:
-            st.session_state.hindi_summary = hindi_summary
-        
-        # Create dual language PDF for summary
-        status.update(label="Creating dual language summary PDF...", state="running")
-        dual_summary_pdf, pdf_error = create_dual_language_summary_pdf(
-            summary, 
-            st.session_state.hindi_summary,
-            title="Video Summary (English & Hindi)"
-        )
-        
-        if pdf_error:
-            st.warning(pdf_error)
-        else:
-            st.session_state.dual_summary_pdf = dual_summary_pdf
-        
-        # Perform speaker diarization
-        status.update(label="Identifying speakers in the transcript...", state="running")
-        speaker_data, diarization_error = perform_speaker_diarization(transcript_text)
-        if diarization_error:
-            st.warning(diarization_error)
-            # Create a fallback speaker data structure if diarization fails
-            speaker_data = {
-                "speakers": [
-                    {
-                        "id": "Speaker (All)",
-                        "segments": [{"text": transcript_text}]
-                    }
-                ]
+# Maximum number of stages running at the same time. Most stages are
+# network-bound (Gemini, Google Translate), so threads are enough. PDFs and
+# audio are not built here; see utils/artifacts.py.
+MAX_CONCURRENT_STAGES = 6
+
+def _fallback_speaker_data(transcript_text):
+    """Single-speaker structure used when diarization fails."""
+    return {
+        "speakers": [
+            {
+                "id": "Speaker (All)",
+                "segments": [{"text": transcript_text}]
             }
-        
-        st.session_state.speaker_data = speaker_data
-        
-        # Generate summaries for each speaker
-        speaker_summaries = {}
-        for speaker in speaker_data.get("speakers", []):
-            speaker_id = speaker["id"]
-            speaker_text = " ".join([segment["text"] for segment in speaker["segments"]])
-            
-            if speaker_text:
-                speaker_summary, summary_error = generate_speaker_summary(speaker_text)
-                if not summary_error:
-                    speaker_summaries[speaker_id] = speaker_summary
-                else:
-                    speaker_summaries[speaker_id] = f"Could not generate summary: {summary_error}"
-        
-        st.session_state.speaker_summaries = speaker_summaries
-        
-        # Extract insights
-        status.update(label="Extracting key insights from the transcript...", state="running")
-        
-        # Extract key points
-        key_points_data, key_points_error = extract_insights(transcript_text, "key_points")
-        if key_points_error:
-            st.warning(key_points_error)
-            st.session_state.key_points = []
-        else:
-            st.session_state.key_points = key_points_data.get("key_points", [])
-        
-        # Extract impactful quotes
-        quotes_data, quotes_error = extract_insights(transcript_text, "quotes")
-        if quotes_error:
-            st.warning(quotes_error)
-            st.session_state.impactful_quotes = []
-        else:
-            st.session_state.impactful_quotes = quotes_data.get("quotes", [])
-        
-        # Extract Q&A pairs
-        qa_data, qa_error = extract_insights(transcript_text, "qa")
-        if qa_error:
-            st.warning(qa_error)
-            st.session_state.questions_answers = []
-        else:
-            st.session_state.questions_answers = qa_data.get("qa_pairs", [])
-        
-        # Extract key themes
-        themes_data, themes_error = extract_insights(transcript_text, "themes")
-        if themes_error:
-            st.warning(themes_error)
-            st.session_state.key_themes = []
-        else:
-            st.session_state.key_themes = themes_data.get("themes", [])
-        
-        # Create insights PDF
-        insights_data = {
-            "key_points": st.session_state.key_points,
-            "quotes": st.session_state.impactful_quotes,
-            "qa_pairs": st.session_state.questions_answers,
-            "themes": st.session_state.key_themes
-        }
-        
-        insights_pdf, pdf_error = create_pdf(
-            "", 
-            title="Video Insights",
-            is_insights=True,
-            insights_data=insights_data
-        )
-        
-        if pdf_error:
-            st.warning(pdf_error)
-        else:
-            st.session_state.insights_pdf = insights_pdf
-        
-        # Perform sentiment analysis
-        status.update(label="Analyzing sentiment...", state="running")
-        
-        # Overall sentiment
-        sentiment_data, sentiment_error = analyze_sentiment(transcript_text)
-        if sentiment_error:
-            st.warning(sentiment_error)
-        st.session_state.sentiment_data = sentiment_data
-        
-        # Per speaker sentiment
-        speaker_sentiment = {}
-        for speaker in speaker_data.get("speakers", []):
-            speaker_id = speaker["id"]
-            speaker_text = " ".join([segment["text"] for segment in speaker["segments"]])
-            
-            if speaker_text:
-                sentiment, _ = analyze_sentiment(speaker_text)
-                speaker_sentiment[speaker_id] = sentiment
-        
-        st.session_state.speaker_sentiment = speaker_sentiment
-            
-        # Set transcript for display (English only)
-        st.session_state.final_transcript = transcript_text
-        
-        # Create PDF files
-        status.update(label="Creating PDF files...", state="running")
-        
-        transcript_pdf, pdf_error = create_pdf(transcript_text, title="Transcript")
-        summary_pdf, pdf_error_summary = create_pdf(summary, title="Summary")
-        
-        # Create speaker transcript PDF
-        speaker_pdf, speaker_pdf_error = create_pdf(
-            "", 
-            title="Speaker Transcript",
-            is_transcript_with_speakers=True,
-            speaker_data=speaker_data
+        ]
+    }
+
+def _speaker_texts(speaker_data):
+    """Yield (speaker_id, joined text) for every speaker with text."""
+    for speaker in speaker_data.get("speakers", []):
+        speaker_text = " ".join([segment["text"] for segment in speaker["segments"]])
+        if speaker_text:
+            yield speaker["id"], speaker_text
+
+def build_analysis_stages(transcript_text, transcript_segments=None, on_summary_chunk=None):
+    """Declare every analysis stage for a transcript and what each one needs.
+
+    ``on_summary_chunk`` receives the summary text piece by piece while it is
+    being generated, from the worker thread running the summary stage.
+    """
+
+    def summary():
+        return generate_summary(transcript_text, SUMMARY_PROMPT, transcript_segments, on_summary_chunk)
+
+    def hindi_summary(summary):
+        hindi, error = translate_text(summary, 'hi')
+        if error:
+            return "Hindi translation failed", error
+        return hindi, None
+
+    def diarization():
+        speaker_data, error = perform_speaker_diarization(transcript_text, transcript_segments)
+        if error:
+            # Create a fallback speaker data structure if diarization fails
+            return _fallback_speaker_data(transcript_text), error
+        return speaker_data, None
+
+    def speaker_summaries(diarization):
+        return generate_speaker_summaries(dict(_speaker_texts(diarization))), None
+
+    def insights():
+        return extract_all_insights(transcript_text, transcript_segments)
+
+    def sentiment():
+        return score_transcript_sentiment(transcript_text, transcript_segments)
+
+    def speaker_sentiment(diarization, sentiment):
+        if sentiment is None:
+            return {}, None
+        return speaker_sentiment_from_scores(sentiment, transcript_segments, diarization), None
+
+    def timeline(sentiment):
+        if sentiment is None:
+            return {}, None
+        return sentiment_timeline(sentiment, transcript_segments), None
+
+    return [
+        Stage("summary", summary, label="Generating summary...", critical=True),
+        Stage("hindi_summary", hindi_summary, ("summary",), "Translating summary to Hindi..."),
+        Stage("diarization", diarization, label="Identifying speakers in the transcript..."),
+        Stage("speaker_summaries", speaker_summaries, ("diarization",), "Summarizing each speaker..."),
+        Stage("insights", insights, label="Extracting key insights from the transcript..."),
+        Stage("sentiment", sentiment, label="Analyzing sentiment..."),
+        Stage("speaker_sentiment", speaker_sentiment, ("diarization", "sentiment"), "Analyzing sentiment per speaker..."),
+        Stage("sentiment_timeline", timeline, ("sentiment",), "Building sentiment timeline..."),
+    ]
+
+# AnalysisResult attributes and the keys they are stored under in history
+HISTORY_FIELDS = {
+    "summary": "summary",
+    "hindi_summary": "hindi_summary",
+    "transcript_text": "transcript",
+    "transcript_segments": "transcript_segments",
+    "speaker_data": "speaker_data",
+    "speaker_summaries": "speaker_summaries",
+    "sentiment_data": "sentiment_data",
+    "speaker_sentiment": "speaker_sentiment",
+    "sentiment_timeline": "sentiment_timeline",
+    "key_points": "key_points",
+    "impactful_quotes": "impactful_quotes",
+    "questions_answers": "questions_answers",
+    "key_themes": "key_themes"
+}
+
+@dataclass
+class AnalysisOptions:
+    """Settings for a single analysis run."""
+    language: str = "en"
+    max_workers: int = MAX_CONCURRENT_STAGES
+    save_to_history: bool = True
+
+@dataclass
+class AnalysisResult:
+    """Everything produced by analyzing one video.
+
+    ``error`` is set when the analysis failed as a whole (no transcript or no
+    summary); ``errors`` maps stage names to the non-fatal errors they
+    reported, in which case the field holds its fallback value.
+    """
+    video_id: str
+    video_title: str = ""
+    transcript_text: str = ""
+    transcript_segments: list = field(default_factory=list)
+    summary: str = ""
+    hindi_summary: str = ""
+    speaker_data: dict = field(default_factory=dict)
+    speaker_summaries: dict = field(default_factory=dict)
+    sentiment_data: dict = field(default_factory=dict)
+    speaker_sentiment: dict = field(default_factory=dict)
+    sentiment_timeline: dict = field(default_factory=dict)
+    key_points: list = field(default_factory=list)
+    impactful_quotes: list = field(default_factory=list)
+    questions_answers: list = field(default_factory=list)
+    key_themes: list = field(default_factory=list)
+    errors: dict = field(default_factory=dict)
+    error: str = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def history_data(self):
+        """Return the dict stored in history for this result."""
+        return {key: getattr(self, name) for name, key in HISTORY_FIELDS.items()}
+
+    @classmethod
+    def from_history_data(cls, video_id, data, video_title=""):
+        """Rebuild a result from a stored history entry."""
+        values = {name: data[key] for name, key in HISTORY_FIELDS.items() if key in data}
+        return cls(video_id=video_id, video_title=video_title, **values)
+
+def apply_stage_value(result, name, value):
+    """Copy the value of one finished step into ``result``.
+
+    ``value`` is None for skipped stages, which leaves the fallback value
+    shown when that part of the analysis is not available.
+    """
+    if name == "transcript":
+        result.transcript_text, result.transcript_segments = value or ("", [])
+    elif name == "summary":
+        result.summary = value or ""
+    elif name == "hindi_summary":
+        result.hindi_summary = value or "Hindi translation failed"
+    elif name == "diarization":
+        result.speaker_data = value or _fallback_speaker_data(result.transcript_text)
+    elif name == "speaker_summaries":
+        result.speaker_summaries = value or {}
+    elif name == "insights":
+        insights = value or {}
+        result.key_points = insights.get("key_points", [])
+        result.impactful_quotes = insights.get("quotes", [])
+        result.questions_answers = insights.get("qa_pairs", [])
+        result.key_themes = insights.get("themes", [])
+    elif name == "sentiment":
+        result.sentiment_data = value.summary() if value is not None else {}
+    elif name == "speaker_sentiment":
+        result.speaker_sentiment = value or {}
+    elif name == "sentiment_timeline":
+        result.sentiment_timeline = value or {}
+
+# Fetching the transcript is reported to progress callbacks like any stage
+TRANSCRIPT_STAGE = Stage("transcript", None, label="Extracting transcript from YouTube...", critical=True)
+
+def analysis_steps():
+    """Names of the steps reported to progress callbacks, in start order."""
+    return [TRANSCRIPT_STAGE.name] + [stage.name for stage in build_analysis_stages("")]
+
+def analyze(video_id, options=None, on_start=None, on_finish=None, on_summary_chunk=None):
+    """Fetch a video's transcript and run every analysis stage on it.
+
+    Does not depend on Streamlit, so it can run in scripts and workers.
+    ``on_start(stage)`` and ``on_finish(stage, stage_result)`` are called on
+    the calling thread as steps start and finish, starting with
+    ``TRANSCRIPT_STAGE``; ``apply_stage_value`` turns finished steps into a
+    partial result. ``on_summary_chunk`` streams the summary as it is
+    written (see ``build_analysis_stages``). Failures are reported in the
+    returned ``AnalysisResult`` rather than raised.
+
+    The whole run is traced as one "analysis" span with a child span per
+    step (see utils/tracing.py).
+    """
+    options = options or AnalysisOptions()
+    with trace("analysis", kind="analysis", video_id=video_id, language=options.language) as span:
+        result = _run_analysis(video_id, options, on_start, on_finish, on_summary_chunk)
+        span.error = result.error
+        span.set(
+            transcript_chars=len(result.transcript_text),
+            segments=len(result.transcript_segments),
+            stage_errors=sorted(result.errors)
         )
-        
-        if pdf_error:
-            st.warning(pdf_error)
-        if pdf_error_summary:
-            st.warning(pdf_error_summary)
-        if speaker_pdf_error:
-            st.warning(speaker_pdf_error)
-            
-        st.session_state.transcript_pdf = transcript_pdf
-        st.session_state.summary_pdf = summary_pdf
-        st.session_state.speaker_pdf = speaker_pdf
-        
-        # Create audio files - limit transcript audio to prevent timeouts
-        status.update(label="Creating audio files...", state="running")
-        
-        # Limit transcript audio to first ~1-2 minutes for preview
-        transcript_preview = transcript_text.split()[:500]  # About 500 words
-        transcript_preview_text = " ".join(transcript_preview)
-        
-        transcript_audio, transcript_audio_error = create_audio(transcript_preview_text, 'en')
-        summary_audio, summary_audio_error = create_audio(summary, 'en')
-        
-        if transcript_audio_error:
-            st.warning(transcript_audio_error)
-        if summary_audio_error:
-            st.warning(summary_audio_error)
-            
-        st.session_state.transcript_audio = transcript_audio
-        st.session_state.summary_audio = summary_audio
-        
-        # Save to history
-        data_to_save = {
-            "summary": summary,
-            "hindi_summary": st.session_state.hindi_summary,
-            "transcript": transcript_text,
-            "speaker_data": speaker_data,
-            "speaker_summaries": speaker_summaries,
-            "sentiment_data": sentiment_data,
-            "speaker_sentiment": speaker_sentiment,
-            "key_points": st.session_state.key_points,
-            "impactful_quotes": st.session_state.impactful_quotes,
-            "questions_answers": st.session_state.questions_answers,
-            "key_themes": st.session_state.key_themes
-        }
-        save_to_history(video_id, video_title, data_to_save)
-        
-        # Update status and session state
-        status.update(label="Processing complete!", state="complete")
-        st.session_state.processing_complete = True
-        
-        return True
\ No newline at end of file
+    return result
+
+def _run_analysis(video_id, options, on_start, on_finish, on_summary_chunk):
+    result = AnalysisResult(video_id=video_id, video_title=get_video_title(video_id))
+
+    if on_start:
+        on_start(TRANSCRIPT_STAGE)
+    with trace(TRANSCRIPT_STAGE.name, kind="stage", critical=True) as span:
+        transcript_text, transcript_segments, error = fetch_transcript(video_id, options.language)
+        span.error = error
+        span.set(transcript_chars=len(transcript_text), segments=len(transcript_segments))
+    if error:
+        transcript_result = StageResult(error=error, skipped=True)
+    else:
+        transcript_result = StageResult(value=(transcript_text, transcript_segments))
+    apply_stage_value(result, TRANSCRIPT_STAGE.name, transcript_result.value)
+    if on_finish:
+        on_finish(TRANSCRIPT_STAGE, transcript_result)
+    if error:
+        result.error = error
+        return result
+
+    def stage_finished(stage, stage_result):
+        if stage_result.error:
+            result.errors[stage.name] = stage_result.error
+        apply_stage_value(result, stage.name, None if stage_result.skipped else stage_result.value)
+        if on_finish:
+            on_finish(stage, stage_result)
+
+    stages = build_analysis_stages(transcript_text, transcript_segments, on_summary_chunk)
+    run = run_stages(stages, max_workers=options.max_workers, on_start=on_start, on_finish=stage_finished)
+    if run.failed_stage:
+        result.error = run.error(run.failed_stage)
+        return result
+
+    if options.save_to_history:
+        try:
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            store_history_entry(video_id, result.video_title, timestamp, result.history_data())
+        except Exception as e:
+            result.errors["history"] = f"Error saving history: {e}"
+
+    return result
\ No newline at end of file
@@ -0,0 +1,319 @@
+import os
+import re
+import xml.etree.ElementTree as ElementTree
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+# Tokens as TextBlob's tokenizer produces them: "isn't" becomes "is n ' t"
+# and "..." and "!" are tokens of their own
+_TOKEN = re.compile(r"\w+?(?=n't)|\w+(?:[-.:*]\w+)*|\.\.\.|!")
+# TextBlob also lists "n't", but after tokenizing it never sees one
+_NEGATIONS = {"not", "never", "no"}
+
+# Same thresholds as the labels shown in the sentiment view
+POSITIVE_THRESHOLD = 0.1
+NEGATIVE_THRESHOLD = -0.1
+
+# Sentiment timeline resolution: one point every step, each averaging the
+# words spoken in a window centered on it
+TIMELINE_STEP_SECONDS = int(os.getenv("TIMELINE_STEP_SECONDS", "15"))
+TIMELINE_WINDOW_SECONDS = int(os.getenv("TIMELINE_WINDOW_SECONDS", "120"))
+
+@dataclass
+class Lexicon:
+    """Sentiment lexicon held as arrays indexed by word ID."""
+    index: dict
+    polarity: np.ndarray
+    subjectivity: np.ndarray
+    intensity: np.ndarray
+    modifier: np.ndarray
+
+@lru_cache(maxsize=1)
+def load_lexicon():
+    """Load the pattern sentiment lexicon shipped with TextBlob.
+
+    Senses are averaged per part of speech and then over the parts of
+    speech, as TextBlob does when no part of speech is given. Words with an
+    adverb sense are modifiers of the next word. The file is parsed once
+    per process.
+    """
+    import textblob
+    path = os.path.join(os.path.dirname(textblob.__file__), "en", "en-sentiment.xml")
+
+    senses = {}
+    for element in ElementTree.parse(path).getroot().iter("word"):
+        form = element.get("form", "").lower()
+        if not form or " " in form:
+            continue
+        scores = (
+            float(element.get("polarity", 0.0)),
+            float(element.get("subjectivity", 0.0)),
+            float(element.get("intensity", 1.0))
+        )
+        senses.setdefault(form, {}).setdefault(element.get("pos"), []).append(scores)
+
+    by_pos = {
+        form: {pos: np.mean(scores, axis=0) for pos, scores in word_senses.items()}
+        for form, word_senses in senses.items()
+    }
+    averages = {form: np.mean(list(scores.values()), axis=0) for form, scores in by_pos.items()}
+    # TextBlob scores the adverb of every adjective like the adjective ("terrible" -> "terribly")
+    for form, scores in list(by_pos.items()):
+        if "JJ" in scores:
+            stem = form[:-1] + "i" if form.endswith("y") else form
+            stem = stem[:-2] if stem.endswith("le") else stem
+            by_pos.setdefault(stem + "ly", {})["RB"] = scores["JJ"]
+            averages[stem + "ly"] = scores["JJ"]
+
+    words = list(averages)
+    values = np.array([averages[word] for word in words], dtype=np.float64)
+    return Lexicon(
+        index={word: i for i, word in enumerate(words)},
+        polarity=values[:, 0],
+        subjectivity=values[:, 1],
+        intensity=values[:, 2],
+        modifier=np.array(["RB" in by_pos[word] for word in words], dtype=bool)
+    )
+
+@dataclass
+class SentimentScores:
+    """Per-segment sums of word polarity and subjectivity, and word counts.
+
+    Any grouping of segments (a speaker, a time window, the whole episode)
+    is scored by summing these arrays over the group and dividing by the
+    number of scored words, which is what TextBlob computes over the
+    concatenated text. A modifier and the word it modifies ("very good")
+    count as one word.
+    """
+    polarity_sum: np.ndarray
+    subjectivity_sum: np.ndarray
+    word_count: np.ndarray
+
+    def segment_polarity(self):
+        """Mean polarity of every segment (0 for segments without sentiment words)."""
+        return np.divide(
+            self.polarity_sum, self.word_count,
+            out=np.zeros_like(self.polarity_sum), where=self.word_count > 0
+        )
+
+    def summary(self, mask=None):
+        """Polarity, subjectivity and label for all segments or a boolean mask."""
+        if mask is None:
+            mask = slice(None)
+        count = self.word_count[mask].sum()
+        polarity = float(self.polarity_sum[mask].sum() / count) if count else 0.0
+        subjectivity = float(self.subjectivity_sum[mask].sum() / count) if count else 0.0
+        return sentiment_result(polarity, subjectivity)
+
+def sentiment_label(polarity):
+    """Determine sentiment category."""
+    if polarity > POSITIVE_THRESHOLD:
+        return "Positive"
+    elif polarity < NEGATIVE_THRESHOLD:
+        return "Negative"
+    return "Neutral"
+
+def sentiment_result(polarity, subjectivity):
+    """Build the dict stored in sentiment_data and speaker_sentiment."""
+    return {
+        "polarity": polarity,
+        "subjectivity": subjectivity,
+        "sentiment": sentiment_label(polarity)
+    }
+
+def _last_before(mask, starts):
+    """Index of the last token in ``mask`` before each token of the same text, or -1."""
+    positions = np.where(mask, np.arange(len(mask)), -1)
+    last = np.full(len(mask), -1, dtype=np.int64)
+    last[1:] = np.maximum.accumulate(positions)[:-1]
+    return np.where(last >= starts, last, -1)
+
+def score_texts(texts, lexicon=None):
+    """Score many texts in one vectorized pass over the lexicon.
+
+    Every text is tokenized once; tokens are mapped to lexicon IDs and all
+    scoring happens on flat NumPy arrays, following TextBlob's rules:
+
+    - a modifier ("very") is merged with the next known word, which is
+      scaled by the modifier's intensity, and the two count as one word;
+    - a negation ("not", "never") turns the next word's polarity into
+      -0.5 times itself and inverts its intensity, so in "not very good"
+      it weakens "very" rather than being lost;
+    - "!" boosts the polarity of the word before it.
+
+    Emoticons, which TextBlob also scores, are ignored.
+    """
+    lexicon = lexicon or load_lexicon()
+
+    token_ids = []
+    owners = []
+    lengths = []
+    negations = []
+    exclamations = []
+    adverbs = []
+    for i, text in enumerate(texts):
+        for token in _TOKEN.findall(text.lower()):
+            token_ids.append(lexicon.index.get(token, -1))
+            owners.append(i)
+            lengths.append(len(token))
+            negations.append(token in _NEGATIONS)
+            exclamations.append(token == "!")
+            adverbs.append(token.endswith("ly"))
+
+    num_texts = len(texts)
+    if not token_ids:
+        zeros = np.zeros(num_texts)
+        return SentimentScores(zeros, zeros.copy(), zeros.copy())
+
+    ids = np.array(token_ids, dtype=np.int64)
+    owner = np.array(owners, dtype=np.int64)
+    length = np.array(lengths, dtype=np.int64)
+    negation = np.array(negations, dtype=bool)
+    exclamation = np.array(exclamations, dtype=bool)
+    known = ids >= 0
+    safe_ids = np.where(known, ids, 0)
+
+    polarity = np.where(known, lexicon.polarity[safe_ids], 0.0)
+    subjectivity = np.where(known, lexicon.subjectivity[safe_ids], 0.0)
+    intensity = np.where(known, lexicon.intensity[safe_ids], 1.0)
+    modifier = known & lexicon.modifier[safe_ids]
+    adverb = modifier & np.array(adverbs, dtype=bool)
+
+    # Rules never reach across texts: every lookback stops at the text's first token
+    positions = np.arange(len(ids))
+    first = np.ones(len(ids), dtype=bool)
+    first[1:] = owner[1:] != owner[:-1]
+    starts = np.maximum.accumulate(np.where(first, positions, 0))
+
+    # The previous known word of every token
+    previous = _last_before(known, starts)
+    safe_previous = np.maximum(previous, 0)
+    after_modifier = (previous >= 0) & modifier[safe_previous]
+    after_adverb = (previous >= 0) & adverb[safe_previous]
+
+    # Unknown words longer than two letters end a modifier's reach ("very
+    # ... good" is two words), except a negation after an -ly adverb, which
+    # negates the adverb instead ("really not good")
+    ends_modifier = ~known & (length > 2) & ~(negation & after_adverb)
+    modified = after_modifier & (_last_before(ends_modifier, starts) < previous)
+    negates_adverb = negation & after_adverb & modified
+
+    # Any other negation carries over to the next known word, unless an
+    # unknown word longer than one letter comes first ("not a good" is negated)
+    carried = _last_before(negation & ~negates_adverb, starts)
+    ends_negation = ~known & ~negation & (length > 1)
+    negated = known & (carried > previous) & (_last_before(ends_negation, starts) < carried)
+
+    # Known words grouped into chunks: a word merged with its modifier
+    # takes the modifier's intensity, inverted when the modifier is negated
+    words = np.flatnonzero(known)
+    starts_chunk = ~modified[words]
+    num_chunks = int(starts_chunk.sum())
+    chunk = np.full(len(ids), -1, dtype=np.int64)
+    chunk[words] = np.cumsum(starts_chunk) - 1
+    effective_intensity = np.where(negated, 1.0 / intensity, intensity)
+    scale = np.where(modified[words], effective_intensity[safe_previous[words]], 1.0)
+    word_polarity = np.clip(polarity[words] * scale, -1.0, 1.0)
+    word_subjectivity = np.clip(subjectivity[words] * scale, -1.0, 1.0)
+
+    # A chunk keeps the scores of its last word
+    ends_chunk = np.ones(len(words), dtype=bool)
+    ends_chunk[:-1] = starts_chunk[1:]
+    chunk_polarity = word_polarity[ends_chunk]
+    chunk_subjectivity = word_subjectivity[ends_chunk]
+    chunk_owner = owner[words[ends_chunk]]
+
+    # "!" only boosts a chunk it follows; a word merged later replaces the score
+    last_words = np.zeros(len(ids), dtype=bool)
+    last_words[words[ends_chunk]] = True
+    boosting = exclamation & (previous >= 0) & last_words[safe_previous]
+    boosts = np.bincount(chunk[previous[boosting]], minlength=num_chunks)
+    chunk_polarity = np.clip(chunk_polarity * 1.25 ** boosts, -1.0, 1.0)
+
+    negated_chunks = np.zeros(num_chunks, dtype=bool)
+    negated_chunks[chunk[negated]] = True
+    negated_chunks[chunk[previous[negates_adverb]]] = True
+    chunk_polarity = np.where(negated_chunks, chunk_polarity * -0.5, chunk_polarity)
+
+    return SentimentScores(
+        polarity_sum=np.bincount(chunk_owner, weights=chunk_polarity, minlength=num_texts),
+        subjectivity_sum=np.bincount(chunk_owner, weights=chunk_subjectivity, minlength=num_texts),
+        word_count=np.bincount(chunk_owner, minlength=num_texts).astype(np.float64)
+    )
+
+def sentiment_timeline(scores, segments, step_seconds=TIMELINE_STEP_SECONDS,
+                       window_seconds=TIMELINE_WINDOW_SECONDS):
+    """Rolling-window polarity over the episode, built from the segment scores.
+
+    Segment sums are bucketed by start time and the window sums come from
+    cumulative sums, so no text is scored again. Returns a compact dict
+    (point ``i`` is at ``i * step_seconds``) that is stored in history as is,
+    or an empty dict when there are no timed segments.
+    """
+    if not segments or len(segments) != len(scores.word_count):
+        return {}
+
+    starts = np.array([segment.get("start", 0.0) for segment in segments], dtype=np.float64)
+    buckets = np.maximum(starts // step_seconds, 0).astype(np.int64)
+    num_points = int(buckets.max()) + 1
+    polarity_sums = np.bincount(buckets, weights=scores.polarity_sum, minlength=num_points)
+    word_counts = np.bincount(buckets, weights=scores.word_count, minlength=num_points)
+
+    # Window sums as differences of cumulative sums, clipped at both ends
+    width = max(int(round(window_seconds / step_seconds)), 1)
+    points = np.arange(num_points)
+    low = np.clip(points - width // 2, 0, num_points)
+    high = np.clip(points - width // 2 + width, 0, num_points)
+    polarity_cumsum = np.concatenate(([0.0], np.cumsum(polarity_sums)))
+    count_cumsum = np.concatenate(([0.0], np.cumsum(word_counts)))
+    window_polarity = polarity_cumsum[high] - polarity_cumsum[low]
+    window_count = count_cumsum[high] - count_cumsum[low]
+    polarity = np.divide(
+        window_polarity, window_count,
+        out=np.zeros_like(window_polarity), where=window_count > 0
+    )
+
+    return {
+        "step_seconds": step_seconds,
+        "window_seconds": window_seconds,
+        "polarity": np.round(polarity, 3).tolist()
+    }
+
+def segment_speakers(segments, speaker_data):
+    """Return the speaker ID of every transcript segment, or None.
+
+    Uses the chronological speaker turns produced by diarization; returns
+    None when they are not available (e.g. the single-speaker fallback).
+    """
+    turns = speaker_data.get("turns") if speaker_data else None
+    if not turns or not segments:
+        return None
+    turns = sorted(turns, key=lambda turn: turn["start"])
+    turn_starts = np.array([turn["start"] for turn in turns])
+    segment_starts = np.array([segment["start"] for segment in segments])
+    turn_index = np.clip(np.searchsorted(turn_starts, segment_starts, side="right") - 1, 0, len(turns) - 1)
+    return [turns[i]["speaker"] for i in turn_index]
+
+def speaker_sentiment_from_scores(scores, segments, speaker_data):
+    """Aggregate per-speaker sentiment from the segment scores."""
+    speakers = segment_speakers(segments, speaker_data)
+    if speakers is None:
+        # No timing information - score each speaker's text directly
+        texts = {
+            speaker["id"]: " ".join(segment["text"] for segment in speaker["segments"])
+            for speaker in speaker_data.get("speakers", [])
+        }
+        texts = {speaker_id: text for speaker_id, text in texts.items() if text}
+        speaker_scores = score_texts(list(texts.values()))
+        return {
+            speaker_id: speaker_scores.summary(np.arange(len(texts)) == i)
+            for i, speaker_id in enumerate(texts)
+        }
+
+    speaker_array = np.array(speakers, dtype=object)
+    return {
+        speaker["id"]: scores.summary(speaker_array == speaker["id"])
+        for speaker in speaker_data.get("speakers", [])
+    }
\ No newline at end of file
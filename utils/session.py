@@ -1,5 +1,8 @@
 import streamlit as st
 
+from utils.youtube import extract_video_id
+from utils.history import get_history_data, delete_history_entry, clear_history_entries
+
 def initialize_session_state():
     """Initialize all session state variables needed for the application."""
     
@@ -18,22 +21,16 @@ def initialize_session_state():
         st.session_state.video_id = ""
     if "processing_complete" not in st.session_state:
         st.session_state.processing_complete = False
+    if "pending_stages" not in st.session_state:
+        st.session_state.pending_stages = []
         
-    # PDF and audio files
-    if "transcript_pdf" not in st.session_state:
-        st.session_state.transcript_pdf = None
-    if "summary_pdf" not in st.session_state:
-        st.session_state.summary_pdf = None
-    if "dual_summary_pdf" not in st.session_state:
-        st.session_state.dual_summary_pdf = None
-    if "speaker_pdf" not in st.session_state:
-        st.session_state.speaker_pdf = None
-    if "insights_pdf" not in st.session_state:
-        st.session_state.insights_pdf = None
-    if "transcript_audio" not in st.session_state:
-        st.session_state.transcript_audio = None
-    if "summary_audio" not in st.session_state:
-        st.session_state.summary_audio = None
+    # Background job followed by this session
+    if "job_id" not in st.session_state:
+        st.session_state.job_id = None
+    if "shown_job" not in st.session_state:
+        st.session_state.shown_job = None
+    if "video_start_time" not in st.session_state:
+        st.session_state.video_start_time = 0
         
     # Speaker diarization data
     if "speaker_data" not in st.session_state:
@@ -46,6 +43,8 @@ def initialize_session_state():
     # Sentiment analysis data
     if "sentiment_data" not in st.session_state:
         st.session_state.sentiment_data = {}
+    if "sentiment_timeline" not in st.session_state:
+        st.session_state.sentiment_timeline = {}
         
     # Insights data
     if "key_points" not in st.session_state:
@@ -57,12 +56,127 @@ def initialize_session_state():
     if "key_themes" not in st.session_state:
         st.session_state.key_themes = []
         
-    # History
-    if "video_history" not in st.session_state:
-        st.session_state.video_history = {}
-        
     # UI state management
     if "current_view" not in st.session_state:
         st.session_state.current_view = "input"
     if "dark_mode" not in st.session_state:
-        st.session_state.dark_mode = False
\ No newline at end of file
+        st.session_state.dark_mode = False
+
+def show_result(result, pending_stages=()):
+    """Put an analysis result into session state for the views.
+
+    ``pending_stages`` lists the steps of a running job whose results are
+    not available yet; the views show a placeholder for them.
+    """
+    if st.session_state.get("video_id") != result.video_id:
+        st.session_state.video_start_time = 0
+    st.session_state.video_id = result.video_id
+    st.session_state.transcript_text = result.transcript_text
+    st.session_state.transcript_segments = result.transcript_segments
+    st.session_state.final_transcript = result.transcript_text
+    st.session_state.final_summary = result.summary
+    st.session_state.hindi_summary = result.hindi_summary
+    st.session_state.speaker_data = result.speaker_data
+    st.session_state.speaker_summaries = result.speaker_summaries
+    st.session_state.sentiment_data = result.sentiment_data
+    st.session_state.speaker_sentiment = result.speaker_sentiment
+    st.session_state.sentiment_timeline = result.sentiment_timeline
+    st.session_state.key_points = result.key_points
+    st.session_state.impactful_quotes = result.impactful_quotes
+    st.session_state.questions_answers = result.questions_answers
+    st.session_state.key_themes = result.key_themes
+    st.session_state.pending_stages = list(pending_stages)
+    
+    # PDFs and audio are served from the artifact store when requested
+    
+    st.session_state.processing_complete = True
+
+def process_youtube_url():
+    """Queue the YouTube URL in session state for background processing."""
+    video_id = extract_video_id(st.session_state.youtube_link)
+    if not video_id:
+        st.error("Invalid YouTube URL format")
+        return False
+    
+    # The pipeline (and the job workers) are loaded by the first submitted video
+    from utils.jobs import get_job_queue
+    job_id = get_job_queue().submit(video_id)
+    st.session_state.job_id = job_id
+    st.session_state.shown_job = None
+    # Keep the job in the URL so a refresh or reconnect picks it up again
+    st.experimental_set_query_params(job=job_id)
+    return True
+
+def forget_job():
+    """Stop following the current background job."""
+    st.session_state.job_id = None
+    st.session_state.shown_job = None
+    st.experimental_set_query_params()
+
+def sync_job():
+    """Copy the current background job's progress into session state.
+
+    Returns the job while it is running, and once more on the run where it
+    finished or failed; otherwise None.
+    """
+    job_id = st.session_state.get("job_id")
+    if not job_id:
+        job_id = st.experimental_get_query_params().get("job", [None])[0]
+    if not job_id or st.session_state.get("shown_job") == job_id:
+        return None
+    st.session_state.job_id = job_id
+
+    from utils.jobs import get_job_queue, video_id_from_job_id
+    job = get_job_queue().get(job_id)
+    if job is None:
+        # Unknown job, e.g. after a server restart - finished results are in history
+        if load_video_from_history(video_id_from_job_id(job_id), keep_job=True):
+            st.session_state.shown_job = job_id
+        else:
+            forget_job()
+            st.warning("This analysis is no longer available. Please submit the video again.")
+        return None
+
+    if job.status == "failed":
+        forget_job()
+        if st.session_state.pending_stages:
+            # The partial result shown so far would keep its "Still working" tabs forever
+            st.session_state.pending_stages = []
+            st.session_state.processing_complete = False
+        return job
+
+    if job.finished_stages:
+        show_result(job.result, job.pending_stages)
+    if not job.active:
+        st.session_state.shown_job = job_id
+    return job
+
+def delete_from_history(video_id):
+    """Remove a video from history."""
+    try:
+        delete_history_entry(video_id)
+    except Exception as e:
+        st.warning(f"Could not update history file: {e}")
+
+def clear_history():
+    """Remove every video from history."""
+    try:
+        clear_history_entries()
+    except Exception as e:
+        st.warning(f"Could not update history file: {e}")
+
+def load_video_from_history(video_id, keep_job=False):
+    """Load a specific video's data from history."""
+    if not keep_job:
+        forget_job()
+    try:
+        data = get_history_data(video_id)
+    except Exception as e:
+        st.warning(f"Could not read history entry: {e}")
+        data = None
+
+    if data is not None:
+        from utils.processing import AnalysisResult
+        show_result(AnalysisResult.from_history_data(video_id, data))
+        return True
+    return False
\ No newline at end of file
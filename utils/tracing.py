@@ -0,0 +1,295 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+# Finished spans are appended here as JSON lines; set to "" to disable
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", ".streamlit/traces.jsonl")
+# The file is moved to <path>.1 once it grows past this size
+TRACE_EXPORT_MAX_BYTES = int(os.getenv("TRACE_EXPORT_MAX_BYTES", str(64 * 1024 * 1024)))
+# Prometheus text format metrics, rewritten whenever a trace finishes
+METRICS_EXPORT_PATH = os.getenv("METRICS_EXPORT_PATH", ".streamlit/metrics.prom")
+# Also serve the metrics at http://<host>:<port>/metrics when set
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+# Finished spans kept in memory for the ops page
+TRACE_RECENT_SPANS = int(os.getenv("TRACE_RECENT_SPANS", "5000"))
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+# Numeric span attributes that are also summed into counters
+COUNTED_ATTRIBUTES = ("input_tokens", "output_tokens", "retries", "cache_hit", "rate_limited")
+
+@dataclass
+class Span:
+    """A timed operation, nested under the span that was current when it started."""
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str
+    parent_id: str = None
+    start: float = field(default_factory=time.time)
+    duration: float = None
+    attributes: dict = field(default_factory=dict)
+    error: str = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": round(self.start, 6),
+            "duration": round(self.duration, 6) if self.duration is not None else None,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+def current_span():
+    """Return the span the calling code runs in, or None."""
+    return _current_span.get()
+
+def annotate(**attributes):
+    """Set attributes on the current span, if there is one."""
+    span = _current_span.get()
+    if span is not None:
+        span.set(**attributes)
+
+@contextmanager
+def trace(name, kind="internal", **attributes):
+    """Time the enclosed block as a span and record it when the block exits.
+
+    Spans opened inside the block become its children. An exception leaving
+    the block is stored as the span's error and re-raised; helpers that
+    return ``(value, error)`` tuples should set ``span.error`` themselves.
+    """
+    parent = _current_span.get()
+    span = Span(
+        name=name,
+        kind=kind,
+        trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=parent.span_id if parent else None,
+        attributes=attributes
+    )
+    token = _current_span.set(span)
+    started = time.perf_counter()
+    try:
+        yield span
+    except Exception as e:
+        span.error = f"{type(e).__name__}: {str(e)}"
+        raise
+    finally:
+        span.duration = time.perf_counter() - started
+        _current_span.reset(token)
+        get_tracer().record(span)
+
+def in_current_span(func):
+    """Wrap func so spans it opens on another thread nest under the current span.
+
+    Worker threads do not inherit the caller's context, so functions handed
+    to a thread pool lose track of their parent span without this.
+    """
+    parent = _current_span.get()
+
+    def run(*args, **kwargs):
+        token = _current_span.set(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_span.reset(token)
+    return run
+
+class Histogram:
+    """Cumulative latency histogram in the Prometheus layout."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(int(round(fraction * len(ordered))) - 1, 0))]
+
+def _labels(**labels):
+    return ",".join(f'{key}="{str(value).replace(chr(34), chr(39))}"' for key, value in labels.items())
+
+class Tracer:
+    """Collects finished spans into metrics and exports them.
+
+    Every span goes to the JSON lines file and the in-memory list used by the
+    ops page, and is counted in a latency histogram per (kind, name). The
+    Prometheus metrics file is rewritten when a root span finishes, i.e.
+    once per analysis or per request made outside of one.
+    """
+
+    def __init__(self, export_path=TRACE_EXPORT_PATH, metrics_path=METRICS_EXPORT_PATH):
+        self.export_path = export_path
+        self.metrics_path = metrics_path
+        self.recent = deque(maxlen=TRACE_RECENT_SPANS)
+        self._histograms = {}
+        self._errors = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+
+    def record(self, span):
+        key = (span.kind, span.name)
+        with self._lock:
+            self.recent.append(span)
+            self._histograms.setdefault(key, Histogram()).observe(span.duration)
+            if span.error:
+                self._errors[key] = self._errors.get(key, 0) + 1
+            for attribute in COUNTED_ATTRIBUTES:
+                value = span.attributes.get(attribute)
+                if isinstance(value, (int, float)) and value:
+                    counter = key + (attribute,)
+                    self._counters[counter] = self._counters.get(counter, 0) + value
+
+        try:
+            with self._export_lock:
+                if self.export_path:
+                    os.makedirs(os.path.dirname(self.export_path) or ".", exist_ok=True)
+                    if os.path.exists(self.export_path) and os.path.getsize(self.export_path) > TRACE_EXPORT_MAX_BYTES:
+                        os.replace(self.export_path, self.export_path + ".1")
+                    with open(self.export_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+                if self.metrics_path and span.parent_id is None:
+                    self._write_metrics()
+        except OSError:
+            # Telemetry must never break an analysis
+            pass
+
+    def _write_metrics(self):
+        os.makedirs(os.path.dirname(self.metrics_path) or ".", exist_ok=True)
+        temp_path = self.metrics_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(temp_path, self.metrics_path)
+
+    def prometheus_text(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = {key: (list(h.counts), h.count, h.sum) for key, h in self._histograms.items()}
+            errors = dict(self._errors)
+            counters = dict(self._counters)
+
+        lines = [
+            "# HELP podcast_span_duration_seconds Duration of pipeline stages and external calls.",
+            "# TYPE podcast_span_duration_seconds histogram"
+        ]
+        for (kind, name), (counts, count, total) in sorted(histograms.items()):
+            for bound, bucket_count in zip(LATENCY_BUCKETS, counts):
+                lines.append(
+                    f"podcast_span_duration_seconds_bucket{{{_labels(kind=kind, name=name, le=bound)}}} {bucket_count}"
+                )
+            lines.append(f"podcast_span_duration_seconds_bucket{{{_labels(kind=kind, name=name, le='+Inf')}}} {count}")
+            lines.append(f"podcast_span_duration_seconds_sum{{{_labels(kind=kind, name=name)}}} {total:.6f}")
+            lines.append(f"podcast_span_duration_seconds_count{{{_labels(kind=kind, name=name)}}} {count}")
+
+        lines += [
+            "# HELP podcast_span_errors_total Spans that ended with an error.",
+            "# TYPE podcast_span_errors_total counter"
+        ]
+        for (kind, name), count in sorted(errors.items()):
+            lines.append(f"podcast_span_errors_total{{{_labels(kind=kind, name=name)}}} {count}")
+
+        lines += [
+            "# HELP podcast_span_attribute_total Sum of counted span attributes (tokens, retries, cache hits).",
+            "# TYPE podcast_span_attribute_total counter"
+        ]
+        for (kind, name, attribute), total in sorted(counters.items()):
+            lines.append(
+                f"podcast_span_attribute_total{{{_labels(kind=kind, name=name, attribute=attribute)}}} {total}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def spans(self, kind=None):
+        """Return the recent finished spans, optionally of one kind only."""
+        with self._lock:
+            spans = list(self.recent)
+        return [span for span in spans if kind is None or span.kind == kind]
+
+    def latency_summary(self, kind=None):
+        """Per (kind, name) count, error count, p50 and p95 over the recent spans."""
+        durations = {}
+        errors = {}
+        for span in self.spans(kind):
+            key = (span.kind, span.name)
+            durations.setdefault(key, []).append(span.duration)
+            errors[key] = errors.get(key, 0) + (1 if span.error else 0)
+        return [
+            {
+                "kind": span_kind,
+                "name": name,
+                "count": len(values),
+                "errors": errors[(span_kind, name)],
+                "p50_seconds": percentile(values, 0.5),
+                "p95_seconds": percentile(values, 0.95),
+                "max_seconds": max(values)
+            }
+            for (span_kind, name), values in sorted(durations.items())
+        ]
+
+def start_metrics_server(port, tracer=None):
+    """Serve the Prometheus metrics over HTTP on a background thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    tracer = tracer or get_tracer()
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = tracer.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+def get_tracer():
+    """Return the process-wide tracer, starting the metrics server on first use if configured."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer()
+            if METRICS_PORT:
+                try:
+                    start_metrics_server(METRICS_PORT, _tracer)
+                except OSError:
+                    # Another process of the app already serves this port
+                    pass
+        return _tracer
\ No newline at end of file
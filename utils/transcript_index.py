@@ -0,0 +1,83 @@
+import bisect
+import re
+
+_WORD = re.compile(r"\w+(?:'\w+)?")
+# Sentence boundaries used to cut transcripts that have no segments
+_SENTENCE_END = re.compile(r"(?<=[.!?।])\s+")
+
+# Approximate size of the pieces a transcript without segments is cut into
+TEXT_SEGMENT_CHARS = 400
+
+def segments_from_text(text, max_chars=TEXT_SEGMENT_CHARS):
+    """Cut a plain transcript into untimed segments of whole sentences.
+
+    Used for transcripts stored without their timestamped segments, e.g.
+    history entries saved by older versions.
+    """
+    segments = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text):
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            segments.append({"text": current, "start": None})
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+    if current.strip():
+        segments.append({"text": current, "start": None})
+    return segments
+
+def query_words(query):
+    """Lowercased words of a search query."""
+    return _WORD.findall(query.lower())
+
+class TranscriptIndex:
+    """Inverted word index over transcript segments.
+
+    Built once per transcript, so searching and looking up a time cost
+    about the same for a 10 minute and a 3 hour episode.
+    """
+
+    def __init__(self, segments):
+        self.segments = segments
+        self.timed = bool(segments) and all(segment.get("start") is not None for segment in segments)
+        self._starts = [segment["start"] for segment in segments] if self.timed else []
+        postings = {}
+        for i, segment in enumerate(segments):
+            for word in set(query_words(segment["text"])):
+                postings.setdefault(word, []).append(i)
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+
+    def __len__(self):
+        return len(self.segments)
+
+    def _segments_with(self, word, prefix=False):
+        if not prefix:
+            return set(self._postings.get(word, ()))
+        found = set()
+        # Every word starting with the prefix sits in one run of the sorted vocabulary
+        for term in self._vocabulary[bisect.bisect_left(self._vocabulary, word):]:
+            if not term.startswith(word):
+                break
+            found.update(self._postings[term])
+        return found
+
+    def search(self, query):
+        """Return the indices of segments containing every word of ``query``, in order.
+
+        The last word also matches longer words starting with it, so results
+        update sensibly while a word is still being typed.
+        """
+        words = query_words(query)
+        matches = None
+        for i, word in enumerate(words):
+            found = self._segments_with(word, prefix=i == len(words) - 1)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        return sorted(matches or ())
+
+    def segment_at(self, seconds):
+        """Index of the segment being spoken at ``seconds``, or None without timestamps."""
+        if not self.timed:
+            return None
+        return max(bisect.bisect_right(self._starts, seconds) - 1, 0)
\ No newline at end of file
@@ -1,6 +1,15 @@
 import re
-from youtube_transcript_api import YouTubeTranscriptApi
-import streamlit as st
+import os
+
+from utils.cache import DiskCache
+from utils.tracing import trace
+
+# Local store of fetched transcripts, keyed by video ID and language. Fetching
+# from YouTube is rate limited, so every video is only downloaded once.
+transcript_store = DiskCache(
+    os.getenv("TRANSCRIPT_STORE_PATH", ".streamlit/transcripts.sqlite3"),
+    max_entries=int(os.getenv("TRANSCRIPT_STORE_MAX_ENTRIES", "20000"))
+)
 
 def extract_video_id(youtube_url):
     """Extract video ID from various YouTube URL formats."""
@@ -18,20 +27,56 @@ def extract_video_id(youtube_url):
     
     return None
 
-def extract_transcript_details(youtube_video_url):
-    """Get transcript from YouTube video URL."""
-    try:
-        video_id = extract_video_id(youtube_video_url)
-        if not video_id:
-            return "", video_id, None, "Invalid YouTube URL format"
+def _pack_segments(transcript_list):
+    """Store segments column-wise so keys are not repeated for every segment."""
+    return {
+        "text": [item["text"] for item in transcript_list],
+        "start": [round(item["start"], 3) for item in transcript_list],
+        "duration": [round(item["duration"], 3) for item in transcript_list]
+    }
+
+def _unpack_segments(packed):
+    """Rebuild the segment list returned by YouTubeTranscriptApi."""
+    return [
+        {"text": text, "start": start, "duration": duration}
+        for text, start, duration in zip(packed["text"], packed["start"], packed["duration"])
+    ]
+
+def get_transcript_segments(video_id, language="en"):
+    """Get the raw transcript segments for a video, using the local store first."""
+    key = f"{video_id}:{language}"
+    with trace("youtube.transcript", kind="external", video_id=video_id, language=language) as span:
+        packed = transcript_store.get(key)
+        span.set(cache_hit=packed is not None)
+        if packed is not None:
+            return _unpack_segments(packed)
         
-        transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
+        from youtube_transcript_api import YouTubeTranscriptApi
+        transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=[language])
+        transcript_store.set(key, _pack_segments(transcript_list))
+        return transcript_list
+
+def fetch_transcript(video_id, language="en"):
+    """Get a video's transcript text and segments."""
+    try:
+        transcript_list = get_transcript_segments(video_id, language)
         # Directly extract text from transcript items
         transcript = " ".join([item['text'] for item in transcript_list])
-        return transcript, video_id, transcript_list, None
+        return transcript, transcript_list, None
     except Exception as e:
         error_message = str(e)
-        return "", "", [], f"Failed to retrieve transcript: {error_message}"
+        return "", [], f"Failed to retrieve transcript: {error_message}"
+
+def extract_transcript_details(youtube_video_url, language="en"):
+    """Get transcript from YouTube video URL."""
+    video_id = extract_video_id(youtube_video_url)
+    if not video_id:
+        return "", video_id, None, "Invalid YouTube URL format"
+    
+    transcript, transcript_list, error = fetch_transcript(video_id, language)
+    if error:
+        return "", "", [], error
+    return transcript, video_id, transcript_list, None
 
 def get_video_title(video_id):
     """Get video title from video ID."""
@@ -40,4 +85,23 @@ def get_video_title(video_id):
         # For now, let's return a generic title with the video ID
         return f"YouTube Video (ID: {video_id})"
     except Exception as e:
-        return f"Unknown Video (ID: {video_id})"
\ No newline at end of file
+        return f"Unknown Video (ID: {video_id})"
+
+def format_timestamp(seconds):
+    """Format a number of seconds as m:ss or h:mm:ss."""
+    seconds = int(seconds or 0)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+def parse_timestamp(text):
+    """Parse "ss", "m:ss" or "h:mm:ss" into seconds; returns None if it is not a time."""
+    parts = text.strip().split(":")
+    if not 1 <= len(parts) <= 3 or not all(part.isdigit() for part in parts):
+        return None
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return seconds
\ No newline at end of file